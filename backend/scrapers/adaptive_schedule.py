@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Adaptive Recrawl Scheduling for AgiNet
+Recrawls volatile (site, category) pairs more often and static ones less, within a request budget
+"""
+
+import math
+import time
+import sqlite3
+import logging
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRecrawlScheduler:
+    """Tracks per-category change rates from ingest results and plans recrawl intervals
+
+    Each crawl yields the fraction of records that were new or changed. Divided
+    by the hours since the previous crawl, that gives a change rate, smoothed
+    with an EWMA. Crawl frequency is allocated proportional to the square root
+    of the rate. The allocation is scaled so expected page fetches per day stay
+    within the budget, and intervals are clamped between min and max.
+    """
+
+    def __init__(self, db_path: str = "../database.db", daily_request_budget: int = 72,
+                 min_interval_hours: float = 1.0, max_interval_hours: float = 48.0,
+                 smoothing: float = 0.3, default_rate: float = 0.05):
+        self.db_path = db_path
+        self.daily_request_budget = daily_request_budget
+        self.min_interval_hours = min_interval_hours
+        self.max_interval_hours = max_interval_hours
+        self.smoothing = smoothing
+        self.default_rate = default_rate  # Changes/hour assumed before anything is observed
+        self.setup_tables()
+
+    def setup_tables(self):
+        """Create the change statistics table"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_change_stats (
+                site TEXT NOT NULL,
+                category TEXT NOT NULL,
+                pages_per_crawl INTEGER NOT NULL DEFAULT 2,
+                change_rate REAL,
+                crawls INTEGER NOT NULL DEFAULT 0,
+                changed_records INTEGER NOT NULL DEFAULT 0,
+                last_crawled REAL,
+                interval_hours REAL,
+                next_due REAL,
+                PRIMARY KEY (site, category)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def register(self, targets: List[Tuple[str, str]], pages_per_crawl: int = 2):
+        """Add (site, category) pairs; new ones are due immediately"""
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany('''
+            INSERT OR IGNORE INTO crawl_change_stats (site, category, pages_per_crawl, next_due)
+            VALUES (?, ?, ?, 0)
+        ''', [(site, category, pages_per_crawl) for site, category in targets])
+        conn.commit()
+        conn.close()
+        self.plan()
+
+    def record_crawl(self, site: str, category: str, total: int, changed: int, now: float = None):
+        """Fold one crawl's ingest result into the category's change rate"""
+        now = now or time.time()
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('''
+            SELECT change_rate, last_crawled FROM crawl_change_stats WHERE site = ? AND category = ?
+        ''', (site, category)).fetchone()
+
+        rate = row[0] if row else None
+        if total > 0 and row and row[1]:
+            hours = max((now - row[1]) / 3600, 1 / 60)
+            observed = (changed / total) / hours
+            rate = observed if rate is None else self.smoothing * observed + (1 - self.smoothing) * rate
+
+        conn.execute('''
+            INSERT INTO crawl_change_stats (site, category, change_rate, crawls, changed_records, last_crawled)
+            VALUES (?, ?, ?, 1, ?, ?)
+            ON CONFLICT (site, category) DO UPDATE SET
+                change_rate = excluded.change_rate,
+                crawls = crawls + 1,
+                changed_records = changed_records + excluded.changed_records,
+                last_crawled = excluded.last_crawled
+        ''', (site, category, rate, changed, now))
+        conn.commit()
+        conn.close()
+
+        logger.info(f"📈 {site} {category}: {changed}/{total} records changed, "
+                    f"rate now {rate if rate is not None else self.default_rate:.4f}/h")
+        self.plan()
+
+    def plan(self):
+        """Recompute every category's interval and next due time"""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('''
+            SELECT site, category, pages_per_crawl, change_rate, last_crawled FROM crawl_change_stats
+        ''').fetchall()
+        if not rows:
+            conn.close()
+            return
+
+        # crawls/day_i = scale * sqrt(rate_i), with sum(crawls/day_i * pages_i) = budget
+        weights = [math.sqrt(max(rate if rate is not None else self.default_rate, 1e-6)) for _, _, _, rate, _ in rows]
+        cost = sum(weight * pages for weight, (_, _, pages, _, _) in zip(weights, rows))
+        scale = self.daily_request_budget / cost if cost else 0
+
+        updates = []
+        for weight, (site, category, _, _, last_crawled) in zip(weights, rows):
+            crawls_per_day = scale * weight
+            interval = 24 / crawls_per_day if crawls_per_day > 0 else self.max_interval_hours
+            interval = min(max(interval, self.min_interval_hours), self.max_interval_hours)
+            next_due = (last_crawled + interval * 3600) if last_crawled else 0
+            updates.append((interval, next_due, site, category))
+
+        conn.executemany('''
+            UPDATE crawl_change_stats SET interval_hours = ?, next_due = ? WHERE site = ? AND category = ?
+        ''', updates)
+        conn.commit()
+        conn.close()
+
+    def due(self, now: float = None, sites: List[str] = None) -> List[Tuple[str, str]]:
+        """(site, category) pairs whose recrawl is due, most overdue first"""
+        now = now or time.time()
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('''
+            SELECT site, category FROM crawl_change_stats WHERE next_due <= ? ORDER BY next_due
+        ''', (now,)).fetchall()
+        conn.close()
+        return [(site, category) for site, category in rows if not sites or site in sites]
+
+    def get_status(self) -> Dict:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute("SELECT * FROM crawl_change_stats ORDER BY site, category").fetchall()
+        conn.close()
+
+        planned = sum(24 / row["interval_hours"] * row["pages_per_crawl"] for row in rows if row["interval_hours"])
+        return {
+            "daily_request_budget": self.daily_request_budget,
+            "planned_requests_per_day": round(planned, 1),
+            "categories": [
+                {
+                    "site": row["site"],
+                    "category": row["category"],
+                    "change_rate_per_hour": round(row["change_rate"], 5) if row["change_rate"] is not None else None,
+                    "interval_hours": round(row["interval_hours"], 2) if row["interval_hours"] else None,
+                    "crawls": row["crawls"],
+                    "next_due": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["next_due"])) if row["next_due"] else "now"
+                }
+                for row in rows
+            ]
+        }
@@ -13,12 +13,99 @@ from urllib.parse import urljoin, urlparse
 import logging
 from typing import List, Dict, Optional
 import re
+import contextvars
 from dataclasses import dataclass, asdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from metrics import FETCH_SECONDS, PAGE_BYTES, PAGES_FETCHED, PARSE_SECONDS, PRODUCTS_EXTRACTED
+from extraction_quality import ExtractionQualityMonitor, SiteLayoutChanged
+from resilience import CircuitBreaker, CircuitOpen, RetryPolicy, resilient_request
+from tracing import add_logging_arguments, configure_logging, current_run_id, run_context, span
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Background writer for optional JSON archives, off the sync critical path
+archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-archive")
+
+# Static sites scraped with requests + BeautifulSoup
+SITES = {
+    "BigHaat": {
+        "base_url": "https://www.bighaat.com",
+        "categories": [
+            "/collections/fertilizers",
+            "/collections/seeds",
+            "/collections/pesticides",
+            "/collections/farm-implements"
+        ],
+        "container_pattern": r'product|item',
+        "extractor": "extract_bighaat_product"
+    },
+    "AgroStar": {
+        "base_url": "https://www.agrostar.in",
+        "categories": [
+            "/fertilizers",
+            "/seeds",
+            "/crop-protection",
+            "/farm-implements"
+        ],
+        "container_pattern": r'product|card|item',
+        "extractor": "extract_agrostar_product"
+    }
+}
+
+# Built-in sample product names per category (also the vocabulary of catalog_generator)
+SAMPLE_PRODUCT_NAMES = {
+    "Fertilizers": [
+        "NPK 19:19:19 Fertilizer 50kg", "Urea 46% Nitrogen 45kg", "DAP Fertilizer 50kg",
+        "Potash Fertilizer 25kg", "Organic Compost 40kg", "Vermicompost 20kg",
+        "Liquid NPK Fertilizer 1L", "Calcium Nitrate 25kg", "Magnesium Sulphate 10kg",
+        "Zinc Sulphate 5kg", "Boron Fertilizer 1kg", "Iron Chelate 500g",
+        "Phosphorus Rich Fertilizer", "Nitrogen Booster 20kg", "Potassium Chloride 25kg",
+        "Organic Manure 50kg", "Bio Fertilizer 10kg", "Micronutrient Mix 5kg",
+        "Sulphur Fertilizer 20kg", "Calcium Carbonate 25kg", "Humic Acid 1L",
+        "Seaweed Extract 500ml", "Amino Acid Fertilizer", "Growth Promoter 250ml"
+    ],
+    "Seeds": [
+        "Hybrid Tomato Seeds F1", "Wheat Seeds HD-2967 10kg", "Rice Seeds Basmati 1121",
+        "Corn Seeds Hybrid 900M", "Cotton Seeds Bt 450g", "Soybean Seeds JS-335",
+        "Sunflower Seeds Hybrid KBSH-44", "Mustard Seeds Varuna", "Chili Seeds G4",
+        "Onion Seeds Nasik Red", "Carrot Seeds Nantes", "Cabbage Seeds Golden Acre",
+        "Brinjal Seeds Hybrid", "Okra Seeds Arka Anamika", "Cucumber Seeds Hybrid",
+        "Watermelon Seeds Sugar Baby", "Muskmelon Seeds Hara Madhu", "Bottle Gourd Seeds",
+        "Ridge Gourd Seeds", "Bitter Gourd Seeds", "Pumpkin Seeds", "Radish Seeds",
+        "Spinach Seeds All Green", "Coriander Seeds Pant Haritima", "Fenugreek Seeds",
+        "Fennel Seeds", "Cumin Seeds", "Sesame Seeds", "Groundnut Seeds",
+        "Bajra Seeds Hybrid", "Jowar Seeds", "Ragi Seeds", "Barley Seeds"
+    ],
+    "Pesticides": [
+        "Chlorpyrifos 20% EC 1L", "Imidacloprid 17.8% SL 250ml", "2,4-D Herbicide 500ml",
+        "Glyphosate 41% SL 1L", "Mancozeb 75% WP 1kg", "Carbendazim 50% WP 500g",
+        "Lambda Cyhalothrin 5% EC", "Atrazine 50% WP 1kg", "Paraquat Dichloride 24% SL",
+        "Copper Oxychloride 50% WP", "Thiamethoxam 25% WG", "Acetamiprid 20% SP",
+        "Cypermethrin 10% EC", "Malathion 50% EC", "Dimethoate 30% EC",
+        "Monocrotophos 36% SL", "Profenofos 50% EC", "Quinalphos 25% EC",
+        "Triazophos 40% EC", "Endosulfan 35% EC", "Dichlorvos 76% EC",
+        "Phorate 10% CG", "Carbofuran 3% CG", "Fipronil 5% SC"
+    ],
+    "Farm Equipment": [
+        "Drip Irrigation Kit 1 Acre", "Sprinkler System Complete", "Water Pump 3HP",
+        "Tractor Rotavator 7ft", "Cultivator 9 Tyne", "Disc Harrow 20 Disc",
+        "Seed Drill 9 Tyne", "Thresher Machine", "Chaff Cutter Manual",
+        "Winnowing Fan", "Spray Pump 16L", "Knapsack Sprayer",
+        "Power Weeder", "Brush Cutter", "Hedge Trimmer",
+        "Garden Tools Set", "Pruning Shears", "Watering Can 10L",
+        "Mulching Film", "Shade Net 50%", "Anti Bird Net",
+        "Greenhouse Kit Small", "Poly House Material", "Fogger System"
+    ]
+}
+
+SAMPLE_BRANDS = [
+    "AgroTech", "FarmPro", "GreenGrow", "CropMax", "AgriStar",
+    "BioFarm", "EcoGreen", "NutriCrop", "HarvestMax", "SeedMaster",
+    "FertilePlus", "OrganicPro", "CropCare", "AgriBoost", "FarmFresh"
+]
+
 @dataclass
 class Product:
     """Product data structure"""
@@ -38,7 +125,22 @@ class Product:
 class AgriScraper:
     """Main scraper class for agricultural websites"""
     
-    def __init__(self):
+    def __init__(self, base_urls: Dict[str, str] = None, page_archive=None, hybrid=None):
+        # Per-site base URL overrides, e.g. to point a site at a local stand-in
+        self.base_urls = base_urls or {}
+        # Optional PageArchive that keeps every fetched page body for re-extraction
+        self.page_archive = page_archive
+        # Optional HybridFetcher that renders JS-gated pages in a pooled browser
+        self.hybrid = hybrid
+        # Aborts a site's crawl when its first pages extract badly; None turns the check off
+        self.quality = ExtractionQualityMonitor()
+        # Transient page failures are retried; a host that keeps failing is paused by its circuit
+        self.retry_policy = RetryPolicy()
+        self.circuits = CircuitBreaker()
+        # Politeness delays between pages; off only for local stand-ins and replays
+        self.polite = True
+        # BeautifulSoup backend: 'html.parser' (no dependencies), 'lxml' or 'html5lib'
+        self.parser = 'html.parser'
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
@@ -52,6 +154,8 @@ class AgriScraper:
         
     def random_delay(self, min_delay=1, max_delay=3):
         """Add random delay to avoid being blocked"""
+        if not self.polite:
+            return
         time.sleep(random.uniform(min_delay, max_delay))
         
     def clean_text(self, text: str) -> str:
@@ -68,55 +172,126 @@ class AgriScraper:
         price_match = re.search(r'[₹$€£]?\s*[\d,]+\.?\d*', price_text)
         return price_match.group(0) if price_match else "0"
         
-    def scrape_bighaat(self, max_pages=5) -> List[Product]:
-        """Scrape BigHaat fertilizers"""
-        logger.info("Starting BigHaat scraping...")
+    def site_base_url(self, site: str) -> str:
+        return self.base_urls.get(site, SITES[site]["base_url"])
+        
+    def scrape_page(self, site: str, category: str, page: int) -> List[Product]:
+        """Fetch and extract one listing page; an empty list means no more pages"""
+        base_url = self.site_base_url(site)
+        url = f"{base_url}{category}?page={page}"
+        if self.quality:
+            self.quality.check(site)
+        logger.info(f"Scraping: {url}")
+        
+        if self.hybrid:
+            products = self.hybrid.scrape_page(self, site, category, page, url, base_url)
+        else:
+            content = self.fetch_page(site, category, page, url, base_url)
+            products = self.extract_page(site, category, content, base_url)
+        if not products:
+            logger.warning(f"No products found on {url}")
+        if self.quality:
+            self.quality.record_page(site, category, products)
+        return products
+        
+    def fetch_page(self, site: str, category: str, page: int, url: str, base_url: str) -> bytes:
+        """Fetch one listing page over HTTP, archiving the body if an archive is set"""
+        with span("fetch", logging.DEBUG, site=site, url=url, page=page) as fetch:
+            started = time.perf_counter()
+            # Short connect timeout: an unreachable host should fail in seconds, not the read timeout
+            response = resilient_request(self.session, "GET", url, self.retry_policy, self.circuits,
+                                         timeout=(3.05, 10))
+            FETCH_SECONDS.labels(site).observe(time.perf_counter() - started)
+            PAGES_FETCHED.labels(site, str(response.status_code)).inc()
+            PAGE_BYTES.labels(site).inc(len(response.content))
+            fetch.attributes.update(status=response.status_code, bytes=len(response.content))
+            response.raise_for_status()
+        
+        if self.page_archive:
+            self.page_archive.store(url, response.content, site=site, category=category, page=page,
+                                    base_url=base_url, status=response.status_code)
+        return response.content
+        
+    def extract_page(self, site: str, category: str, content: bytes, base_url: str) -> List[Product]:
+        """Extract products from a listing page body (live or archived)"""
+        with span("parse", logging.DEBUG, site=site, category=category) as parse:
+            products = self.extract_products(site, category, content, base_url)
+            parse.attributes["products"] = len(products)
+        return products
+        
+    def extract_products(self, site: str, category: str, content: bytes, base_url: str) -> List[Product]:
+        config = SITES[site]
+        started = time.perf_counter()
+        soup = BeautifulSoup(content, self.parser)
+        
+        # Find product containers
+        product_items = soup.find_all(['div', 'article'], class_=re.compile(config["container_pattern"]))
+        
+        extract = getattr(self, config["extractor"])
         products = []
+        for item in product_items:
+            try:
+                product = extract(item, base_url, category)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                logger.error(f"Error extracting product: {e}")
+                continue
+                
+        PARSE_SECONDS.labels(site).observe(time.perf_counter() - started)
+        PRODUCTS_EXTRACTED.labels(site).inc(len(products))
+        return products
         
-        base_url = "https://www.bighaat.com"
-        categories = [
-            "/collections/fertilizers",
-            "/collections/seeds",
-            "/collections/pesticides",
-            "/collections/farm-implements"
-        ]
+    def scrape_category(self, site: str, category: str, max_pages=3, checkpoint=None) -> List[Product]:
+        """Scrape the listing pages of one category until they run out"""
+        products = []
         
-        for category in categories:
-            for page in range(1, max_pages + 1):
-                try:
-                    url = f"{base_url}{category}?page={page}"
-                    logger.info(f"Scraping: {url}")
-                    
-                    response = self.session.get(url, timeout=10)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Find product containers
-                    product_items = soup.find_all(['div', 'article'], class_=re.compile(r'product|item'))
-                    
-                    if not product_items:
-                        logger.warning(f"No products found on {url}")
-                        break
-                        
-                    for item in product_items:
-                        try:
-                            product = self.extract_bighaat_product(item, base_url, category)
-                            if product:
-                                products.append(product)
-                        except Exception as e:
-                            logger.error(f"Error extracting product: {e}")
-                            continue
+        for page in range(1, max_pages + 1):
+            # Pages finished by an interrupted earlier run come from the checkpoint
+            if checkpoint and checkpoint.has_page(site, category, page):
+                saved = checkpoint.page_products(site, category, page)
+                if not saved:
+                    break
+                products.extend(Product(**record) for record in saved)
+                continue
+                
+            try:
+                page_products = self.scrape_page(site, category, page)
+                if checkpoint:
+                    checkpoint.record_page(site, category, page, page_products)
+                if not page_products:
+                    break
                     
-                    self.random_delay()
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {e}")
-                    continue
+                products.extend(page_products)
+                self.random_delay()
+                
+            except (SiteLayoutChanged, CircuitOpen):
+                raise  # The rest of the site would fail just the same
+            except Exception as e:
+                logger.error(f"Error scraping {site} {category} page {page}: {e}")
+                continue
+                
+        return products
+        
+    def scrape_site(self, site: str, max_pages=3, checkpoint=None) -> List[Product]:
+        """Scrape every category of a registered site"""
+        logger.info(f"Starting {site} scraping...")
+        products = []
+        if self.quality:
+            self.quality.start_run([site])
+        
+        with span("scrape_site", site=site) as site_span:
+            for category in SITES[site]["categories"]:
+                products.extend(self.scrape_category(site, category, max_pages, checkpoint))
+            site_span.attributes["products"] = len(products)
                     
-        logger.info(f"BigHaat scraping completed. Found {len(products)} products")
+        logger.info(f"{site} scraping completed. Found {len(products)} products")
         return products
         
+    def scrape_bighaat(self, max_pages=5) -> List[Product]:
+        """Scrape BigHaat fertilizers"""
+        return self.scrape_site("BigHaat", max_pages)
+        
     def extract_bighaat_product(self, item, base_url, category) -> Optional[Product]:
         """Extract product details from BigHaat item"""
         try:
@@ -172,52 +347,7 @@ class AgriScraper:
             
     def scrape_agrostar(self, max_pages=3) -> List[Product]:
         """Scrape AgroStar products"""
-        logger.info("Starting AgroStar scraping...")
-        products = []
-        
-        base_url = "https://www.agrostar.in"
-        categories = [
-            "/fertilizers",
-            "/seeds",
-            "/crop-protection",
-            "/farm-implements"
-        ]
-        
-        for category in categories:
-            for page in range(1, max_pages + 1):
-                try:
-                    url = f"{base_url}{category}?page={page}"
-                    logger.info(f"Scraping: {url}")
-                    
-                    response = self.session.get(url, timeout=10)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    
-                    # Find product containers (adjust selectors based on actual site structure)
-                    product_items = soup.find_all(['div', 'article'], class_=re.compile(r'product|card|item'))
-                    
-                    if not product_items:
-                        logger.warning(f"No products found on {url}")
-                        break
-                        
-                    for item in product_items:
-                        try:
-                            product = self.extract_agrostar_product(item, base_url, category)
-                            if product:
-                                products.append(product)
-                        except Exception as e:
-                            logger.error(f"Error extracting product: {e}")
-                            continue
-                    
-                    self.random_delay()
-                    
-                except Exception as e:
-                    logger.error(f"Error scraping {url}: {e}")
-                    continue
-                    
-        logger.info(f"AgroStar scraping completed. Found {len(products)} products")
-        return products
+        return self.scrape_site("AgroStar", max_pages)
         
     def extract_agrostar_product(self, item, base_url, category) -> Optional[Product]:
         """Extract product details from AgroStar item"""
@@ -264,20 +394,25 @@ class AgriScraper:
             logger.error(f"Error extracting AgroStar product: {e}")
             return None
 
-    def scrape_all_sites(self, max_pages_per_site=3) -> List[Product]:
-        """Scrape all supported agricultural websites"""
+    def scrape_all_sites(self, max_pages_per_site=3, checkpoint=None) -> List[Product]:
+        """Scrape all supported agricultural websites (resumable with a CrawlCheckpoint)"""
+        with run_context() as run_id, span("scrape_all"):
+            logger.info(f"🧭 Scrape run {run_id}")
+            return self.scrape_sites(max_pages_per_site, checkpoint)
+
+    def scrape_sites(self, max_pages_per_site=3, checkpoint=None) -> List[Product]:
         all_products = []
 
         # Scrape BigHaat
         try:
-            bighaat_products = self.scrape_bighaat(max_pages_per_site)
+            bighaat_products = self.scrape_site("BigHaat", max_pages_per_site, checkpoint)
             all_products.extend(bighaat_products)
         except Exception as e:
             logger.error(f"Error scraping BigHaat: {e}")
 
         # Scrape AgroStar
         try:
-            agrostar_products = self.scrape_agrostar(max_pages_per_site)
+            agrostar_products = self.scrape_site("AgroStar", max_pages_per_site, checkpoint)
             all_products.extend(agrostar_products)
         except Exception as e:
             logger.error(f"Error scraping AgroStar: {e}")
@@ -309,12 +444,14 @@ class AgriScraper:
         try:
             products_dict = [asdict(product) for product in products]
 
-            with open(filename, 'w', encoding='utf-8') as f:
+            with span("save_json", filename=filename, products=len(products_dict)), \
+                    open(filename, 'w', encoding='utf-8') as f:
                 json.dump({
                     "products": products_dict,
                     "total_count": len(products_dict),
                     "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S"),
-                    "categories": list(set(p.category for p in products))
+                    "categories": list(set(p.category for p in products)),
+                    "run_id": current_run_id()
                 }, f, indent=2, ensure_ascii=False)
 
             logger.info(f"Products saved to {filename}")
@@ -324,6 +461,11 @@ class AgriScraper:
             logger.error(f"Error saving to JSON: {e}")
             return False
 
+    def archive_to_json(self, products: List[Product], filename: str) -> Future:
+        """Save products to JSON in the background; returns a Future of the save result"""
+        # The copied context carries the caller's run ID into the writer thread
+        return archive_executor.submit(contextvars.copy_context().run, self.save_to_json, list(products), filename)
+
     def save_to_firebase(self, products: List[Product], collection_name: str = "products"):
         """Save products to Firebase Firestore"""
         try:
@@ -335,16 +477,7 @@ class AgriScraper:
                 cred = credentials.Certificate("path/to/your/firebase-credentials.json")
                 firebase_admin.initialize_app(cred)
 
-            db = firestore.client()
-
-            batch = db.batch()
-            collection_ref = db.collection(collection_name)
-
-            for product in products:
-                doc_ref = collection_ref.document()
-                batch.set(doc_ref, asdict(product))
-
-            batch.commit()
+            self.upload_to_firestore(firestore.client(), products, collection_name)
             logger.info(f"Products uploaded to Firebase collection: {collection_name}")
             return True
 
@@ -352,6 +485,22 @@ class AgriScraper:
             logger.error(f"Error uploading to Firebase: {e}")
             return False
 
+    def upload_to_firestore(self, db, products: List[Product], collection_name: str = "products",
+                            batch_size: int = 500) -> int:
+        """Write products through a Firestore client in batches; returns the number of commits"""
+        collection_ref = db.collection(collection_name)
+        commits = 0
+
+        # Firestore rejects batches of more than 500 writes
+        for start in range(0, len(products), batch_size):
+            batch = db.batch()
+            for product in products[start:start + batch_size]:
+                batch.set(collection_ref.document(), asdict(product))
+            batch.commit()
+            commits += 1
+
+        return commits
+
     def get_sample_image_url(self, product_name: str, category: str) -> str:
         """Get appropriate image URL based on product name and category"""
         name_lower = product_name.lower()
@@ -383,60 +532,11 @@ class AgriScraper:
             return 'https://images.unsplash.com/photo-1574323347407-f5e1ad6d020b?w=400&h=300&fit=crop&auto=format'
 
     def generate_sample_data(self, count: int = 100) -> List[Product]:
-        """Generate sample agricultural product data for testing"""
+        """Generate sample agricultural product data for testing (any count)"""
         sample_products = []
 
-        fertilizer_names = [
-            "NPK 19:19:19 Fertilizer 50kg", "Urea 46% Nitrogen 45kg", "DAP Fertilizer 50kg",
-            "Potash Fertilizer 25kg", "Organic Compost 40kg", "Vermicompost 20kg",
-            "Liquid NPK Fertilizer 1L", "Calcium Nitrate 25kg", "Magnesium Sulphate 10kg",
-            "Zinc Sulphate 5kg", "Boron Fertilizer 1kg", "Iron Chelate 500g",
-            "Phosphorus Rich Fertilizer", "Nitrogen Booster 20kg", "Potassium Chloride 25kg",
-            "Organic Manure 50kg", "Bio Fertilizer 10kg", "Micronutrient Mix 5kg",
-            "Sulphur Fertilizer 20kg", "Calcium Carbonate 25kg", "Humic Acid 1L",
-            "Seaweed Extract 500ml", "Amino Acid Fertilizer", "Growth Promoter 250ml"
-        ]
-
-        seed_names = [
-            "Hybrid Tomato Seeds F1", "Wheat Seeds HD-2967 10kg", "Rice Seeds Basmati 1121",
-            "Corn Seeds Hybrid 900M", "Cotton Seeds Bt 450g", "Soybean Seeds JS-335",
-            "Sunflower Seeds Hybrid KBSH-44", "Mustard Seeds Varuna", "Chili Seeds G4",
-            "Onion Seeds Nasik Red", "Carrot Seeds Nantes", "Cabbage Seeds Golden Acre",
-            "Brinjal Seeds Hybrid", "Okra Seeds Arka Anamika", "Cucumber Seeds Hybrid",
-            "Watermelon Seeds Sugar Baby", "Muskmelon Seeds Hara Madhu", "Bottle Gourd Seeds",
-            "Ridge Gourd Seeds", "Bitter Gourd Seeds", "Pumpkin Seeds", "Radish Seeds",
-            "Spinach Seeds All Green", "Coriander Seeds Pant Haritima", "Fenugreek Seeds",
-            "Fennel Seeds", "Cumin Seeds", "Sesame Seeds", "Groundnut Seeds",
-            "Bajra Seeds Hybrid", "Jowar Seeds", "Ragi Seeds", "Barley Seeds"
-        ]
-
-        pesticide_names = [
-            "Chlorpyrifos 20% EC 1L", "Imidacloprid 17.8% SL 250ml", "2,4-D Herbicide 500ml",
-            "Glyphosate 41% SL 1L", "Mancozeb 75% WP 1kg", "Carbendazim 50% WP 500g",
-            "Lambda Cyhalothrin 5% EC", "Atrazine 50% WP 1kg", "Paraquat Dichloride 24% SL",
-            "Copper Oxychloride 50% WP", "Thiamethoxam 25% WG", "Acetamiprid 20% SP",
-            "Cypermethrin 10% EC", "Malathion 50% EC", "Dimethoate 30% EC",
-            "Monocrotophos 36% SL", "Profenofos 50% EC", "Quinalphos 25% EC",
-            "Triazophos 40% EC", "Endosulfan 35% EC", "Dichlorvos 76% EC",
-            "Phorate 10% CG", "Carbofuran 3% CG", "Fipronil 5% SC"
-        ]
-
-        equipment_names = [
-            "Drip Irrigation Kit 1 Acre", "Sprinkler System Complete", "Water Pump 3HP",
-            "Tractor Rotavator 7ft", "Cultivator 9 Tyne", "Disc Harrow 20 Disc",
-            "Seed Drill 9 Tyne", "Thresher Machine", "Chaff Cutter Manual",
-            "Winnowing Fan", "Spray Pump 16L", "Knapsack Sprayer",
-            "Power Weeder", "Brush Cutter", "Hedge Trimmer",
-            "Garden Tools Set", "Pruning Shears", "Watering Can 10L",
-            "Mulching Film", "Shade Net 50%", "Anti Bird Net",
-            "Greenhouse Kit Small", "Poly House Material", "Fogger System"
-        ]
-
-        all_names = fertilizer_names + seed_names + pesticide_names + equipment_names
-        categories = (["Fertilizers"] * len(fertilizer_names) +
-                     ["Seeds"] * len(seed_names) +
-                     ["Pesticides"] * len(pesticide_names) +
-                     ["Farm Equipment"] * len(equipment_names))
+        all_names = [name for names in SAMPLE_PRODUCT_NAMES.values() for name in names]
+        categories = [category for category, names in SAMPLE_PRODUCT_NAMES.items() for _ in names]
 
         for i in range(min(count, len(all_names))):
             price = random.randint(100, 5000)
@@ -449,11 +549,7 @@ class AgriScraper:
                 image_url=self.get_sample_image_url(all_names[i], categories[i]),
                 description=f"High quality {all_names[i].lower()} for better crop yield and farming productivity.",
                 category=categories[i],
-                brand=random.choice([
-                    "AgroTech", "FarmPro", "GreenGrow", "CropMax", "AgriStar",
-                    "BioFarm", "EcoGreen", "NutriCrop", "HarvestMax", "SeedMaster",
-                    "FertilePlus", "OrganicPro", "CropCare", "AgriBoost", "FarmFresh"
-                ]),
+                brand=random.choice(SAMPLE_BRANDS),
                 availability="In Stock" if random.choice([True, True, True, False]) else "Out of Stock",
                 rating=round(random.uniform(3.5, 5.0), 1),
                 reviews_count=random.randint(10, 500),
@@ -461,11 +557,32 @@ class AgriScraper:
                 source_site="Sample Data"
             ))
 
+        # Beyond the built-in names, synthesize the rest at scale
+        if count > len(all_names):
+            from catalog_generator import CatalogGenerator
+            generator = CatalogGenerator(id_offset=len(all_names))
+            sample_products.extend(generator.generate(count - len(all_names)))
+
         return sample_products
 
 
 def main():
     """Main function to run the scraper"""
+    import argparse
+    from profiling import add_profiling_arguments, profiling_from_args
+
+    parser = argparse.ArgumentParser(description="AgiNet agricultural product scraper")
+    add_profiling_arguments(parser)
+    add_logging_arguments(parser)
+    args = parser.parse_args()
+    configure_logging(args.log_format)
+
+    with profiling_from_args(args, "agri_scraper"), run_context():
+        run_scraper()
+
+
+def run_scraper():
+    """Scrape the sites or generate sample data, as chosen interactively"""
     scraper = AgriScraper()
 
     # Option 1: Scrape real websites (be respectful of rate limits)
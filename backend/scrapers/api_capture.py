@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Product API Capture for AgiNet
+Finds product-listing JSON in a browser's network traffic and pages through the endpoint over plain HTTP
+"""
+
+import json
+import base64
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# Payload keys that may hold each product field, in order of preference
+FIELD_ALIASES = {
+    "name": ["name", "title", "product_name", "productName", "display_name"],
+    "price": ["price", "selling_price", "sale_price", "sellingPrice", "offer_price", "final_price"],
+    "original_price": ["original_price", "compare_at_price", "mrp", "list_price", "originalPrice", "was_price"],
+    "brand": ["brand", "vendor", "manufacturer", "brand_name", "brandName"],
+    "rating": ["rating", "average_rating", "avg_rating", "averageRating", "stars"],
+    "image": ["image", "image_url", "imageUrl", "thumbnail", "images", "featured_image"],
+    "link": ["url", "link", "href", "product_url", "productUrl"]
+}
+
+# Query parameters that page through a listing endpoint
+OFFSET_PARAMS = ("offset", "start", "skip", "from")
+PAGE_PARAMS = ("page", "p", "page_no", "pageNumber")
+LIMIT_PARAMS = ("limit", "per_page", "page_size", "pageSize", "size", "rows")
+
+
+def first_value(item: Dict, keys: List[str]):
+    for key in keys:
+        value = item.get(key)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        if isinstance(value, dict):
+            value = value.get("src") or value.get("url") or value.get("amount") or value.get("value")
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def looks_like_product_list(value) -> bool:
+    """A non-empty list of objects most of which have a name and a price"""
+    if not isinstance(value, list) or not value or not all(isinstance(item, dict) for item in value[:20]):
+        return False
+    sample = value[:20]
+    matches = sum(1 for item in sample
+                  if first_value(item, FIELD_ALIASES["name"]) is not None
+                  and first_value(item, FIELD_ALIASES["price"]) is not None)
+    return matches >= max(1, len(sample) * 0.8)
+
+
+def find_product_list(payload, path: Tuple = ()) -> Optional[Tuple[Tuple, List[Dict]]]:
+    """Key path and items of the largest product-like list in a JSON payload"""
+    best = None
+    if looks_like_product_list(payload):
+        best = (path, payload)
+    children = (payload.items() if isinstance(payload, dict)
+                else enumerate(payload) if isinstance(payload, list) and not best else ())
+    for key, value in children:
+        if isinstance(value, (dict, list)):
+            found = find_product_list(value, path + (key,))
+            if found and (best is None or len(found[1]) > len(best[1])):
+                best = found
+    return best
+
+
+def value_at(payload, path: Tuple):
+    for key in path:
+        payload = payload[key]
+    return payload
+
+
+def format_price(value) -> Optional[str]:
+    """A numeric price as a rupee string with all its digits (₹1250000, ₹1299.50)"""
+    if value in (None, ""):
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    if isinstance(value, int):
+        return f"₹{value}"
+    if isinstance(value, float):
+        return f"₹{value:.2f}"
+    return str(value)
+
+
+def normalize_item(item: Dict, response_url: str) -> Dict:
+    """Raw product fields, in the shape of the Selenium scraper's batch extraction records"""
+    image = first_value(item, FIELD_ALIASES["image"])
+    link = first_value(item, FIELD_ALIASES["link"])
+    rating = first_value(item, FIELD_ALIASES["rating"])
+    return {
+        "name": str(first_value(item, FIELD_ALIASES["name"]) or ""),
+        "price": format_price(first_value(item, FIELD_ALIASES["price"])) or "",
+        "original_price": format_price(first_value(item, FIELD_ALIASES["original_price"])) or "",
+        "brand": str(first_value(item, FIELD_ALIASES["brand"]) or ""),
+        "rating": str(rating) if rating is not None else "",
+        # Relative URLs in an API response are relative to the API, not the page
+        "image": urljoin(response_url, str(image)) if image else "",
+        "link": urljoin(response_url, str(link)) if link else ""
+    }
+
+
+@dataclass
+class ApiEndpoint:
+    """A product-listing endpoint seen in the browser and how to page through it"""
+    url: str
+    path: Tuple
+    offset_param: Optional[str] = None
+    page_param: Optional[str] = None
+    limit_param: Optional[str] = None
+
+    @classmethod
+    def from_url(cls, url: str, path: Tuple) -> 'ApiEndpoint':
+        params = dict(parse_qsl(urlsplit(url).query))
+        pick = lambda names: next((name for name in names if name in params), None)
+        return cls(url, path, pick(OFFSET_PARAMS), pick(PAGE_PARAMS), pick(LIMIT_PARAMS))
+
+    @property
+    def replayable(self) -> bool:
+        return bool(self.offset_param or self.page_param)
+
+    def page_url(self, received: int, page: int, limit: Optional[int] = None) -> str:
+        """URL of the page after `received` items (offset APIs) or page number `page`"""
+        parts = urlsplit(self.url)
+        params = dict(parse_qsl(parts.query))
+        if self.offset_param:
+            params[self.offset_param] = str(int(params.get(self.offset_param, 0) or 0) + received)
+            # Bigger pages mean fewer requests; only safe when paging by offset
+            if limit and self.limit_param:
+                params[self.limit_param] = str(limit)
+        else:
+            params[self.page_param] = str(page)
+        return urlunsplit(parts._replace(query=urlencode(params)))
+
+
+def read_performance_log(driver) -> List[Dict]:
+    """DevTools messages logged since the last read
+
+    Needs a driver created with performance logging (capture_network=True).
+    Reading the log drains it, so read once per page and share the messages.
+    """
+    messages = []
+    for entry in driver.get_log("performance"):
+        try:
+            messages.append(json.loads(entry["message"])["message"])
+        except (KeyError, ValueError) as e:
+            logger.debug(f"Skipping performance log entry: {e}")
+    return messages
+
+
+def captured_json_responses(driver, messages: List[Dict]) -> List[Tuple[str, object]]:
+    """(url, payload) of every JSON XHR/fetch response among the logged messages"""
+    responses = []
+    for message in messages:
+        try:
+            if message.get("method") != "Network.responseReceived":
+                continue
+            params = message["params"]
+            response = params["response"]
+            if params.get("type") not in ("XHR", "Fetch") or "json" not in response.get("mimeType", ""):
+                continue
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+            text = base64.b64decode(body["body"]).decode("utf-8") if body.get("base64Encoded") else body["body"]
+            responses.append((response["url"], json.loads(text)))
+        except Exception as e:
+            logger.debug(f"Skipping network log entry: {e}")
+    return responses
+
+
+def capture_product_api(driver, messages: List[Dict]) -> Optional[Tuple[ApiEndpoint, List[Dict]]]:
+    """The endpoint that delivered the most products on the loaded page, with those products"""
+    best = None
+    for url, payload in captured_json_responses(driver, messages):
+        found = find_product_list(payload)
+        if found and (best is None or len(found[1]) > len(best[2])):
+            best = (url, found[0], found[1])
+    if best is None:
+        return None
+    url, path, items = best
+    endpoint = ApiEndpoint.from_url(url, path)
+    logger.info(f"🛰️ Product API found: {url} ({len(items)} products at {'/'.join(map(str, path)) or 'root'})")
+    return endpoint, [normalize_item(item, url) for item in items]
+
+
+def replay_endpoint(session, endpoint: ApiEndpoint, received: int, max_items: int = 5000,
+                    page_size: int = 100, timeout: float = 10) -> List[Dict]:
+    """Fetch the pages after the first `received` items over plain HTTP"""
+    if not endpoint.replayable:
+        logger.info(f"Endpoint {endpoint.url} has no paging parameter; not replaying")
+        return []
+
+    records, page = [], 2
+    while received + len(records) < max_items:
+        url = endpoint.page_url(received + len(records), page, page_size)
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        payload = response.json()
+        try:
+            items = value_at(payload, endpoint.path)
+        except (KeyError, IndexError, TypeError):
+            break
+        if not items:
+            break
+        records.extend(normalize_item(item, url) for item in items)
+        if isinstance(payload, dict) and payload.get("has_more") is False:
+            break
+        page += 1
+    logger.info(f"🛰️ Replayed {endpoint.url.split('?')[0]}: {len(records)} more products over HTTP")
+    return records
@@ -11,7 +11,12 @@ import logging
 from datetime import datetime
 from pathlib import Path
 from agri_scraper import AgriScraper
-from data_integrator import AgiNetDataIntegrator
+from data_integrator import AgrokartDataIntegrator
+from sync_events import SyncTrigger, DropDirectoryWatcher, DataVersionWatcher
+from sync_pipeline import StagedPipeline
+from metrics import SYNC_CYCLES, SYNC_CYCLE_SECONDS, start_metrics_server
+from profiling import HOOKS, add_profiling_arguments, profiling_from_args
+from tracing import add_logging_arguments, configure_logging, new_run_id, run_context, span
 
 # Setup logging
 logging.basicConfig(
@@ -29,10 +34,14 @@ class AutoSyncService:
     
     def __init__(self):
         self.scraper = AgriScraper()
-        self.integrator = AgiNetDataIntegrator()
+        self.integrator = AgrokartDataIntegrator()
         self.frontend_data_path = "../../frontend/src/data/products.json"
         self.last_sync = None
         self.sync_interval = 300  # 5 minutes
+        self.archive_dir = None  # Optional directory for JSON archives of each cycle
+        self.trigger = SyncTrigger()  # Local queue for event-driven mode
+        self.pipeline = None
+        self.cycle_profiles = {}
         
     def check_frontend_path(self):
         """Check if frontend data path exists"""
@@ -51,16 +60,9 @@ class AutoSyncService:
             products = self.scraper.generate_sample_data(100)
             
             if products:
-                # Save to JSON
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                json_file = f"auto_sync_{timestamp}.json"
-                
-                if self.scraper.save_to_json(products, json_file):
-                    logger.info(f"✅ Generated {len(products)} products")
-                    return json_file
-                else:
-                    logger.error("❌ Failed to save generated data")
-                    return None
+                logger.info(f"✅ Generated {len(products)} products")
+                self.archive_products(products)
+                return products
             else:
                 logger.warning("⚠️ No products generated")
                 return None
@@ -69,14 +71,27 @@ class AutoSyncService:
             logger.error(f"❌ Error generating data: {e}")
             return None
             
-    def sync_to_database(self, json_file):
+    def archive_products(self, products):
+        """Write a JSON archive of the products in the background, if enabled"""
+        if not self.archive_dir:
+            return None
+            
+        os.makedirs(self.archive_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        json_file = os.path.join(self.archive_dir, f"auto_sync_{timestamp}.json")
+        return self.scraper.archive_to_json(products, json_file)
+            
+    def sync_to_database(self, products):
         """Sync data to database"""
         try:
             logger.info("🔄 Syncing data to database...")
             
-            result = self.integrator.integrate_scraped_data(json_file)
+            result = self.integrator.integrate_products(products, source="auto_sync")
             
-            if result['products'] > 0:
+            if result.get('skipped'):
+                logger.info("⏭️ Input unchanged since last sync, database already up to date")
+                return True
+            elif result['products'] > 0 or result.get('updated', 0) > 0:
                 logger.info(f"✅ Database sync completed: {result}")
                 return True
             else:
@@ -135,6 +150,7 @@ class AutoSyncService:
                 "frontend_last_modified": frontend_modified,
                 "last_sync": self.last_sync.isoformat() if self.last_sync else None,
                 "sync_interval_minutes": self.sync_interval / 60,
+                "pipeline": self.pipeline.get_stats() if self.pipeline else None,
                 "service_status": "running"
             }
             
@@ -144,16 +160,25 @@ class AutoSyncService:
             
     def run_sync_cycle(self):
         """Run one complete sync cycle"""
+        started = time.perf_counter()
+        with HOOKS.cycle("sync_cycle"), run_context(new_run_id()), span("sync_cycle"):
+            success = self.sync_steps()
+        SYNC_CYCLE_SECONDS.observe(time.perf_counter() - started)
+        SYNC_CYCLES.labels("success" if success else "failure").inc()
+        return success
+        
+    def sync_steps(self):
+        """Generate, integrate and export one cycle's data"""
         try:
             logger.info("🚀 Starting sync cycle...")
             
             # Step 1: Generate fresh data
-            json_file = self.generate_fresh_data()
-            if not json_file:
+            products = self.generate_fresh_data()
+            if not products:
                 return False
                 
             # Step 2: Sync to database
-            if not self.sync_to_database(json_file):
+            if not self.sync_to_database(products):
                 return False
                 
             # Step 3: Export to frontend
@@ -162,10 +187,6 @@ class AutoSyncService:
                 
             # Step 4: Update sync timestamp
             self.last_sync = datetime.now()
-            
-            # Step 5: Cleanup
-            if os.path.exists(json_file):
-                os.remove(json_file)
                 
             logger.info("✅ Sync cycle completed successfully")
             return True
@@ -174,29 +195,145 @@ class AutoSyncService:
             logger.error(f"❌ Sync cycle failed: {e}")
             return False
             
-    def run_continuous(self):
-        """Run continuous auto-sync"""
+    def build_pipeline(self, queue_size=1):
+        """Build the generate → database → export pipeline"""
+        def generate(cycle):
+            return self.generate_fresh_data()
+            
+        def sync(products):
+            return True if self.sync_to_database(products) else None
+            
+        def export(_):
+            return True if self.export_to_frontend() else None
+            
+        pipeline = StagedPipeline([
+            ("generate", generate),
+            ("database", sync),
+            ("export", export)
+        ], queue_size=queue_size)
+        pipeline.on_complete = self.pipeline_cycle_completed
+        pipeline.on_drop = self.pipeline_cycle_dropped
+        return pipeline
+        
+    def pipeline_cycle_completed(self, item):
+        self.last_sync = datetime.now()
+        SYNC_CYCLE_SECONDS.observe(time.perf_counter() - item.started_at)
+        SYNC_CYCLES.labels("success").inc()
+        self.finish_cycle_profile(item.cycle)
+        
+    def pipeline_cycle_dropped(self, item, stage_name):
+        SYNC_CYCLES.labels("failure").inc()
+        self.finish_cycle_profile(item.cycle)
+        
+    def finish_cycle_profile(self, cycle):
+        session = self.cycle_profiles.pop(cycle, None)
+        if session:
+            session.stop()
+        
+    def cycle_ticks(self, pipeline, max_cycles=None):
+        """Start a cycle every sync_interval seconds (or back to back when 0)"""
+        cycle = 0
+        next_start = time.monotonic()
+        while max_cycles is None or cycle < max_cycles:
+            delay = next_start - time.monotonic()
+            if delay > 0 and pipeline.cancel_event.wait(delay):
+                return
+            next_start = time.monotonic() + self.sync_interval
+            cycle += 1
+            # Stages run on their own threads, so a requested cycle profile relies on the sampler
+            session = HOOKS.begin_cycle("sync_cycle", call_profile=False)
+            if session:
+                self.cycle_profiles[cycle] = session
+            yield cycle
+            
+    def run_continuous(self, max_cycles=None):
+        """Run continuous auto-sync as an overlapped staged pipeline"""
         logger.info("🔄 Starting continuous auto-sync service...")
         logger.info(f"📅 Sync interval: {self.sync_interval / 60} minutes")
         
-        # Run initial sync
-        self.run_sync_cycle()
+        self.pipeline = self.build_pipeline()
         
         try:
-            while True:
-                time.sleep(self.sync_interval)
+            self.pipeline.run(self.cycle_ticks(self.pipeline, max_cycles))
+            logger.info(f"📊 Pipeline stats: {self.pipeline.get_stats()}")
                 
-                logger.info("⏰ Auto-sync interval reached")
-                self.run_sync_cycle()
+        except KeyboardInterrupt:
+            logger.info("🛑 Auto-sync service stopped by user")
+        except Exception as e:
+            logger.error(f"❌ Auto-sync service error: {e}")
+            
+    def integrate_drop_files(self, paths):
+        """Integrate scrape files from the drop directory and move them aside"""
+        changed = False
+        
+        for path in sorted(set(paths)):
+            if not os.path.exists(path):
+                continue
                 
-                # Log status
-                status = self.get_sync_status()
-                logger.info(f"📊 Current status: {status['database_stats']}")
+            try:
+                result = self.integrator.integrate_scraped_data(path)
+                if not result.get('skipped') and (result['products'] > 0 or result.get('updated', 0) > 0):
+                    changed = True
+                    
+                processed_dir = os.path.join(os.path.dirname(path), "processed")
+                os.makedirs(processed_dir, exist_ok=True)
+                shutil.move(path, os.path.join(processed_dir, os.path.basename(path)))
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to integrate {path}: {e}")
+            
+        return changed
+        
+    def run_event_driven(self, drop_dir="incoming", debounce=2.0, db_poll_interval=1.0):
+        """Sync when scrape output lands or the database changes, instead of on a timer"""
+        logger.info("🔄 Starting event-driven auto-sync service...")
+        logger.info(f"📂 Drop directory: {drop_dir}, debounce: {debounce}s")
+        
+        dir_watcher = DropDirectoryWatcher(drop_dir, self.trigger)
+        dir_watcher.start()
+        
+        version_watcher = None
+        if db_poll_interval > 0:
+            version_watcher = DataVersionWatcher(self.integrator.db_path, self.trigger, db_poll_interval)
+            version_watcher.start()
+            
+        # Files that landed while the service was down
+        if os.path.isdir(drop_dir):
+            for name in os.listdir(drop_dir):
+                if name.endswith(".json"):
+                    self.trigger.signal("file", os.path.join(drop_dir, name))
+        exported_version = None
+        
+        try:
+            while True:
+                batch = self.trigger.wait_batch(debounce=debounce)
+                kinds = {event.kind for event in batch}
+                logger.info(f"⚡ Sync triggered by {len(batch)} event(s): {sorted(kinds)}")
                 
+                # Each triggered sync is a cycle, so SIGUSR2 profiles the next one
+                with HOOKS.cycle("sync_event"):
+                    files = [event.path for event in batch if event.kind == "file"]
+                    changed = self.integrate_drop_files(files) if files else False
+                    
+                    # Our own writes also bump data_version; only export for changes not yet exported
+                    if version_watcher and "db" in kinds and version_watcher.current_version() != exported_version:
+                        changed = True
+                    if "signal" in kinds:
+                        changed = True
+                        
+                    if changed and self.export_to_frontend():
+                        self.last_sync = datetime.now()
+                        if version_watcher:
+                            exported_version = version_watcher.current_version()
+                        
         except KeyboardInterrupt:
             logger.info("🛑 Auto-sync service stopped by user")
         except Exception as e:
             logger.error(f"❌ Auto-sync service error: {e}")
+        finally:
+            dir_watcher.stop()
+            if version_watcher:
+                version_watcher.stop()
             
     def run_once(self):
         """Run sync once and exit"""
@@ -222,21 +359,45 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description="AgiNet Auto-Sync Service")
-    parser.add_argument("--mode", choices=["continuous", "once"], default="once",
-                       help="Run mode: 'continuous' for auto-sync, 'once' for single sync")
+    parser.add_argument("--mode", choices=["continuous", "events", "once"], default="once",
+                       help="Run mode: 'continuous' for interval auto-sync, 'events' to sync on new "
+                            "scrape files or database changes, 'once' for single sync")
     parser.add_argument("--interval", type=int, default=300,
                        help="Sync interval in seconds (default: 300 = 5 minutes)")
+    parser.add_argument("--cycles", type=int, default=None,
+                       help="Stop 'continuous' mode after this many cycles")
+    parser.add_argument("--archive-dir", default=None,
+                       help="Also write each cycle's products to JSON in this directory (in the background)")
+    parser.add_argument("--drop-dir", default="incoming",
+                       help="Directory watched for new scrape files in 'events' mode")
+    parser.add_argument("--debounce", type=float, default=2.0,
+                       help="Seconds of quiet before a burst of events triggers one sync")
+    parser.add_argument("--db-poll", type=float, default=1.0,
+                       help="Seconds between database change checks in 'events' mode (0 disables)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                       help="Serve Prometheus metrics on this port")
+    add_profiling_arguments(parser)
+    add_logging_arguments(parser)
     
     args = parser.parse_args()
+    configure_logging(args.log_format)
+    
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
     
     # Create auto-sync service
     sync_service = AutoSyncService()
     sync_service.sync_interval = args.interval
+    sync_service.archive_dir = args.archive_dir
     
-    if args.mode == "continuous":
-        sync_service.run_continuous()
-    else:
-        sync_service.run_once()
+    # kill -USR1 <pid> toggles profiling; kill -USR2 <pid> profiles the next sync cycle
+    with profiling_from_args(args, f"auto_sync_{args.mode}"):
+        if args.mode == "continuous":
+            sync_service.run_continuous(args.cycles)
+        elif args.mode == "events":
+            sync_service.run_event_driven(args.drop_dir, args.debounce, args.db_poll)
+        else:
+            sync_service.run_once()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite for AgiNet
+Times parse, dedup, ingest, stats, export and Firestore upload at several scales and flags regressions
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import logging
+import platform
+import resource
+import tempfile
+import multiprocessing
+from queue import Empty
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+from catalog_loadtest import percentile
+
+logger = logging.getLogger(__name__)
+
+PARSER_BACKENDS = ["html.parser", "lxml", "html5lib"]
+
+
+class FakeFirestore:
+    """Just enough of the Firestore client API for upload_to_firestore, with a per-commit delay"""
+
+    class Batch:
+        def __init__(self, store):
+            self.store = store
+            self.writes = []
+
+        def set(self, doc_ref, data):
+            self.writes.append((doc_ref, data))
+
+        def commit(self):
+            if len(self.writes) > 500:
+                raise ValueError("maximum 500 writes allowed per batch")
+            time.sleep(self.store.commit_latency)
+            self.store.documents += len(self.writes)
+            self.store.commits += 1
+
+    class Collection:
+        def __init__(self, name):
+            self.name = name
+
+        def document(self):
+            return object()
+
+    def __init__(self, commit_latency: float = 0.005):
+        self.commit_latency = commit_latency
+        self.documents = 0
+        self.commits = 0
+
+    def batch(self):
+        return FakeFirestore.Batch(self)
+
+    def collection(self, name):
+        return FakeFirestore.Collection(name)
+
+
+def ensure_database(scale: int, workdir: str) -> str:
+    """A database holding `scale` synthetic products, built once per scale"""
+    from catalog_generator import CatalogGenerator
+    from data_integrator import AgrokartDataIntegrator
+
+    db_path = os.path.join(workdir, f"bench_{scale}.db")
+    if not os.path.exists(db_path):
+        integrator = AgrokartDataIntegrator(db_path)
+        for batch in CatalogGenerator(seed=1).iter_batches(scale, 10000):
+            integrator.insert_products(batch)
+            integrator.insert_categories(sorted({p["category"] for p in batch}))
+            integrator.insert_brands(sorted({p["brand"] for p in batch}))
+    return db_path
+
+
+def timed(func: Callable, repeat: int) -> List[float]:
+    latencies = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def bench_parse(scale: int, workdir: str, repeat: int, backend: str = "html.parser") -> Tuple[List[float], int]:
+    """Per-page extraction latency over stand-in shaped listing pages"""
+    from agri_scraper import AgriScraper
+    from standin_server import SyntheticCatalog, render_agrostar, render_bighaat
+
+    catalog = SyntheticCatalog(total_products=max(scale * 4, 1000), page_size=24)
+    pages = []
+    for number in range(1, max(scale // 24, 1) + 1):
+        site, category, render = (("BigHaat", "/collections/seeds", render_bighaat) if number % 2
+                                  else ("AgroStar", "/seeds", render_agrostar))
+        page = (number + 1) // 2
+        pages.append((site, category, render(catalog.page(site, category, page), category).encode("utf-8")))
+
+    scraper = AgriScraper()
+    scraper.parser = backend
+    latencies = []
+    for _ in range(repeat):
+        for site, category, content in pages:
+            started = time.perf_counter()
+            scraper.extract_page(site, category, content, "http://127.0.0.1")
+            latencies.append(time.perf_counter() - started)
+    return latencies, len(pages) * 24 * repeat
+
+
+def bench_dedup(scale: int, workdir: str, repeat: int) -> Tuple[List[float], int]:
+    from agri_scraper import AgriScraper
+    from catalog_generator import CatalogGenerator
+
+    products = CatalogGenerator(seed=1).generate(scale)
+    products += products[: scale // 10]  # 10% duplicates
+    scraper = AgriScraper()
+    return timed(lambda: scraper.remove_duplicates(products), repeat), len(products) * repeat
+
+
+def bench_ingest(scale: int, workdir: str, repeat: int, batch_size: int = 1000) -> Tuple[List[float], int]:
+    """Per-batch insert_products latency into a fresh database"""
+    from catalog_generator import CatalogGenerator
+    from data_integrator import AgrokartDataIntegrator
+
+    records = [record for batch in CatalogGenerator(seed=2).iter_batches(scale) for record in batch]
+    latencies = []
+    for run in range(repeat):
+        integrator = AgrokartDataIntegrator(os.path.join(workdir, f"ingest_{scale}_{run}.db"))
+        for start in range(0, len(records), batch_size):
+            started = time.perf_counter()
+            integrator.insert_products(records[start:start + batch_size])
+            latencies.append(time.perf_counter() - started)
+    return latencies, len(records) * repeat
+
+
+def bench_stats(scale: int, workdir: str, repeat: int) -> Tuple[List[float], int]:
+    from data_integrator import AgrokartDataIntegrator
+
+    integrator = AgrokartDataIntegrator(ensure_database(scale, workdir))
+    calls = repeat * 10
+    return timed(integrator.get_database_stats, calls), calls
+
+
+def bench_export(scale: int, workdir: str, repeat: int) -> Tuple[List[float], int]:
+    from data_integrator import AgrokartDataIntegrator
+
+    integrator = AgrokartDataIntegrator(ensure_database(scale, workdir))
+    output = os.path.join(workdir, f"export_{scale}.json")
+    return timed(lambda: integrator.export_to_json(output), repeat), scale * repeat
+
+
+def bench_firestore(scale: int, workdir: str, repeat: int) -> Tuple[List[float], int]:
+    from agri_scraper import AgriScraper
+    from catalog_generator import CatalogGenerator
+
+    products = CatalogGenerator(seed=3).generate(scale)
+    scraper = AgriScraper()
+    return timed(lambda: scraper.upload_to_firestore(FakeFirestore(), products), repeat), scale * repeat
+
+
+def benchmark_cases() -> Dict[str, Callable]:
+    cases = {f"parse[{backend}]": (lambda backend: lambda *args: bench_parse(*args, backend=backend))(backend)
+             for backend in PARSER_BACKENDS}
+    cases.update({
+        "dedup": bench_dedup,
+        "ingest": bench_ingest,
+        "stats": bench_stats,
+        "export": bench_export,
+        "firestore_upload": bench_firestore
+    })
+    return cases
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_case_process(name: str, scale: int, workdir: str, repeat: int, results):
+    logging.basicConfig(level=logging.WARNING)
+    try:
+        latencies, items = benchmark_cases()[name](scale, workdir, repeat)
+        latencies.sort()
+        total = sum(latencies)
+        results.put({
+            "case": name,
+            "scale": scale,
+            "items": items,
+            "operations": len(latencies),
+            "seconds": round(total, 4),
+            "throughput_per_sec": round(items / total, 1) if total else None,
+            "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+            "peak_rss_mb": peak_rss_mb()
+        })
+    except Exception as e:
+        results.put({"case": name, "scale": scale, "error": str(e)})
+
+
+def run_case(name: str, scale: int, workdir: str, repeat: int, timeout: float = 1800.0) -> Dict:
+    """Run one case in a fresh process so its peak RSS is its own
+
+    A case whose process dies without a result (e.g. killed for running out
+    of memory) or runs past `timeout` seconds is reported as an error.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=run_case_process, args=(name, scale, workdir, repeat, results))
+    process.start()
+    deadline = time.monotonic() + timeout
+    result = None
+    while result is None:
+        try:
+            result = results.get(timeout=1.0)
+        except Empty:
+            if not process.is_alive():
+                # It may have put its result just before exiting
+                try:
+                    result = results.get(timeout=1.0)
+                except Empty:
+                    result = {"case": name, "scale": scale,
+                              "error": f"process exited with code {process.exitcode} and no result"}
+            elif time.monotonic() > deadline:
+                process.terminate()
+                result = {"case": name, "scale": scale, "error": f"timed out after {timeout:.0f}s"}
+    process.join()
+    return result
+
+
+def run_suite(scales: List[int], cases: List[str] = None, repeat: int = 3, workdir: str = None,
+              timeout: float = 1800.0) -> Dict:
+    cases = cases or list(benchmark_cases())
+    own_workdir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix="aginet_bench_")
+    results = []
+    try:
+        for scale in scales:
+            for name in cases:
+                result = run_case(name, scale, workdir, repeat, timeout)
+                results.append(result)
+                if "error" in result:
+                    logger.error(f"❌ {name} @ {scale:,}: {result['error']}")
+                else:
+                    logger.info(f"⏱️ {name} @ {scale:,}: {result['throughput_per_sec']:,} items/s, "
+                                f"p50 {result['p50_ms']}ms, p99 {result['p99_ms']}ms, "
+                                f"peak RSS {result['peak_rss_mb']}MB")
+    finally:
+        if own_workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, threshold: float = 0.15, noise_floor_ms: float = 1.0) -> List[Dict]:
+    """Cases whose throughput fell or p99 rose by more than `threshold` versus the baseline"""
+    previous = {(r["case"], r["scale"]): r for r in baseline.get("results", []) if "error" not in r}
+    regressions = []
+    for result in report["results"]:
+        before = previous.get((result["case"], result["scale"]))
+        if before is None or "error" in result:
+            continue
+
+        problems = []
+        if before["throughput_per_sec"] and result["throughput_per_sec"] < before["throughput_per_sec"] * (1 - threshold):
+            problems.append(f"throughput {before['throughput_per_sec']:,} -> {result['throughput_per_sec']:,}/s")
+        if max(before["p99_ms"], result["p99_ms"]) >= noise_floor_ms and result["p99_ms"] > before["p99_ms"] * (1 + threshold):
+            problems.append(f"p99 {before['p99_ms']} -> {result['p99_ms']}ms")
+        if problems:
+            regressions.append({"case": result["case"], "scale": result["scale"], "problems": problems})
+    return regressions
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AgiNet pipeline benchmark suite")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000], help="Product counts to test")
+    parser.add_argument("--cases", nargs="*", default=None, help="Cases to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions per case")
+    parser.add_argument("--timeout", type=float, default=1800.0, help="Seconds before a case is abandoned")
+    parser.add_argument("--output", default="benchmark_results", help="Directory for result JSON files")
+    parser.add_argument("--baseline", default=None, help="Baseline result file to compare against")
+    parser.add_argument("--save-baseline", default=None, help="Also write the results to this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown before flagging")
+    parser.add_argument("--list", action="store_true", help="List available cases and exit")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.list:
+        print("\n".join(benchmark_cases()))
+        return 0
+
+    report = run_suite(args.scales, args.cases, args.repeat, timeout=args.timeout)
+
+    os.makedirs(args.output, exist_ok=True)
+    output_file = os.path.join(args.output, f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Results saved to {output_file}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_to_baseline(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"🚨 {len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"   {regression['case']} @ {regression['scale']:,}: {'; '.join(regression['problems'])}")
+            return 1
+        print(f"✅ No regressions against {args.baseline} (threshold {args.threshold:.0%})")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Synthetic Catalog Generator for AgiNet
+Composes millions of realistic, reproducible products with NumPy for benchmarks and load tests
+"""
+
+import re
+import json
+import time
+import logging
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+from agri_scraper import AgriScraper, Product, SAMPLE_PRODUCT_NAMES, SAMPLE_BRANDS
+
+logger = logging.getLogger(__name__)
+
+# Rows generated per RNG block; output does not depend on the caller's batch size
+BLOCK_SIZE = 10000
+
+# Category mix, median price (₹) and pack sizes with their price multipliers
+CATEGORY_PROFILES = {
+    "Fertilizers": {"weight": 0.35, "median_price": 650,
+                    "packs": {"1kg": 0.15, "5kg": 0.5, "10kg": 0.8, "25kg": 1.0, "45kg": 1.5, "50kg": 1.7}},
+    "Seeds": {"weight": 0.30, "median_price": 380,
+              "packs": {"10g": 0.2, "50g": 0.4, "100g": 0.6, "450g": 1.0, "1kg": 1.4, "10kg": 4.0}},
+    "Pesticides": {"weight": 0.20, "median_price": 520,
+                   "packs": {"100ml": 0.3, "250ml": 0.55, "500ml": 0.8, "1L": 1.0, "5L": 3.5}},
+    "Farm Equipment": {"weight": 0.15, "median_price": 4200,
+                       "packs": {"": 1.0, "Heavy Duty": 1.6, "Set of 2": 1.8}}
+}
+
+VARIANTS = ["", "", "", " Premium", " Gold", " Plus", " Pro", " Advanced"]
+
+# Trailing pack size in a built-in name, e.g. "Urea 46% Nitrogen 45kg"
+PACK_SUFFIX = re.compile(r'\s+\d+(\.\d+)?\s*(kg|g|ml|L)$')
+
+
+class CatalogGenerator:
+    """Seeded, vectorized product generator
+
+    Rows are produced in blocks of BLOCK_SIZE, each drawn from an RNG seeded
+    with (seed, block number), so the same seed always yields the same
+    catalog whatever batch size it is consumed in. Every product gets a
+    unique model code, so names never collide at any scale.
+    """
+
+    def __init__(self, seed: Optional[int] = 42, id_offset: int = 0):
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2**32)
+        self.id_offset = id_offset
+        self.categories = list(CATEGORY_PROFILES)
+        self.category_weights = np.array([CATEGORY_PROFILES[c]["weight"] for c in self.categories])
+
+        # Flat lookup tables; each category's rows sit in one contiguous range
+        scraper = AgriScraper()
+        self.base_names, self.base_images, self.base_starts, self.base_counts = [], [], [], []
+        self.packs, self.pack_factors, self.pack_starts, self.pack_counts = [], [], [], []
+        for category in self.categories:
+            names = sorted({PACK_SUFFIX.sub("", name) for name in SAMPLE_PRODUCT_NAMES[category]})
+            self.base_starts.append(len(self.base_names))
+            self.base_counts.append(len(names))
+            self.base_names.extend(names)
+            self.base_images.extend(scraper.get_sample_image_url(name, category) for name in names)
+
+            packs = CATEGORY_PROFILES[category]["packs"]
+            self.pack_starts.append(len(self.packs))
+            self.pack_counts.append(len(packs))
+            self.packs.extend(f" {pack}" if pack else "" for pack in packs)
+            self.pack_factors.extend(packs.values())
+
+        self.base_names = np.array(self.base_names, dtype=object)
+        self.base_images = np.array(self.base_images, dtype=object)
+        self.base_starts, self.base_counts = np.array(self.base_starts), np.array(self.base_counts)
+        self.packs = np.array(self.packs, dtype=object)
+        self.pack_factors = np.array(self.pack_factors)
+        self.pack_starts, self.pack_counts = np.array(self.pack_starts), np.array(self.pack_counts)
+        self.median_prices = np.array([CATEGORY_PROFILES[c]["median_price"] for c in self.categories])
+        self.brands = np.array(SAMPLE_BRANDS, dtype=object)
+        self.variants = np.array(VARIANTS, dtype=object)
+        self.category_names = np.array(self.categories, dtype=object)
+
+    def generate_block(self, block: int) -> Dict[str, np.ndarray]:
+        """Columns for rows [block * BLOCK_SIZE, (block + 1) * BLOCK_SIZE)"""
+        rng = np.random.default_rng([self.seed, block])
+        n = BLOCK_SIZE
+        index = np.arange(block * n, (block + 1) * n) + self.id_offset
+
+        category = rng.choice(len(self.categories), size=n, p=self.category_weights)
+        base = self.base_starts[category] + (rng.random(n) * self.base_counts[category]).astype(np.int64)
+        pack = self.pack_starts[category] + (rng.random(n) * self.pack_counts[category]).astype(np.int64)
+        brand = rng.integers(0, len(self.brands), size=n)
+        variant = rng.integers(0, len(self.variants), size=n)
+
+        # Log-normal prices around each category's median, scaled by pack size
+        price = self.median_prices[category] * self.pack_factors[pack] * rng.lognormal(0.0, 0.45, size=n)
+        price = np.maximum(np.round(price), 20).astype(np.int64)
+        discounted = rng.random(n) < 0.45
+        original_price = np.round(price * rng.uniform(1.05, 1.4, size=n)).astype(np.int64)
+
+        rated = rng.random(n) < 0.9
+        rating = np.round(np.clip(rng.normal(4.2, 0.4, size=n), 1.0, 5.0), 1)
+        reviews = np.where(rated, rng.geometric(1 / 120, size=n), 0)
+        in_stock = rng.random(n) < 0.85
+
+        codes = np.array([f" AK{i:07d}" for i in index], dtype=object)
+        names = self.brands[brand] + " " + self.base_names[base] + self.variants[variant] + self.packs[pack] + codes
+        return {
+            "index": index,
+            "name": names,
+            "base": self.base_names[base],
+            "category": self.category_names[category],
+            "brand": self.brands[brand],
+            "image_url": self.base_images[base],
+            "price": price,
+            "original_price": np.where(discounted, original_price, 0),
+            "rating": np.where(rated, rating, np.nan),
+            "reviews_count": reviews,
+            "in_stock": in_stock
+        }
+
+    def block_records(self, columns: Dict[str, np.ndarray]) -> List[Dict]:
+        """Product dicts (the asdict(Product) shape) from a column block"""
+        records = []
+        for i in range(len(columns["index"])):
+            original_price = int(columns["original_price"][i])
+            rating = float(columns["rating"][i])
+            records.append({
+                "name": columns["name"][i],
+                "price": f"₹{int(columns['price'][i])}",
+                "original_price": f"₹{original_price}" if original_price else None,
+                "image_url": columns["image_url"][i],
+                "description": f"High quality {columns['base'][i].lower()} for better crop yield and farming productivity.",
+                "category": columns["category"][i],
+                "brand": columns["brand"][i],
+                "availability": "In Stock" if columns["in_stock"][i] else "Out of Stock",
+                "rating": None if np.isnan(rating) else rating,
+                "reviews_count": int(columns["reviews_count"][i]),
+                "source_url": f"https://example.com/product/{int(columns['index'][i]) + 1}",
+                "source_site": "Sample Data"
+            })
+        return records
+
+    def iter_batches(self, count: int, batch_size: int = 50000) -> Iterator[List[Dict]]:
+        """Yield `count` product dicts in batches of `batch_size`"""
+        buffered, produced, block = [], 0, 0
+        while produced < count:
+            while len(buffered) < batch_size and produced + len(buffered) < count:
+                buffered.extend(self.block_records(self.generate_block(block)))
+                block += 1
+            take = min(batch_size, count - produced)
+            batch, buffered = buffered[:take], buffered[take:]
+            produced += len(batch)
+            yield batch
+
+    def generate(self, count: int) -> List[Product]:
+        """`count` products as Product objects (small counts; stream large ones)"""
+        return [Product(**record) for batch in self.iter_batches(count) for record in batch]
+
+    def write_ndjson(self, path: str, count: int, batch_size: int = 50000) -> int:
+        written = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            for batch in self.iter_batches(count, batch_size):
+                f.write("".join(json.dumps(record, ensure_ascii=False) + "\n" for record in batch))
+                written += len(batch)
+        return written
+
+    def write_json(self, path: str, count: int, batch_size: int = 50000) -> int:
+        """Stream the save_to_json document shape without holding the catalog in memory"""
+        written = 0
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{\n  "products": [')
+            for batch in self.iter_batches(count, batch_size):
+                for record in batch:
+                    f.write((",\n    " if written else "\n    ") + json.dumps(record, ensure_ascii=False))
+                    written += 1
+            f.write('\n  ],\n')
+            f.write(f'  "total_count": {written},\n')
+            f.write(f'  "scraped_at": "{time.strftime("%Y-%m-%d %H:%M:%S")}",\n')
+            f.write(f'  "categories": {json.dumps(self.categories)}\n}}\n')
+        return written
+
+    def integrate(self, db_path: str, count: int, batch_size: int = 50000) -> Dict[str, int]:
+        """Feed the catalog straight into the integrator, batch by batch"""
+        from data_integrator import AgrokartDataIntegrator
+
+        integrator = AgrokartDataIntegrator(db_path)
+        totals = {"products": 0, "updated": 0, "unchanged": 0}
+        for number, batch in enumerate(self.iter_batches(count, batch_size)):
+            result = integrator.integrate_products(batch, source=f"synthetic:{self.seed}:{number}")
+            for key in totals:
+                totals[key] += result.get(key, 0) if result else 0
+        return totals
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AgiNet synthetic catalog generator")
+    parser.add_argument("--count", type=int, default=100000, help="Products to generate")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (same seed, same catalog)")
+    parser.add_argument("--format", choices=["ndjson", "json", "db"], default="ndjson",
+                        help="Write NDJSON, a save_to_json-style document, or integrate into the database")
+    parser.add_argument("--output", default="synthetic_catalog.ndjson", help="Output file for ndjson/json")
+    parser.add_argument("--db-path", default="../database.db", help="Database path for --format db")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Products per streamed batch")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    generator = CatalogGenerator(args.seed)
+    started = time.time()
+    if args.format == "db":
+        result = generator.integrate(args.db_path, args.count, args.batch_size)
+        print(f"✅ Integrated {args.count:,} synthetic products: {result}")
+    else:
+        write = generator.write_ndjson if args.format == "ndjson" else generator.write_json
+        written = write(args.output, args.count, args.batch_size)
+        print(f"✅ Wrote {written:,} synthetic products to {args.output}")
+
+    elapsed = time.time() - started
+    print(f"⏱️ {elapsed:.1f}s ({args.count / elapsed:,.0f} products/sec)")
+
+
+if __name__ == "__main__":
+    main()
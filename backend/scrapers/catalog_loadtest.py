@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Load Test for the AgiNet Product Catalog Service
+Drives concurrent keep-alive clients and reports latency percentiles and throughput
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Dict, List
+
+DEFAULT_PATHS = [
+    "/products",
+    "/products?page=2",
+    "/products?category=Fertilizers",
+    "/products?category=Seeds&sort=price",
+    "/products?q=seeds&page_size=50",
+    "/products?min_price=500&max_price=2000&sort=-price",
+    "/categories",
+    "/brands",
+    "/stats",
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+async def read_response(reader: asyncio.StreamReader):
+    """Read one HTTP/1.1 response and return (status, headers)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed connection")
+    status = int(status_line.split()[1])
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers
+
+
+async def client(host: str, port: int, paths: List[str], deadline: float,
+                 latencies: List[float], statuses: Counter, use_etags: bool, use_gzip: bool):
+    """Issue requests over one keep-alive connection until the deadline"""
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+
+    try:
+        while time.perf_counter() < deadline:
+            path = random.choice(paths)
+            request = [f"GET {path} HTTP/1.1", f"Host: {host}:{port}"]
+            if use_gzip:
+                request.append("Accept-Encoding: gzip")
+            if use_etags and path in etags:
+                request.append(f"If-None-Match: {etags[path]}")
+
+            start = time.perf_counter()
+            writer.write(("\r\n".join(request) + "\r\n\r\n").encode("latin-1"))
+            await writer.drain()
+            status, headers = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] += 1
+
+            if "etag" in headers:
+                etags[path] = headers["etag"]
+
+    finally:
+        writer.close()
+
+
+async def run_load_test(host: str = "127.0.0.1", port: int = 8765, concurrency: int = 16,
+                        duration: float = 10.0, paths: List[str] = None,
+                        use_etags: bool = True, use_gzip: bool = True) -> Dict:
+    """Run the load test and return a summary report"""
+    paths = paths or DEFAULT_PATHS
+    latencies = []
+    statuses = Counter()
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        client(host, port, paths, deadline, latencies, statuses, use_etags, use_gzip)
+        for _ in range(concurrency)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "duration_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        "status_counts": dict(statuses),
+        "concurrency": concurrency
+    }
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load test the AgiNet catalog service")
+    parser.add_argument("--host", default="127.0.0.1", help="Catalog service host")
+    parser.add_argument("--port", type=int, default=8765, help="Catalog service port")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds")
+    parser.add_argument("--no-etags", action="store_true", help="Do not send If-None-Match")
+    parser.add_argument("--no-gzip", action="store_true", help="Do not request gzip bodies")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load_test(
+        args.host, args.port, args.concurrency, args.duration,
+        use_etags=not args.no_etags, use_gzip=not args.no_gzip
+    ))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print("📊 Catalog Load Test Results:")
+    print(f"   Requests: {report['requests']} in {report['duration_seconds']}s")
+    print(f"   Throughput: {report['requests_per_second']} req/s")
+    print(f"   Latency p50: {report['p50_ms']} ms")
+    print(f"   Latency p99: {report['p99_ms']} ms")
+    print(f"   Status codes: {report['status_counts']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Product Catalog Read Service for AgiNet
+Serves paginated/filtered product queries straight from the SQLite database
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_COLUMNS = [
+    "id", "name", "description", "price", "original_price", "category", "brand",
+    "image_url", "availability", "rating", "reviews_count", "source_url",
+    "source_site", "created_at"
+]
+
+SORT_ORDERS = {
+    "newest": "created_at DESC, id DESC",
+    "price": "price ASC, id ASC",
+    "-price": "price DESC, id ASC",
+    "name": "name ASC, id ASC",
+    "rating": "rating DESC, id ASC",
+}
+
+STATUS_TEXT = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+
+
+class ResponseCache:
+    """Small LRU cache of rendered responses keyed by normalized request"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+class CachedResponse:
+    """Rendered JSON body with its ETag and lazily built gzip variant"""
+
+    __slots__ = ("status", "body", "etag", "_gzipped")
+
+    def __init__(self, status: int, body: bytes):
+        self.status = status
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest()[:20] + '"'
+        self._gzipped = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=5)
+        return self._gzipped
+
+
+class CatalogQueries:
+    """Read-only queries against the products database"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = None
+
+    def connect(self):
+        # Opened on the worker thread that runs every query
+        self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        self.conn.row_factory = sqlite3.Row
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def data_version(self) -> int:
+        """Changes whenever another connection commits to the database"""
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def product_dict(self, row) -> Dict:
+        return {column: row[column] for column in PRODUCT_COLUMNS}
+
+    def list_products(self, params: Dict[str, str]) -> Dict:
+        page = max(1, int(params.get("page", 1)))
+        page_size = min(max(1, int(params.get("page_size", 20))), 100)
+        sort = params.get("sort", "newest")
+        if sort not in SORT_ORDERS:
+            raise ValueError(f"Unknown sort order: {sort}")
+
+        clauses = []
+        values = []
+        for column in ("category", "brand", "source_site", "availability"):
+            if params.get(column):
+                clauses.append(f"{column} = ?")
+                values.append(params[column])
+        if params.get("q"):
+            clauses.append("(name LIKE ? OR description LIKE ?)")
+            values.extend([f"%{params['q']}%"] * 2)
+        if params.get("min_price"):
+            clauses.append("price >= ?")
+            values.append(float(params["min_price"]))
+        if params.get("max_price"):
+            clauses.append("price <= ?")
+            values.append(float(params["max_price"]))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        total = self.conn.execute(f"SELECT COUNT(*) FROM products {where}", values).fetchone()[0]
+        rows = self.conn.execute(
+            f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM products {where} "
+            f"ORDER BY {SORT_ORDERS[sort]} LIMIT ? OFFSET ?",
+            values + [page_size, (page - 1) * page_size]
+        ).fetchall()
+
+        return {
+            "products": [self.product_dict(row) for row in rows],
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "total_pages": (total + page_size - 1) // page_size
+        }
+
+    def get_product(self, product_id: int) -> Optional[Dict]:
+        row = self.conn.execute(
+            f"SELECT {', '.join(PRODUCT_COLUMNS)} FROM products WHERE id = ?", (product_id,)
+        ).fetchone()
+        return self.product_dict(row) if row else None
+
+    def list_names(self, table: str) -> Dict:
+        rows = self.conn.execute(f"SELECT name FROM {table} WHERE name != '' ORDER BY name").fetchall()
+        return {table: [row[0] for row in rows]}
+
+    def stats(self) -> Dict:
+        return {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("products", "categories", "brands")
+        }
+
+
+class CatalogServer:
+    """Asyncio HTTP/1.1 server for the product catalog"""
+
+    def __init__(self, db_path: str = "../database.db", host: str = "127.0.0.1",
+                 port: int = 8765, cache_size: int = 256):
+        self.host = host
+        self.port = port
+        self.queries = CatalogQueries(db_path)
+        self.cache = ResponseCache(cache_size)
+        self.cached_version = None
+        # A single worker thread owns the SQLite connection
+        self.db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-db")
+        self.server = None
+        self.connections = set()
+
+    async def run_db(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.db_executor, func, *args)
+
+    def route(self, path: str, params: Dict[str, str]) -> Tuple[int, Dict]:
+        """Resolve a request path to a status code and JSON payload (runs on the DB thread)"""
+        parts = [part for part in path.split("/") if part]
+
+        if parts == ["products"]:
+            return 200, self.queries.list_products(params)
+        if len(parts) == 2 and parts[0] == "products":
+            if not parts[1].isdigit():
+                return 404, {"error": "Product not found"}
+            product = self.queries.get_product(int(parts[1]))
+            return (200, product) if product else (404, {"error": "Product not found"})
+        if parts == ["categories"]:
+            return 200, self.queries.list_names("categories")
+        if parts == ["brands"]:
+            return 200, self.queries.list_names("brands")
+        if parts == ["stats"]:
+            return 200, self.queries.stats()
+        if parts == ["health"]:
+            return 200, {"status": "ok"}
+        return 404, {"error": f"Unknown path: {path}"}
+
+    def render(self, path: str, params: Dict[str, str]) -> CachedResponse:
+        """Invalidate on data change, then serve from cache or query (runs on the DB thread)"""
+        version = self.queries.data_version()
+        if version != self.cached_version:
+            if self.cached_version is not None:
+                logger.info("Database changed, clearing response cache")
+            self.cache.clear()
+            self.cached_version = version
+
+        key = (path, tuple(sorted(params.items())))
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+
+        try:
+            status, payload = self.route(path, params)
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+
+        response = CachedResponse(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+        if status == 200:
+            self.cache.put(key, response)
+        return response
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.write_response(writer, CachedResponse(400, b'{"error": "Bad request"}'), False)
+                    break
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                await self.handle_request(writer, method, target, headers, keep_alive)
+                if not keep_alive:
+                    break
+
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            logger.error(f"Error handling connection: {e}")
+        finally:
+            self.connections.discard(writer)
+            writer.close()
+
+    async def handle_request(self, writer, method: str, target: str, headers: Dict[str, str], keep_alive: bool):
+        if method not in ("GET", "HEAD"):
+            await self.write_response(writer, CachedResponse(405, b'{"error": "Method not allowed"}'), keep_alive)
+            return
+
+        url = urlsplit(target)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            response = await self.run_db(self.render, url.path, params)
+        except Exception as e:
+            logger.error(f"Error serving {target}: {e}")
+            response = CachedResponse(500, b'{"error": "Internal server error"}')
+
+        not_modified = response.status == 200 and headers.get("if-none-match") == response.etag
+        use_gzip = "gzip" in headers.get("accept-encoding", "") and len(response.body) >= GZIP_MIN_SIZE
+        await self.write_response(writer, response, keep_alive, not_modified=not_modified,
+                                  use_gzip=use_gzip, head_only=method == "HEAD")
+
+    async def write_response(self, writer, response: CachedResponse, keep_alive: bool,
+                             not_modified=False, use_gzip=False, head_only=False):
+        status = 304 if not_modified else response.status
+        body = b"" if not_modified else (response.gzipped if use_gzip else response.body)
+
+        header_lines = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            "Content-Type: application/json; charset=utf-8",
+            f"Content-Length: {len(body)}",
+            f"ETag: {response.etag}",
+            "Vary: Accept-Encoding",
+            "Cache-Control: no-cache",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if use_gzip and not not_modified:
+            header_lines.append("Content-Encoding: gzip")
+
+        writer.write(("\r\n".join(header_lines) + "\r\n\r\n").encode("latin-1"))
+        if not head_only:
+            writer.write(body)
+        await writer.drain()
+
+    async def start(self):
+        await self.run_db(self.queries.connect)
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        logger.info(f"📡 Catalog service listening on http://{self.host}:{self.port}")
+
+    async def stop(self):
+        if self.server:
+            self.server.close()
+            # Idle keep-alive connections would otherwise outlive the server
+            for writer in list(self.connections):
+                writer.close()
+            await self.server.wait_closed()
+        await self.run_db(self.queries.close)
+        self.db_executor.shutdown(wait=True)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self.server.serve_forever()
+        finally:
+            await self.stop()
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.cache.entries),
+            "hits": self.cache.hits,
+            "misses": self.cache.misses
+        }
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AgiNet Product Catalog Service")
+    parser.add_argument("--db-path", default="../database.db", help="Database file path")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--cache-size", type=int, default=256, help="Maximum cached responses")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    server = CatalogServer(args.db_path, args.host, args.port, args.cache_size)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        logger.info("🛑 Catalog service stopped by user")
+
+
+if __name__ == "__main__":
+    main()
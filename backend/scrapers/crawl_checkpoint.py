@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Crawl Checkpoints for AgiNet
+Records finished pages as they complete so an interrupted crawl resumes where it stopped
+"""
+
+import os
+import json
+import time
+import logging
+from dataclasses import asdict, is_dataclass
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlCheckpoint:
+    """Append-only JSON-lines log of completed (site, category, page) results
+
+    Every finished page is appended and fsynced, so a crash loses at most the
+    page in flight. Reopening the same path resumes: finished pages are served
+    from the log instead of being fetched again. Once the crawl's products are
+    safely ingested, call finish() to clear the log.
+    """
+
+    def __init__(self, path: str, max_age_hours: float = 24.0):
+        self.path = path
+        self.max_age_hours = max_age_hours
+        self.pages = {}  # (site, category, page) -> list of product dicts
+        self.started_at = time.time()
+        self.resumed = False
+        self.file = None
+        self.load()
+
+    def load(self):
+        """Read an unfinished checkpoint left by a previous run, if any"""
+        if not os.path.exists(self.path):
+            return
+
+        entries = []
+        valid_end = 0  # Byte offset just past the last complete entry
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    # Each entry is written with its newline in one call, so one without it is torn
+                    if not line.endswith(b"\n"):
+                        raise ValueError("no trailing newline")
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A torn final line from a crash mid-write
+                    logger.warning(f"Ignoring incomplete checkpoint line in {self.path}")
+                    break
+                valid_end += len(line)
+
+        # Cut the torn tail off, or the next append would be glued onto it
+        if valid_end < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_end)
+
+        header = entries[0] if entries and entries[0].get("type") == "start" else None
+        if header is None or time.time() - header["started_at"] > self.max_age_hours * 3600:
+            logger.info(f"Discarding stale or unreadable checkpoint {self.path}")
+            os.remove(self.path)
+            return
+
+        self.started_at = header["started_at"]
+        for entry in entries[1:]:
+            if entry.get("type") == "page":
+                self.pages[(entry["site"], entry["category"], entry["page"])] = entry["products"]
+
+        self.resumed = True
+        logger.info(f"♻️ Resuming crawl from {self.path}: {len(self.pages)} pages already done")
+
+    def append(self, entry: Dict):
+        if self.file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            new_file = not os.path.exists(self.path)
+            self.file = open(self.path, 'a', encoding='utf-8')
+            if new_file:
+                self.append({"type": "start", "started_at": self.started_at})
+
+        self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def has_page(self, site: str, category: str, page: int) -> bool:
+        return (site, category, page) in self.pages
+
+    def page_products(self, site: str, category: str, page: int) -> List[Dict]:
+        return self.pages.get((site, category, page), [])
+
+    def record_page(self, site: str, category: str, page: int, products: List):
+        """Persist one finished page; an empty list records the end of a category"""
+        records = [asdict(p) if is_dataclass(p) else p for p in products]
+        self.pages[(site, category, page)] = records
+        self.append({"type": "page", "site": site, "category": category, "page": page, "products": records})
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+
+    def finish(self):
+        """The crawl's results are ingested; the next run starts fresh"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.pages = {}
+        logger.info(f"✅ Crawl checkpoint {self.path} cleared")
+
+    def get_status(self) -> Dict:
+        return {
+            "path": self.path,
+            "resumed": self.resumed,
+            "pages_done": len(self.pages),
+            "products_saved": sum(len(products) for products in self.pages.values())
+        }
@@ -5,29 +5,49 @@ Imports scraped agricultural product data into the backend database
 """
 
 import json
+import time
 import sqlite3
+import hashlib
 import logging
-from typing import List, Dict
+from typing import List, Dict, Iterable, Optional, Tuple
+from dataclasses import asdict, is_dataclass
 from datetime import datetime
 import os
 import sys
+from metrics import DB_ROWS, EXPORT_SECONDS, INTEGRATE_SECONDS
+from tracing import add_logging_arguments, configure_logging, current_run_id, run_context, span
 
 # Add parent directory to path to import from backend
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 logger = logging.getLogger(__name__)
 
+# Fields that make up a product's content hash
+HASHED_FIELDS = [
+    "name", "description", "price", "original_price", "category", "brand",
+    "image_url", "availability", "rating", "reviews_count", "source_url", "source_site"
+]
+
+class IntegrationError(Exception):
+    """A batch could not be written; nothing of it was committed"""
+
+
 class AgrokartDataIntegrator:
     """Integrates scraped data into Agrokart database"""
     
-    def __init__(self, db_path: str = "../database.db"):
+    def __init__(self, db_path: str = "../database.db", busy_timeout: float = 30.0):
         self.db_path = db_path
+        # Queue workers and the scheduler write the same database; wait for its lock rather than fail
+        self.busy_timeout = busy_timeout
         self.setup_database()
         
+    def connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=self.busy_timeout)
+        
     def setup_database(self):
         """Setup database tables for products"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Create products table if not exists
@@ -46,11 +66,43 @@ class AgrokartDataIntegrator:
                     reviews_count INTEGER,
                     source_url TEXT,
                     source_site TEXT,
+                    content_hash TEXT,
+                    run_id TEXT,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             ''')
             
+            # Older databases predate content hashing and run IDs
+            cursor.execute("PRAGMA table_info(products)")
+            columns = [row[1] for row in cursor.fetchall()]
+            for column in ("content_hash", "run_id"):
+                if column not in columns:
+                    cursor.execute(f"ALTER TABLE products ADD COLUMN {column} TEXT")
+                
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_content_hash ON products(content_hash)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_name_price ON products(name, price)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_source_url ON products(source_url)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_site_name ON products(source_site, name)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_products_run_id ON products(run_id)")
+            
+            # Latest input integrated from each source. Older databases kept every input hash
+            # ever seen, which let a stale input be skipped; that history is only a cache, so drop it
+            cursor.execute("PRAGMA table_info(ingested_inputs)")
+            columns = [row[1] for row in cursor.fetchall()]
+            if columns and "content_hash" not in columns:
+                cursor.execute("DROP TABLE ingested_inputs")
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ingested_inputs (
+                    source TEXT PRIMARY KEY,
+                    input_hash TEXT,
+                    content_hash TEXT NOT NULL,
+                    record_count INTEGER,
+                    run_id TEXT,
+                    ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
             # Create categories table
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS categories (
@@ -81,23 +133,78 @@ class AgrokartDataIntegrator:
             logger.error(f"Error setting up database: {e}")
             raise
             
+    def hash_file(self, path: str, chunk_size: int = 65536) -> str:
+        """Compute a streaming SHA-256 of an input file"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+        
+    def record_hash(self, product: Dict) -> str:
+        """Compute a content hash of a product's normalized fields"""
+        record = {field: product.get(field) for field in HASHED_FIELDS}
+        record["name"] = (record["name"] or "").strip()
+        record["price"] = self.clean_price(record["price"] or "0")
+        record["original_price"] = self.clean_price(record["original_price"]) if record["original_price"] else None
+        canonical = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        
+    def is_input_ingested(self, source: str, input_hash: str = None, content_hash: str = None) -> bool:
+        """Whether the source's latest integrated input has these file bytes or these records
+        
+        Entries are cleared whenever another input changes products, so a
+        match means the database still holds exactly what this input wrote.
+        """
+        try:
+            conn = self.connect()
+            cursor = conn.cursor()
+            cursor.execute("SELECT input_hash, content_hash FROM ingested_inputs WHERE source = ?", (source,))
+            row = cursor.fetchone()
+            conn.close()
+            
+        except Exception as e:
+            logger.error(f"Error checking ingested inputs: {e}")
+            return False
+            
+        if row is None:
+            return False
+        return bool((input_hash and row[0] == input_hash) or (content_hash and row[1] == content_hash))
+        
+    def record_ingest(self, cursor, source: Optional[str], input_hash: Optional[str], record_hashes: List[str],
+                      changed: bool):
+        """Remember the source's latest input, inside the transaction that wrote it"""
+        if changed:
+            # Rows this input changed may have come from another source's input, which is no longer current
+            cursor.execute("DELETE FROM ingested_inputs WHERE source IS NOT ?", (source,))
+        if source is None:
+            return
+        cursor.execute('''
+            INSERT OR REPLACE INTO ingested_inputs (source, input_hash, content_hash, record_count, run_id)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (source, input_hash, self.content_digest(record_hashes), len(record_hashes), current_run_id()))
+            
     def load_json_data(self, json_file: str) -> List[Dict]:
         """Load product data from JSON file"""
+        return self.read_json_input(json_file)[0]
+        
+    def read_json_input(self, json_file: str) -> Tuple[List[Dict], Optional[str]]:
+        """Load product data and the run ID of the scrape that wrote the file, if any"""
         try:
             with open(json_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 
             if isinstance(data, dict) and 'products' in data:
-                return data['products']
+                return data['products'], data.get('run_id')
             elif isinstance(data, list):
-                return data
+                return data, None
             else:
                 logger.error("Invalid JSON format")
-                return []
+                return [], None
                 
         except Exception as e:
             logger.error(f"Error loading JSON data: {e}")
-            return []
+            return [], None
             
     def clean_price(self, price_str: str) -> float:
         """Clean and convert price string to float"""
@@ -116,7 +223,7 @@ class AgrokartDataIntegrator:
     def insert_categories(self, categories: List[str]):
         """Insert unique categories into database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             for category in set(categories):
@@ -135,7 +242,7 @@ class AgrokartDataIntegrator:
     def insert_brands(self, brands: List[str]):
         """Insert unique brands into database"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             for brand in set(filter(None, brands)):  # Filter out empty brands
@@ -153,41 +260,57 @@ class AgrokartDataIntegrator:
             
     def insert_products(self, products: List[Dict]) -> int:
         """Insert products into database"""
+        return self.write_products(products)["inserted"]
+        
+    def content_digest(self, record_hashes: List[str]) -> str:
+        """Hash a batch by its records, ignoring envelope fields like timestamps"""
+        digest = hashlib.sha256()
+        for record_hash in record_hashes:
+            digest.update(record_hash.encode('ascii'))
+        return digest.hexdigest()
+        
+    def write_products(self, products: List[Dict], record_hashes: List[str] = None, source: str = None,
+                       input_hash: str = None) -> Dict[str, int]:
+        """Insert new products, update changed ones and skip unchanged ones
+        
+        Records that cannot be converted are skipped and counted as errors.
+        A database failure rolls the whole batch back and raises IntegrationError.
+        With a `source`, the batch is remembered as that source's latest input.
+        A product is identified by its source URL, or by (source site, name)
+        when it has none, so a new price updates its row instead of adding one.
+        The lookups and writes share one write transaction, so concurrent
+        writers cannot both insert the same product.
+        """
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "errors": 0}
+        run_id = current_run_id()
+        record_hashes = record_hashes or [self.record_hash(product) for product in products]
+        
+        conn = self.connect()
         try:
-            conn = sqlite3.connect(self.db_path)
             cursor = conn.cursor()
+            # Take the write lock before the existence checks, not at the first insert
+            cursor.execute("BEGIN IMMEDIATE")
+            known_hashes = self.known_hashes(cursor, record_hashes)
             
-            inserted_count = 0
-            
-            for product in products:
+            for index, product in enumerate(products):
                 try:
                     # Clean and prepare data
-                    name = product.get('name', '').strip()
+                    name = (product.get('name') or '').strip()
                     if not name:
                         continue
                         
+                    content_hash = record_hashes[index]
+                    if content_hash in known_hashes:
+                        counts["unchanged"] += 1
+                        continue
+                        
                     price = self.clean_price(product.get('price', '0'))
                     original_price = self.clean_price(product.get('original_price')) if product.get('original_price') else None
                     
-                    # Check if product already exists (by name and price)
-                    cursor.execute('''
-                        SELECT id FROM products WHERE name = ? AND price = ?
-                    ''', (name, price))
-                    
-                    if cursor.fetchone():
-                        continue  # Skip duplicate
-                        
-                    # Insert product
-                    cursor.execute('''
-                        INSERT INTO products (
-                            name, description, price, original_price, category,
-                            brand, image_url, availability, rating, reviews_count,
-                            source_url, source_site
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
+                    values = (
                         name,
-                        product.get('description', ''),
                         price,
+                        product.get('description', ''),
                         original_price,
                         product.get('category', 'General'),
                         product.get('brand', ''),
@@ -196,34 +319,140 @@ class AgrokartDataIntegrator:
                         product.get('rating'),
                         product.get('reviews_count'),
                         product.get('source_url', ''),
-                        product.get('source_site', '')
-                    ))
+                        product.get('source_site', ''),
+                        content_hash,
+                        run_id
+                    )
+                    
+                    # Same product with different content (e.g. a new price) is updated in place
+                    existing = self.find_product(cursor, product.get('source_url'), product.get('source_site', ''), name)
                     
-                    inserted_count += 1
+                    if existing:
+                        cursor.execute('''
+                            UPDATE products SET
+                                name = ?, price = ?, description = ?, original_price = ?, category = ?,
+                                brand = ?, image_url = ?, availability = ?, rating = ?,
+                                reviews_count = ?, source_url = ?, source_site = ?,
+                                content_hash = ?, run_id = ?, updated_at = CURRENT_TIMESTAMP
+                            WHERE id = ?
+                        ''', values + (existing,))
+                        counts["updated"] += 1
+                    else:
+                        cursor.execute('''
+                            INSERT INTO products (
+                                name, price, description, original_price, category,
+                                brand, image_url, availability, rating, reviews_count,
+                                source_url, source_site, content_hash, run_id
+                            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ''', values)
+                        counts["inserted"] += 1
+                        
+                    known_hashes.add(content_hash)
                     
-                except Exception as e:
+                except (ValueError, TypeError, AttributeError) as e:
+                    # A malformed record; database errors abort the batch below instead
                     logger.error(f"Error inserting product {product.get('name', 'Unknown')}: {e}")
+                    counts["errors"] += 1
                     continue
                     
+            self.record_ingest(cursor, source, input_hash, record_hashes,
+                               changed=bool(counts["inserted"] or counts["updated"]))
             conn.commit()
-            conn.close()
-            logger.info(f"Inserted {inserted_count} products into database")
-            return inserted_count
             
-        except Exception as e:
-            logger.error(f"Error inserting products: {e}")
-            return 0
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error(f"❌ Product write failed, batch rolled back: {e}")
+            raise IntegrationError(f"Product write failed: {e}") from e
+        finally:
+            conn.close()
             
-    def integrate_scraped_data(self, json_file: str) -> Dict[str, int]:
+        for outcome, count in counts.items():
+            DB_ROWS.labels(outcome).inc(count)
+        logger.info(f"Products written: {counts['inserted']} inserted, {counts['updated']} updated, "
+                    f"{counts['unchanged']} unchanged, {counts['errors']} errors")
+        return counts
+        
+    def find_product(self, cursor, source_url: Optional[str], source_site: str, name: str) -> Optional[int]:
+        """Row ID of a stored product, by source URL or else by (source site, name)"""
+        if source_url:
+            cursor.execute("SELECT id FROM products WHERE source_url = ? ORDER BY id LIMIT 1", (source_url,))
+        else:
+            cursor.execute('''
+                SELECT id FROM products WHERE source_site = ? AND name = ? AND COALESCE(source_url, '') = ''
+                ORDER BY id LIMIT 1
+            ''', (source_site, name))
+        row = cursor.fetchone()
+        return row[0] if row else None
+        
+    def known_hashes(self, cursor, record_hashes: List[str], chunk_size: int = 500) -> set:
+        """Which of the batch's content hashes are already stored (index lookups, not a table scan)"""
+        wanted = list(set(record_hashes))
+        known = set()
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start:start + chunk_size]
+            cursor.execute(f"SELECT content_hash FROM products WHERE content_hash IN ({','.join('?' * len(chunk))})",
+                           chunk)
+            known.update(row[0] for row in cursor.fetchall())
+        return known
+            
+    def integrate_scraped_data(self, json_file: str, force: bool = False) -> Dict[str, int]:
         """Main integration function"""
         logger.info(f"Starting data integration from {json_file}")
         
+        # Skip inputs identical to one already integrated
+        try:
+            input_hash = self.hash_file(json_file)
+        except OSError as e:
+            logger.error(f"Error reading {json_file}: {e}")
+            return {"products": 0, "categories": 0, "brands": 0}
+            
+        if not force and self.is_input_ingested(json_file, input_hash=input_hash):
+            logger.info(f"Input unchanged since last integration, skipping {json_file}")
+            return {"products": 0, "categories": 0, "brands": 0, "skipped": True}
+            
         # Load data
-        products = self.load_json_data(json_file)
+        products, scrape_run_id = self.read_json_input(json_file)
         if not products:
             logger.error("No products loaded from JSON file")
             return {"products": 0, "categories": 0, "brands": 0}
             
+        # Rows are attributed to the scrape run that produced the file. A failed write raises
+        # IntegrationError and rolls back the file's ingest record, so it is retried next time
+        with run_context(scrape_run_id):
+            return self.integrate_records(products, json_file, force, input_hash)
+        
+    def integrate_products(self, products: Iterable, source: str = "in-memory",
+                           force: bool = False) -> Dict[str, int]:
+        """Integrate Product objects (or dicts) directly, without a JSON round trip"""
+        logger.info(f"Starting data integration from {source}")
+        
+        records = [asdict(p) if is_dataclass(p) else p for p in products]
+        if not records:
+            logger.error(f"No products received from {source}")
+            return {"products": 0, "categories": 0, "brands": 0}
+            
+        return self.integrate_records(records, source, force)
+        
+    def integrate_records(self, products: List[Dict], source: str, force: bool = False,
+                          input_hash: str = None) -> Dict[str, int]:
+        """Integrate product dicts, skipping a batch identical to the source's current one
+        
+        Raises IntegrationError if the products could not be written.
+        """
+        with run_context(), span("integrate", source=source, records=len(products)):
+            return self.integrate_batch(products, source, force, input_hash)
+            
+    def integrate_batch(self, products: List[Dict], source: str, force: bool,
+                        input_hash: str = None) -> Dict[str, int]:
+        started = time.perf_counter()
+        
+        # Same records in a new envelope (e.g. a fresh scraped_at) are skipped too
+        record_hashes = [self.record_hash(p) for p in products]
+        content_hash = self.content_digest(record_hashes)
+        if not force and self.is_input_ingested(source, content_hash=content_hash):
+            logger.info(f"Products unchanged since last integration, skipping {source}")
+            return {"products": 0, "categories": 0, "brands": 0, "skipped": True}
+            
         # Extract categories and brands
         categories = [p.get('category', 'General') for p in products]
         brands = [p.get('brand', '') for p in products if p.get('brand')]
@@ -231,21 +460,25 @@ class AgrokartDataIntegrator:
         # Insert data
         self.insert_categories(categories)
         self.insert_brands(brands)
-        products_inserted = self.insert_products(products)
+        counts = self.write_products(products, record_hashes, source, input_hash)
         
         result = {
-            "products": products_inserted,
+            "products": counts["inserted"],
+            "updated": counts["updated"],
+            "unchanged": counts["unchanged"],
+            "errors": counts["errors"],
             "categories": len(set(categories)),
             "brands": len(set(filter(None, brands)))
         }
         
+        INTEGRATE_SECONDS.observe(time.perf_counter() - started)
         logger.info(f"Integration completed: {result}")
         return result
         
     def get_database_stats(self) -> Dict[str, int]:
         """Get current database statistics"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Count products
@@ -274,8 +507,13 @@ class AgrokartDataIntegrator:
             
     def export_to_json(self, output_file: str = "agrokart_database_export.json"):
         """Export database products to JSON for frontend"""
+        with run_context(), span("export", output=output_file):
+            return self.write_export(output_file)
+            
+    def write_export(self, output_file: str) -> bool:
+        started = time.perf_counter()
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.connect()
             cursor = conn.cursor()
             
             # Get all products with category and brand info
@@ -284,7 +522,7 @@ class AgrokartDataIntegrator:
                     p.id, p.name, p.description, p.price, p.original_price,
                     p.category, p.brand, p.image_url, p.availability,
                     p.rating, p.reviews_count, p.source_url, p.source_site,
-                    p.created_at
+                    p.created_at, p.run_id
                 FROM products p
                 ORDER BY p.created_at DESC
             ''')
@@ -305,7 +543,8 @@ class AgrokartDataIntegrator:
                     "reviews_count": row[10],
                     "source_url": row[11],
                     "source_site": row[12],
-                    "created_at": row[13]
+                    "created_at": row[13],
+                    "run_id": row[14]
                 })
                 
             # Get categories
@@ -324,12 +563,14 @@ class AgrokartDataIntegrator:
                 "categories": categories,
                 "brands": brands,
                 "total_products": len(products),
-                "exported_at": datetime.now().isoformat()
+                "exported_at": datetime.now().isoformat(),
+                "run_id": current_run_id()
             }
             
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(export_data, f, indent=2, ensure_ascii=False)
                 
+            EXPORT_SECONDS.observe(time.perf_counter() - started)
             logger.info(f"Database exported to {output_file}")
             return True
             
@@ -341,17 +582,27 @@ class AgrokartDataIntegrator:
 def main():
     """Main function"""
     import argparse
+    from profiling import add_profiling_arguments, profiling_from_args
     
     parser = argparse.ArgumentParser(description="Integrate scraped data into Agrokart database")
     parser.add_argument("--json-file", required=True, help="JSON file with scraped products")
     parser.add_argument("--db-path", default="../database.db", help="Database file path")
     parser.add_argument("--export", action="store_true", help="Export database to JSON after integration")
+    parser.add_argument("--force", action="store_true", help="Integrate even if the file was already ingested")
+    add_profiling_arguments(parser)
+    add_logging_arguments(parser)
     
     args = parser.parse_args()
     
     # Setup logging
-    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    configure_logging(args.log_format)
     
+    with profiling_from_args(args, "data_integrator"):
+        run_integration(args)
+
+
+def run_integration(args):
+    """Integrate one JSON file as requested on the command line"""
     try:
         integrator = AgrokartDataIntegrator(args.db_path)
         
@@ -363,11 +614,14 @@ def main():
             
         # Integrate data
         print(f"\n🔄 Integrating data from {args.json_file}...")
-        result = integrator.integrate_scraped_data(args.json_file)
+        result = integrator.integrate_scraped_data(args.json_file, force=args.force)
         
-        print("\n✅ Integration Results:")
-        for key, value in result.items():
-            print(f"   {key.title()} Added: {value}")
+        if result.get("skipped"):
+            print("\n⏭️ File unchanged since last integration, nothing to do")
+        else:
+            print("\n✅ Integration Results:")
+            for key, value in result.items():
+                print(f"   {key.title()}: {value}")
             
         # Show new stats
         print("\n📊 Updated Database Stats:")
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+WebDriver Pool for AgiNet
+Keeps warm headless Chrome instances for the Selenium scraper and recycles them after a page budget
+"""
+
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+
+
+def chrome_options(headless: bool = True, capture_network: bool = False) -> Options:
+    """Chrome options shared by pooled and standalone drivers"""
+    options = Options()
+
+    if headless:
+        options.add_argument("--headless")
+
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument(f"--user-agent={USER_AGENT}")
+
+    # Disable images and notifications for faster loading
+    prefs = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.default_content_setting_values.notifications": 2
+    }
+    options.add_experimental_option("prefs", prefs)
+
+    # Network events in the performance log, for reading product API responses
+    if capture_network:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def create_chrome_driver(headless: bool = True, implicit_wait: float = 10, capture_network: bool = False):
+    driver = webdriver.Chrome(options=chrome_options(headless, capture_network))
+    driver.implicitly_wait(implicit_wait)
+    return driver
+
+
+class PooledDriver:
+    """A pooled WebDriver and its usage so far"""
+
+    def __init__(self, driver, number: int):
+        self.driver = driver
+        self.number = number
+        self.pages = 0
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    def record_page(self):
+        self.pages += 1
+
+
+class WebDriverPool:
+    """Bounded pool of warm browsers
+
+    Browsers are launched on demand up to `size`. A borrowed browser is
+    health-checked first, and a browser is quit and replaced once it has
+    loaded `max_pages_per_driver` pages or broke during use.
+    """
+
+    def __init__(self, size: int = 2, max_pages_per_driver: int = 50, headless: bool = True,
+                 factory: Optional[Callable] = None, acquire_timeout: float = 300,
+                 capture_network: bool = False):
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.capture_network = capture_network
+        self.factory = factory or (lambda: create_chrome_driver(headless, capture_network=capture_network))
+        self.acquire_timeout = acquire_timeout
+        self.idle = queue.LifoQueue()  # Most recently used first, so spare browsers can age out
+        self.lock = threading.Lock()
+        self.live = 0
+        self.closed = False
+        self.stats = {"launched": 0, "recycled": 0, "health_failures": 0, "launch_failures": 0,
+                      "borrowed": 0, "launch_seconds": 0.0}
+
+    def launch(self) -> PooledDriver:
+        started = time.perf_counter()
+        try:
+            driver = self.factory()
+        except Exception:
+            with self.lock:
+                self.live -= 1
+                self.stats["launch_failures"] += 1
+            raise
+        elapsed = time.perf_counter() - started
+        with self.lock:
+            self.stats["launched"] += 1
+            self.stats["launch_seconds"] += elapsed
+            number = self.stats["launched"]
+        logger.info(f"🌐 Browser {number} launched in {elapsed:.1f}s")
+        return PooledDriver(driver, number)
+
+    def is_healthy(self, pooled: PooledDriver) -> bool:
+        try:
+            return pooled.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def discard(self, pooled: PooledDriver, reason: str):
+        with self.lock:
+            self.live -= 1
+            self.stats["recycled"] += 1
+        try:
+            pooled.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting browser {pooled.number}: {e}")
+        logger.info(f"♻️ Browser {pooled.number} retired after {pooled.pages} pages ({reason})")
+
+    def acquire(self, timeout: Optional[float] = None) -> PooledDriver:
+        """Borrow a healthy browser, launching one if the pool is not yet full"""
+        deadline = time.monotonic() + (timeout if timeout is not None else self.acquire_timeout)
+        while True:
+            if self.closed:
+                raise RuntimeError("WebDriver pool is closed")
+            try:
+                pooled = self.idle.get_nowait()
+            except queue.Empty:
+                pooled = None
+
+            if pooled is None:
+                with self.lock:
+                    can_launch = self.live < self.size
+                    if can_launch:
+                        self.live += 1
+                if can_launch:
+                    pooled = self.launch()
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"No browser free in the pool within {self.acquire_timeout}s")
+                    try:
+                        pooled = self.idle.get(timeout=min(remaining, 1.0))
+                    except queue.Empty:
+                        continue
+
+            if not self.is_healthy(pooled):
+                with self.lock:
+                    self.stats["health_failures"] += 1
+                self.discard(pooled, "failed health check")
+                continue
+
+            with self.lock:
+                self.stats["borrowed"] += 1
+            pooled.last_used = time.time()
+            return pooled
+
+    def release(self, pooled: PooledDriver, broken: bool = False):
+        """Return a browser; broken or worn-out browsers are quit instead"""
+        if broken:
+            self.discard(pooled, "broken")
+        elif pooled.pages >= self.max_pages_per_driver:
+            self.discard(pooled, "page budget reached")
+        elif self.closed:
+            self.discard(pooled, "pool closed")
+        else:
+            self.idle.put(pooled)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Borrow a browser for the block; a WebDriver error retires it"""
+        pooled = self.acquire(timeout)
+        broken = False
+        try:
+            yield pooled
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            self.release(pooled, broken)
+
+    def warm(self, count: Optional[int] = None):
+        """Launch browsers ahead of the first scrape"""
+        borrowed = []
+        try:
+            for _ in range(min(count or self.size, self.size)):
+                borrowed.append(self.acquire())
+        finally:
+            for pooled in borrowed:
+                self.release(pooled)
+
+    def close(self):
+        """Quit every idle browser; borrowed ones are quit when returned"""
+        self.closed = True
+        while True:
+            try:
+                pooled = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            self.discard(pooled, "pool closed")
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+            stats["live"] = self.live
+        stats["idle"] = self.idle.qsize()
+        stats["size"] = self.size
+        stats["avg_launch_seconds"] = (round(stats.pop("launch_seconds") / stats["launched"], 2)
+                                       if stats["launched"] else None)
+        return stats
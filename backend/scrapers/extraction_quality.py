@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Extraction Quality Checks for AgiNet
+Judges each site's first extracted pages and aborts crawls of sites whose markup changed
+"""
+
+import re
+import time
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from tracing import current_run_id
+
+logger = logging.getLogger(__name__)
+
+# What extractors fall back to when a selector finds nothing
+PLACEHOLDER_NAME = "Unknown Product"
+
+
+def price_value(price: Optional[str]) -> float:
+    digits = re.sub(r"[^\d.]", "", (price or "").replace(",", ""))
+    try:
+        return float(digits) if digits else 0.0
+    except ValueError:
+        return 0.0
+
+
+def has_content(product) -> bool:
+    """False for the placeholder records extractors build from empty containers"""
+    return product.name != PLACEHOLDER_NAME or price_value(product.price) > 0
+
+
+class SiteLayoutChanged(Exception):
+    """A site's pages no longer extract into usable products"""
+
+    def __init__(self, site: str, report: Dict):
+        self.site = site
+        self.report = report
+        super().__init__(f"{site} extraction looks broken: {', '.join(report['problems'])}")
+
+
+class ExtractionQualityMonitor:
+    """Tracks per-site field fill rates and zero prices within a run
+
+    A site is judged once it has `min_products` products or `eval_pages`
+    pages with products, whichever comes first. If a fill rate is under its
+    threshold or too many prices are zero, the site is marked broken for
+    the rest of the run. SiteLayoutChanged is raised then and on every later
+    page of that site, before its fetch. start_run() clears the verdicts;
+    long-lived users without runs (e.g. queue workers) can instead let a
+    'broken' verdict expire after `verdict_ttl` seconds, so the site is
+    judged afresh.
+    """
+
+    def __init__(self, eval_pages: int = 2, min_products: int = 10, min_fill_rates: Dict[str, float] = None,
+                 max_zero_price_share: float = 0.2, max_alerts: int = 50, verdict_ttl: Optional[float] = None):
+        self.eval_pages = eval_pages
+        self.min_products = min_products
+        self.min_fill_rates = min_fill_rates or {"name": 0.8, "price": 0.8, "image": 0.5}
+        self.max_zero_price_share = max_zero_price_share
+        self.verdict_ttl = verdict_ttl
+        self.lock = threading.Lock()
+        self.sites = {}
+        self.alerts = deque(maxlen=max_alerts)
+
+    def start_run(self, sites: List[str] = None):
+        """Forget tallies and verdicts (of `sites`, or of every site) for a new crawl"""
+        with self.lock:
+            for site in (sites if sites is not None else list(self.sites)):
+                self.sites.pop(site, None)
+
+    def site_state(self, site: str) -> Dict:
+        return self.sites.setdefault(site, {"pages": 0, "products": 0, "name": 0, "price": 0, "image": 0,
+                                            "zero_price": 0, "verdict": None, "report": None, "judged_at": None})
+
+    def check(self, site: str):
+        """Raise SiteLayoutChanged if the site was already judged broken in this run"""
+        with self.lock:
+            state = self.sites.get(site)
+            if not state or state["verdict"] != "broken":
+                return
+            if self.verdict_ttl is not None and time.monotonic() - state["judged_at"] >= self.verdict_ttl:
+                del self.sites[site]
+                logger.info(f"🔍 {site} broken verdict expired; judging its extraction again")
+                return
+            raise SiteLayoutChanged(site, state["report"])
+
+    def record_page(self, site: str, category: str, products: List):
+        """Add one page's products to the site's tally; raises SiteLayoutChanged when the verdict is 'broken'"""
+        if not products:
+            return  # Empty pages end a category; they say nothing about field extraction
+        with self.lock:
+            state = self.site_state(site)
+            state["pages"] += 1
+            state["products"] += len(products)
+            for product in products:
+                state["name"] += bool(product.name) and product.name != PLACEHOLDER_NAME
+                zero = price_value(product.price) <= 0
+                state["price"] += not zero
+                state["zero_price"] += zero
+                state["image"] += bool(product.image_url)
+
+            if state["verdict"] is not None or (state["pages"] < self.eval_pages
+                                                and state["products"] < self.min_products):
+                return
+            report = self.evaluate(state)
+            report.update(site=site, category=category)
+            state["report"] = report
+            state["verdict"] = "broken" if report["problems"] else "ok"
+            state["judged_at"] = time.monotonic()
+            if state["verdict"] == "ok":
+                return
+            self.alerts.append({
+                "type": "layout_changed",
+                "site": site,
+                "category": category,
+                "run_id": current_run_id(),
+                "detected_at": datetime.now().isoformat(),
+                **report
+            })
+
+        logger.error(f"🚨 {site} layout change suspected after {report['pages']} pages "
+                     f"({', '.join(report['problems'])}); skipping the rest of its crawl")
+        raise SiteLayoutChanged(site, report)
+
+    def evaluate(self, state: Dict) -> Dict:
+        total = state["products"]
+        fill_rates = {field: round(state[field] / total, 3) for field in self.min_fill_rates}
+        zero_share = round(state["zero_price"] / total, 3)
+        problems = [f"{field} filled in {rate:.0%} of products" for field, rate in fill_rates.items()
+                    if rate < self.min_fill_rates[field]]
+        if zero_share > self.max_zero_price_share:
+            problems.append(f"{zero_share:.0%} zero prices")
+        return {"pages": state["pages"], "products": total, "fill_rates": fill_rates,
+                "zero_price_share": zero_share, "problems": problems}
+
+    def get_status(self) -> Dict:
+        with self.lock:
+            sites = {site: {"verdict": state["verdict"], "pages": state["pages"], "products": state["products"],
+                            "problems": state["report"]["problems"] if state["report"] else []}
+                     for site, state in self.sites.items()}
+            return {"sites": sites, "alerts": list(self.alerts)}
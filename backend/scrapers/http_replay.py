@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+HTTP Record/Replay for AgiNet
+Captures scraper traffic into a cassette file and serves it back offline for deterministic crawl benchmarks
+"""
+
+import os
+import gzip
+import json
+import time
+import base64
+import random
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCassette:
+    """Recorded request/response pairs, stored as gzipped JSON lines
+
+    Responses are keyed by (method, url). Recording the same URL twice keeps
+    both responses, and replay hands them out in order, repeating the last.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}  # (method, url) -> list of recorded responses
+        self.served = {}  # (method, url) -> responses handed out so far
+        self.base_urls = {}  # Site base URL overrides in effect when recording
+        self.lock = threading.Lock()
+
+    def load(self) -> 'HttpCassette':
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                if "meta" in entry:
+                    self.base_urls = entry["meta"].get("base_urls", {})
+                    continue
+                entry["content"] = base64.b64decode(entry["content"])
+                self.entries.setdefault((entry["method"], entry["url"]), []).append(entry)
+        logger.info(f"📼 Loaded {len(self)} recorded responses from {self.path}")
+        return self
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({"meta": {"base_urls": self.base_urls}}) + "\n")
+            for responses in self.entries.values():
+                for entry in responses:
+                    f.write(json.dumps(dict(entry, content=base64.b64encode(entry["content"]).decode('ascii'))) + "\n")
+        logger.info(f"📼 Saved {len(self)} recorded responses to {self.path}")
+
+    def __len__(self):
+        return sum(len(responses) for responses in self.entries.values())
+
+    def add(self, method: str, url: str, response: requests.Response):
+        entry = {
+            "method": method,
+            "url": url,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(response.headers),
+            "content": response.content,
+            "elapsed": response.elapsed.total_seconds()
+        }
+        # The body is stored decoded, so the encoding headers no longer apply
+        for header in ("Content-Encoding", "Transfer-Encoding", "Content-Length"):
+            entry["headers"].pop(header, None)
+        with self.lock:
+            self.entries.setdefault((method, url), []).append(entry)
+
+    def next_response(self, method: str, url: str) -> Optional[Dict]:
+        with self.lock:
+            responses = self.entries.get((method, url))
+            if not responses:
+                return None
+            index = self.served.get((method, url), 0)
+            self.served[(method, url)] = index + 1
+            return responses[min(index, len(responses) - 1)]
+
+    def bodies(self) -> List[Tuple[str, bytes]]:
+        """(url, content) of every recorded successful GET"""
+        return [(url, entry["content"]) for (method, url), responses in self.entries.items()
+                for entry in responses if method == "GET" and entry["status"] == 200]
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Real transport that copies every response into a cassette"""
+
+    def __init__(self, cassette: HttpCassette, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = cassette
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        # Reading the body here is fine; scrapers read every page in full anyway
+        self.cassette.add(request.method, request.url, response)
+        return response
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport that answers from a cassette, with optional simulated latency"""
+
+    def __init__(self, cassette: HttpCassette, latency: float = 0.0, jitter: float = 0.0,
+                 seed: Optional[int] = None, strict: bool = False):
+        super().__init__()
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.strict = strict  # Raise on unrecorded URLs instead of answering 404
+        self.requests = 0
+        self.misses = 0
+
+    def send(self, request, **kwargs):
+        self.requests += 1
+        delay = self.latency + (self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+        entry = self.cassette.next_response(request.method, request.url)
+        if entry is None:
+            self.misses += 1
+            if self.strict:
+                raise requests.ConnectionError(f"No recorded response for {request.method} {request.url}",
+                                               request=request)
+            entry = {"status": 404, "reason": "Not Recorded", "headers": {}, "content": b""}
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"]
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
+
+
+def record_session(session: requests.Session, cassette: HttpCassette) -> RecordingAdapter:
+    adapter = RecordingAdapter(cassette)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
+
+
+def replay_session(session: requests.Session, cassette: HttpCassette, **kwargs) -> ReplayAdapter:
+    adapter = ReplayAdapter(cassette, **kwargs)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return adapter
+
+
+def listing_page(scraper, url: str) -> Optional[Tuple[str, str, str]]:
+    """(site, category, base_url) of a recorded listing page URL, if it is one"""
+    from agri_scraper import SITES
+
+    for site, config in SITES.items():
+        base_url = scraper.site_base_url(site)
+        for category in config["categories"]:
+            if url.startswith(f"{base_url}{category}?page="):
+                return site, category, base_url
+    return None
+
+
+def record_crawl(cassette_path: str, max_pages: int = 2, base_urls: Dict[str, str] = None,
+                 polite: bool = True) -> int:
+    """Crawl the sites once (politely, unless told otherwise for a local stand-in) and save every exchange"""
+    from agri_scraper import AgriScraper
+
+    cassette = HttpCassette(cassette_path)
+    cassette.base_urls = base_urls or {}
+    scraper = AgriScraper(base_urls)
+    scraper.polite = polite
+    record_session(scraper.session, cassette)
+    products = scraper.scrape_all_sites(max_pages_per_site=max_pages)
+    cassette.save()
+    logger.info(f"✅ Recorded {len(cassette)} responses ({len(products)} products)")
+    return len(cassette)
+
+
+def benchmark(cassette_path: str, max_pages: int = 2, latency: float = 0.0, jitter: float = 0.0,
+              repeat: int = 3, base_urls: Dict[str, str] = None) -> Dict:
+    """Replay a full crawl and a parse-only pass over the recorded pages"""
+    from agri_scraper import AgriScraper
+
+    cassette = HttpCassette(cassette_path).load()
+    base_urls = base_urls or cassette.base_urls
+    results = {"cassette": cassette_path, "responses": len(cassette), "latency_ms": latency * 1000}
+
+    # Full crawl: fetch (simulated) + parse, politeness delays off
+    crawl_times = []
+    for _ in range(repeat):
+        scraper = AgriScraper(base_urls)
+        scraper.polite = False
+        cassette.served = {}
+        adapter = replay_session(scraper.session, cassette, latency=latency, jitter=jitter, seed=42)
+        started = time.perf_counter()
+        products = scraper.scrape_all_sites(max_pages_per_site=max_pages)
+        crawl_times.append(time.perf_counter() - started)
+    best = min(crawl_times)
+    results["crawl"] = {
+        "requests": adapter.requests,
+        "unrecorded": adapter.misses,
+        "products": len(products),
+        "best_seconds": round(best, 4),
+        "pages_per_second": round(adapter.requests / best, 1) if best else None
+    }
+
+    # Parse only: run the extractors over every recorded listing page
+    scraper = AgriScraper(base_urls)
+    pages = [(listing_page(scraper, url), content) for url, content in cassette.bodies()]
+    pages = [(match, content) for match, content in pages if match]
+    parse_times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        extracted = sum(len(scraper.extract_page(site, category, content, base_url))
+                        for (site, category, base_url), content in pages)
+        parse_times.append(time.perf_counter() - started)
+    best = min(parse_times)
+    results["parse"] = {
+        "pages": len(pages),
+        "products": extracted,
+        "best_seconds": round(best, 4),
+        "pages_per_second": round(len(pages) / best, 1) if best else None
+    }
+    return results
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AgiNet HTTP record/replay harness")
+    parser.add_argument("command", choices=["record", "benchmark"],
+                        help="'record' a live crawl to a cassette, or 'benchmark' against a recorded one")
+    parser.add_argument("--cassette", default="fixtures/crawl.jsonl.gz", help="Cassette file")
+    parser.add_argument("--pages", type=int, default=2, help="Pages per category")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- latency jitter in seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="Benchmark repetitions (best is reported)")
+    parser.add_argument("--base-url", action="append", default=[], metavar="SITE=URL",
+                        help="Override a site's base URL (replay defaults to the ones used when recording)")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING if args.command == "benchmark" else logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    base_urls = dict(item.split("=", 1) for item in args.base_url)
+
+    if args.command == "record":
+        record_crawl(args.cassette, args.pages, base_urls)
+    else:
+        results = benchmark(args.cassette, args.pages, args.latency, args.jitter, args.repeat, base_urls)
+        print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Hybrid Static/Dynamic Fetching for AgiNet
+Fetches listing pages over plain HTTP and renders only JS-gated ones in a pooled browser
+"""
+
+import re
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
+
+from agri_scraper import SITES, Product
+from api_capture import read_performance_log
+from driver_pool import WebDriverPool
+from extraction_quality import has_content
+from metrics import PAGES_RENDERED
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Text a page shows while its products are still to be rendered by JavaScript
+PLACEHOLDER_TEXT = re.compile(r"enable javascript|javascript (is )?(required|disabled)|loading products|please wait",
+                              re.IGNORECASE)
+# Skeleton cards drawn until the product data arrives
+SKELETON_CLASSES = re.compile(r"skeleton|shimmer|loading-(grid|products|cards)", re.IGNORECASE)
+# Mount points of client-rendered apps
+APP_ROOT_IDS = {"root", "app", "__next", "__nuxt", "svelte", "main-app"}
+
+# True once a product container with visible text is in the DOM
+RENDERED_SCRIPT = """
+const pattern = new RegExp(arguments[0]);
+return Array.from(document.querySelectorAll("div, article")).some((el) =>
+    typeof el.className === "string" && pattern.test(el.className) && (el.innerText || "").trim().length > 0);
+"""
+
+
+def js_gate_reason(content: bytes, container_pattern: str, parser: str = "html.parser") -> Optional[str]:
+    """Why a page without products looks rendered by JavaScript, or None if it looks really empty"""
+    soup = BeautifulSoup(content, parser)
+    containers = soup.find_all(['div', 'article'], class_=re.compile(container_pattern))
+    if containers and not any(container.get_text(strip=True) for container in containers):
+        return "empty_containers"
+    if soup.find(class_=SKELETON_CLASSES):
+        return "skeleton"
+    for noscript in soup.find_all("noscript"):
+        if PLACEHOLDER_TEXT.search(noscript.get_text(" ")):
+            return "noscript"
+        noscript.decompose()
+
+    for tag in soup(["script", "style", "template"]):
+        tag.decompose()
+    body = soup.body or soup
+    text = body.get_text(" ", strip=True)
+    if PLACEHOLDER_TEXT.search(text):
+        return "placeholder"
+    if len(text) < 200 and body.find(id=lambda value: value in APP_ROOT_IDS):
+        return "app_shell"
+    return None
+
+
+class HybridFetcher:
+    """Chooses between a static fetch and a browser render per (site, path)
+
+    Every path starts static. When a static page has no products and looks
+    JS-gated (empty containers, skeletons, a noscript or loading notice, a
+    bare app shell), it is rendered on a browser from the pool and parsed by
+    the same extractor. A path whose render found products is remembered as
+    'browser' in the database, so later pages and runs skip the static
+    fetch. Every `recheck_every` renders the static fetch is tried again, in
+    case the site went back to server rendering.
+    """
+
+    def __init__(self, pool: WebDriverPool, db_path: str = "../database.db", blocker=None,
+                 render_timeout: float = 15, recheck_every: int = 25):
+        self.pool = pool
+        self.db_path = db_path
+        # Optional ResourceBlocker applied before each render
+        self.blocker = blocker
+        self.render_timeout = render_timeout
+        self.recheck_every = recheck_every
+        self.lock = threading.Lock()
+        self.renders_since_check = {}
+        self.stats = {"static_pages": 0, "rendered_pages": 0, "gated_pages": 0, "rechecks": 0, "render_failures": 0}
+        self.setup_tables()
+        self.decisions = self.load_decisions()
+
+    def setup_tables(self):
+        """Create the render decision table"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS render_decisions (
+                site TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                reason TEXT,
+                decided_at REAL NOT NULL,
+                PRIMARY KEY (site, path)
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def load_decisions(self) -> Dict[Tuple[str, str], str]:
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute("SELECT site, path, mode FROM render_decisions").fetchall()
+        conn.close()
+        return {(site, path): mode for site, path, mode in rows}
+
+    def decide(self, site: str, path: str, mode: str, reason: str):
+        with self.lock:
+            previous = self.decisions.get((site, path))
+            if previous == mode:
+                return
+            self.decisions[(site, path)] = mode
+            self.renders_since_check.pop((site, path), None)
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            INSERT INTO render_decisions (site, path, mode, reason, decided_at) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (site, path) DO UPDATE SET
+                mode = excluded.mode, reason = excluded.reason, decided_at = excluded.decided_at
+        ''', (site, path, mode, reason, time.time()))
+        conn.commit()
+        conn.close()
+        # First sightings of static paths are the common case and not worth an INFO line
+        level = logging.INFO if "browser" in (mode, previous) else logging.DEBUG
+        logger.log(level, f"🧭 {site} {path}: {mode} fetch from now on ({reason})")
+
+    def wants_browser(self, site: str, path: str) -> bool:
+        """Whether to go straight to the browser, counting towards the next static recheck"""
+        key = (site, path)
+        with self.lock:
+            if self.decisions.get(key) != "browser":
+                return False
+            renders = self.renders_since_check.get(key, 0) + 1
+            if renders > self.recheck_every:
+                self.renders_since_check[key] = 0
+                self.stats["rechecks"] += 1
+                return False
+            self.renders_since_check[key] = renders
+            return True
+
+    def count(self, stat: str):
+        with self.lock:
+            self.stats[stat] += 1
+
+    def scrape_page(self, scraper, site: str, category: str, page: int, url: str, base_url: str) -> List[Product]:
+        """Products of one listing page, rendering it in a browser only if it needs one"""
+        if self.wants_browser(site, category):
+            PAGES_RENDERED.labels(site, "remembered").inc()
+            return self.render_page(scraper, site, category, page, url, base_url)
+
+        content = scraper.fetch_page(site, category, page, url, base_url)
+        products = scraper.extract_page(site, category, content, base_url)
+        self.count("static_pages")
+        if any(has_content(product) for product in products):
+            self.decide(site, category, "static", "products in static HTML")
+            return products
+
+        reason = js_gate_reason(content, SITES[site]["container_pattern"], scraper.parser)
+        if reason is None:
+            return products  # A genuinely empty page (e.g. past the last one) or a broken extractor
+
+        self.count("gated_pages")
+        PAGES_RENDERED.labels(site, reason).inc()
+        logger.info(f"🧩 {url} looks rendered by JavaScript ({reason}); rendering it in a browser")
+        products = self.render_page(scraper, site, category, page, url, base_url)
+        if products:
+            self.decide(site, category, "browser", reason)
+        elif (site, category) not in self.decisions:
+            # An empty render past the last page must not demote a path known to need the browser
+            self.decide(site, category, "static", f"{reason}, but the render had no products either")
+        return products
+
+    def render_page(self, scraper, site: str, category: str, page: int, url: str, base_url: str) -> List[Product]:
+        """Load the page in a pooled browser and run the site's extractor over the rendered DOM"""
+        try:
+            with span("render", logging.DEBUG, site=site, url=url, page=page) as render:
+                with self.pool.driver() as pooled:
+                    driver = pooled.driver
+                    if self.blocker:
+                        self.blocker.apply(driver, site)
+                    driver.get(url)
+                    try:
+                        WebDriverWait(driver, self.render_timeout, poll_frequency=0.2).until(
+                            lambda d: d.execute_script(RENDERED_SCRIPT, SITES[site]["container_pattern"]))
+                    except TimeoutException:
+                        logger.warning(f"No rendered products on {url} after {self.render_timeout}s")
+                    content = driver.page_source.encode("utf-8")
+                    # Drain the performance log so it does not pile up in the browser
+                    if self.pool.capture_network:
+                        messages = read_performance_log(driver)
+                        if self.blocker:
+                            self.blocker.record(messages)
+                    pooled.record_page()
+                render.attributes["bytes"] = len(content)
+        except Exception as e:
+            self.count("render_failures")
+            logger.error(f"❌ Browser render of {url} failed: {e}")
+            return []
+
+        self.count("rendered_pages")
+        if scraper.page_archive:
+            scraper.page_archive.store(url, content, site=site, category=category, page=page, base_url=base_url)
+        return scraper.extract_page(site, category, content, base_url)
+
+    def get_status(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats)
+            browser_paths = sorted(f"{site} {path}" for (site, path), mode in self.decisions.items()
+                                   if mode == "browser")
+        pages = stats["static_pages"] + stats["rendered_pages"]
+        stats["browser_share"] = round(stats["rendered_pages"] / pages, 3) if pages else 0.0
+        stats["browser_paths"] = browser_paths
+        return stats
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Job Executor for AgiNet
+Runs scheduled jobs on a worker pool with priorities, concurrency limits and jitter
+"""
+
+import itertools
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from metrics import JOB_RUNS, JOB_SECONDS
+from profiling import HOOKS
+from tracing import new_run_id, run_context, span
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class JobSpec:
+    """How a named job is run"""
+    name: str
+    func: Callable[[], None]
+    priority: int = 10  # Lower runs first when several jobs are ready
+    max_concurrency: int = 1
+    single_flight: bool = True  # Drop a new request while one is already queued or running
+    jitter: float = 0.0  # Random start delay in seconds, spreads out simultaneous triggers
+    group: Optional[str] = None  # Jobs of a group never run at the same time (e.g. they share a scraper)
+
+
+class JobStats:
+    """Run history of one job"""
+
+    def __init__(self):
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.running = 0
+        self.queued = 0
+        self.last_started = None
+        self.last_finished = None
+        self.last_duration = None
+        self.total_duration = 0.0
+        self.last_error = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "running": self.running,
+            "queued": self.queued,
+            "last_started": self.last_started.isoformat() if self.last_started else None,
+            "last_finished": self.last_finished.isoformat() if self.last_finished else None,
+            "last_duration_seconds": round(self.last_duration, 3) if self.last_duration is not None else None,
+            "avg_duration_seconds": round(self.total_duration / self.runs, 3) if self.runs else None,
+            "last_error": self.last_error
+        }
+
+
+class JobExecutor:
+    """Priority queue of job requests dispatched onto a thread pool"""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.pool = None
+        self.jobs = {}
+        self.stats = {}
+        self.pending = []  # (priority, not_before, seq, name) requests
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.dispatcher = None
+        self.stopping = False
+
+    def register(self, spec: JobSpec):
+        self.jobs[spec.name] = spec
+        self.stats[spec.name] = JobStats()
+
+    def submit(self, name: str, delay: float = None) -> bool:
+        """Request a run of a job; returns False if it was coalesced into an existing run"""
+        spec = self.jobs[name]
+        with self.condition:
+            stats = self.stats[name]
+            if spec.single_flight and (stats.queued or stats.running):
+                stats.skipped += 1
+                logger.info(f"⏭️ Job {name} already queued or running, skipping")
+                return False
+
+            if delay is None:
+                delay = random.uniform(0, spec.jitter) if spec.jitter else 0.0
+            self.pending.append((spec.priority, time.monotonic() + delay, next(self.sequence), name))
+            stats.queued += 1
+            self.condition.notify()
+        return True
+
+    def start(self):
+        self.pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self.dispatcher = threading.Thread(target=self.dispatch_loop, name="job-dispatcher", daemon=True)
+        self.dispatcher.start()
+
+    def shutdown(self, wait: bool = True):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        if self.dispatcher:
+            self.dispatcher.join()
+        if self.pool:
+            self.pool.shutdown(wait=wait)
+
+    def next_ready(self):
+        """Pop the highest-priority request that may start now (caller holds the lock)"""
+        now = time.monotonic()
+        running = sum(stats.running for stats in self.stats.values())
+        if running >= self.max_workers:
+            return None, None
+
+        earliest = None
+        for entry in sorted(self.pending):
+            _, not_before, _, name = entry
+            if not_before > now:
+                earliest = not_before if earliest is None else min(earliest, not_before)
+                continue
+            if self.stats[name].running >= self.jobs[name].max_concurrency:
+                continue
+            if self.group_busy(self.jobs[name].group):
+                continue
+            self.pending.remove(entry)
+            return name, None
+        return None, (earliest - now if earliest is not None else None)
+
+    def group_busy(self, group: Optional[str]) -> bool:
+        return group is not None and any(stats.running for name, stats in self.stats.items()
+                                         if self.jobs[name].group == group)
+
+    def dispatch_loop(self):
+        with self.condition:
+            while not self.stopping:
+                name, wait = self.next_ready()
+                if name is None:
+                    self.condition.wait(timeout=wait)
+                    continue
+
+                stats = self.stats[name]
+                stats.queued -= 1
+                stats.running += 1
+                stats.last_started = datetime.now()
+                self.pool.submit(self.run_job, name)
+
+    def run_job(self, name: str):
+        spec = self.jobs[name]
+        started = time.perf_counter()
+        error = None
+        try:
+            with HOOKS.cycle(f"job_{name}"), run_context(new_run_id()), span(f"job:{name}"):
+                spec.func()
+        except Exception as e:
+            error = str(e)
+            logger.error(f"❌ Job {name} failed: {e}")
+        finally:
+            duration = time.perf_counter() - started
+            with self.condition:
+                stats = self.stats[name]
+                stats.running -= 1
+                stats.runs += 1
+                stats.last_finished = datetime.now()
+                stats.last_duration = duration
+                stats.total_duration += duration
+                if error:
+                    stats.failures += 1
+                    stats.last_error = error
+                self.condition.notify()
+            JOB_SECONDS.labels(name).observe(duration)
+            JOB_RUNS.labels(name, "failure" if error else "success").inc()
+            logger.info(f"⏱️ Job {name} finished in {duration:.1f}s")
+
+    def get_status(self) -> Dict:
+        with self.condition:
+            return {
+                "queue_depth": len(self.pending),
+                "running": sum(stats.running for stats in self.stats.values()),
+                "max_workers": self.max_workers,
+                "jobs": {name: stats.to_dict() for name, stats in self.stats.items()}
+            }
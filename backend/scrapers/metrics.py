@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Metrics for AgiNet
+In-process counters and histograms with a Prometheus text endpoint and a JSON snapshot
+"""
+
+import bisect
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class CounterChild:
+    """One labelled time series of a counter"""
+
+    __slots__ = ("value", "lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self.lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self.lock:
+            self.value += amount
+
+
+class HistogramChild:
+    """One labelled time series of a histogram"""
+
+    __slots__ = ("buckets", "counts", "sum", "count", "lock")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self) -> 'Timer':
+        return Timer(self)
+
+
+class Timer:
+    """Context manager that observes its elapsed seconds into a histogram"""
+
+    __slots__ = ("child", "started")
+
+    def __init__(self, child: HistogramChild):
+        self.child = child
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.child.observe(time.perf_counter() - self.started)
+
+
+class Metric(ABC):
+    """A named metric with a fixed label set; children are created per label values"""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+        self.children = {}
+        self.lock = threading.Lock()
+        if not self.label_names:
+            self.default = self.labels()
+
+    @abstractmethod
+    def new_child(self):
+        """Create the per-label-values time series for this kind of metric"""
+
+    def labels(self, *values, **kwargs):
+        key = values if values else tuple(str(kwargs[name]) for name in self.label_names)
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.setdefault(key, self.new_child())
+        return child
+
+    def series(self) -> List[Tuple[Dict[str, str], object]]:
+        return [(dict(zip(self.label_names, key)), child) for key, child in list(self.children.items())]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def new_child(self):
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0):
+        self.default.inc(amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help_text, labels)
+
+    def new_child(self):
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float):
+        self.default.observe(value)
+
+    def time(self) -> Timer:
+        return Timer(self.default)
+
+
+def format_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels.items()) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+def format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+class MetricsRegistry:
+    """All metrics of this process"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self.lock:
+            # Re-registering (e.g. a module imported twice) returns the existing metric
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help_text, labels, buckets))
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in list(self.metrics.values()):
+            lines.append(f"# HELP {metric.name} {metric.help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for labels, child in metric.series():
+                if metric.kind == "counter":
+                    lines.append(f"{metric.name}{format_labels(labels)} {child.value}")
+                    continue
+                with child.lock:
+                    counts, total, count = list(child.counts), child.sum, child.count
+                cumulative = 0
+                for bound, bucket_count in zip(metric.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    lines.append(f"{metric.name}_bucket{format_labels(labels, ('le', format_bound(bound)))} {cumulative}")
+                lines.append(f"{metric.name}_sum{format_labels(labels)} {total}")
+                lines.append(f"{metric.name}_count{format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict:
+        """JSON-friendly view: counter values and histogram count/sum/avg per label set"""
+        snapshot = {}
+        for metric in list(self.metrics.values()):
+            series = []
+            for labels, child in metric.series():
+                if metric.kind == "counter":
+                    series.append({"labels": labels, "value": child.value})
+                else:
+                    series.append({
+                        "labels": labels,
+                        "count": child.count,
+                        "sum": round(child.sum, 6),
+                        "avg": round(child.sum / child.count, 6) if child.count else None
+                    })
+            if series:
+                snapshot[metric.name] = series
+        return snapshot
+
+
+REGISTRY = MetricsRegistry()
+
+# Scraping
+PAGES_FETCHED = REGISTRY.counter("aginet_pages_fetched_total", "Listing pages fetched", ["site", "status"])
+PAGE_BYTES = REGISTRY.counter("aginet_page_bytes_total", "Bytes of listing pages fetched", ["site"])
+FETCH_SECONDS = REGISTRY.histogram("aginet_fetch_seconds", "HTTP fetch time per listing page", ["site"])
+PARSE_SECONDS = REGISTRY.histogram("aginet_parse_seconds", "Parse and extract time per listing page", ["site"])
+PRODUCTS_EXTRACTED = REGISTRY.counter("aginet_products_extracted_total", "Products extracted from pages", ["site"])
+HTTP_RETRIES = REGISTRY.counter("aginet_http_retries_total", "HTTP requests retried after a transient failure",
+                                ["host"])
+CIRCUIT_REJECTIONS = REGISTRY.counter("aginet_circuit_rejections_total", "Requests refused by an open circuit",
+                                      ["host"])
+PAGES_RENDERED = REGISTRY.counter("aginet_pages_rendered_total", "Listing pages rendered in a browser, by reason",
+                                  ["site", "reason"])
+
+# Database
+DB_ROWS = REGISTRY.counter("aginet_db_rows_total", "Product rows written, by outcome", ["result"])
+INTEGRATE_SECONDS = REGISTRY.histogram("aginet_integrate_seconds", "Time to integrate one input into the database")
+EXPORT_SECONDS = REGISTRY.histogram("aginet_export_seconds", "Time to export the database to JSON")
+
+# Sync service and scheduler
+SYNC_CYCLES = REGISTRY.counter("aginet_sync_cycles_total", "Auto-sync cycles, by outcome", ["outcome"])
+SYNC_CYCLE_SECONDS = REGISTRY.histogram("aginet_sync_cycle_seconds", "End-to-end auto-sync cycle latency")
+JOB_RUNS = REGISTRY.counter("aginet_job_runs_total", "Scheduled job runs, by outcome", ["job", "outcome"])
+JOB_SECONDS = REGISTRY.histogram("aginet_job_seconds", "Scheduled job duration", ["job"],
+                                 buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600))
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = self.server.registry.render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_metrics_server(port: int = 9108, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY):
+    """Serve /metrics for Prometheus from a background thread"""
+    server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+    server.daemon_threads = True
+    server.registry = registry
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"📈 Metrics available at http://{host}:{server.server_address[1]}/metrics")
+    return server
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Raw Page Archive for AgiNet
+Keeps every fetched page body, compressed and content-addressed, so extractors can be rerun without recrawling
+"""
+
+import os
+import gzip
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+
+class PageArchive:
+    """Gzipped page bodies stored under their SHA-256, plus a SQLite index of fetches
+
+    A body is written once no matter how many times it is fetched; every fetch
+    still gets an index row (url, site, category, page, fetched_at, hash), so
+    the archive can answer "what did this URL look like at time T".
+    """
+
+    def __init__(self, root: str = "page_archive"):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, "index.db")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.setup_index()
+
+    def connect(self):
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def setup_index(self):
+        """Create the fetch index"""
+        conn = self.connect()
+        # Several crawl workers may archive pages at once
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS page_fetches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL,
+                site TEXT,
+                category TEXT,
+                page INTEGER,
+                base_url TEXT,
+                status INTEGER,
+                fetched_at REAL NOT NULL,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_page_fetches_url ON page_fetches(url, fetched_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_page_fetches_hash ON page_fetches(content_hash)")
+        conn.commit()
+        conn.close()
+
+    def object_path(self, content_hash: str) -> str:
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.gz")
+
+    def store(self, url: str, content: bytes, site: str = None, category: str = None, page: int = None,
+              base_url: str = None, status: int = 200, fetched_at: float = None) -> str:
+        """Archive one fetched body and index the fetch; returns the content hash"""
+        content_hash = hashlib.sha256(content).hexdigest()
+        path = self.object_path(content_hash)
+
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write under a temporary name so a concurrent reader never sees a partial object
+            # (per process and thread, since fetch threads can store the same body at once)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+        conn = self.connect()
+        conn.execute('''
+            INSERT INTO page_fetches (url, site, category, page, base_url, status, fetched_at, content_hash, size)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (url, site, category, page, base_url, status, fetched_at or time.time(), content_hash, len(content)))
+        conn.commit()
+        conn.close()
+        return content_hash
+
+    def load(self, content_hash: str) -> bytes:
+        with gzip.open(self.object_path(content_hash), 'rb') as f:
+            return f.read()
+
+    def latest_pages(self, site: str = None, before: float = None) -> List[Dict]:
+        """The most recent archived fetch of every URL, optionally for one site or as of a time"""
+        query = '''
+            SELECT f.* FROM page_fetches f
+            JOIN (
+                SELECT url, MAX(fetched_at) AS fetched_at FROM page_fetches
+                WHERE status = 200 AND (? IS NULL OR fetched_at <= ?)
+                GROUP BY url
+            ) latest ON f.url = latest.url AND f.fetched_at = latest.fetched_at
+            WHERE (? IS NULL OR f.site = ?)
+            ORDER BY f.site, f.category, f.page
+        '''
+        conn = self.connect()
+        rows = conn.execute(query, (before, before, site, site)).fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+
+    def get_stats(self) -> Dict:
+        conn = self.connect()
+        fetches, urls, objects, raw_bytes = conn.execute('''
+            SELECT COUNT(*), COUNT(DISTINCT url), COUNT(DISTINCT content_hash), COALESCE(SUM(size), 0)
+            FROM page_fetches
+        ''').fetchone()
+        conn.close()
+
+        stored_bytes = 0
+        for directory, _, files in os.walk(self.objects_dir):
+            stored_bytes += sum(os.path.getsize(os.path.join(directory, name)) for name in files)
+
+        return {
+            "fetches": fetches,
+            "urls": urls,
+            "unique_bodies": objects,
+            "fetched_mb": round(raw_bytes / 1024 / 1024, 2),
+            "stored_mb": round(stored_bytes / 1024 / 1024, 2)
+        }
+
+
+def extract_archived_pages(archive_root: str, pages: List[Dict]) -> List[Dict]:
+    """Worker: rerun the current extractors over a chunk of archived pages"""
+    from agri_scraper import AgriScraper
+
+    archive = PageArchive(archive_root)
+    scraper = AgriScraper()
+    products = []
+    for page in pages:
+        try:
+            content = archive.load(page["content_hash"])
+            for product in scraper.extract_page(page["site"], page["category"], content, page["base_url"]):
+                products.append(asdict(product))
+        except Exception as e:
+            logger.error(f"❌ Re-extraction of {page['url']} failed: {e}")
+    return products
+
+
+def reextract(archive_root: str, db_path: str, site: str = None, workers: int = None,
+              chunk_size: int = 20, dry_run: bool = False) -> Dict:
+    """Re-extract the latest archived copy of every page in parallel and feed the integrator"""
+    from data_integrator import AgrokartDataIntegrator
+
+    archive = PageArchive(archive_root)
+    pages = [page for page in archive.latest_pages(site) if page["site"] and page["base_url"]]
+    if not pages:
+        logger.warning("⚠️ No archived pages to re-extract")
+        return {"pages": 0, "products": 0}
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+    logger.info(f"🔁 Re-extracting {len(pages)} archived pages on {workers} processes")
+
+    started = time.time()
+    products = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_products in pool.map(extract_archived_pages, [archive_root] * len(chunks), chunks):
+            products.extend(chunk_products)
+    extract_seconds = time.time() - started
+
+    summary = {"pages": len(pages), "products": len(products), "extract_seconds": round(extract_seconds, 2)}
+    if not dry_run and products:
+        integrator = AgrokartDataIntegrator(db_path)
+        result = integrator.integrate_products(products, source=f"archive:{site or 'all'}")
+        if result:
+            summary.update({key: result.get(key, 0) for key in ("updated", "unchanged")})
+            summary["inserted"] = result.get("products", 0)
+
+    logger.info(f"✅ Re-extraction finished: {summary}")
+    return summary
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AgiNet raw page archive")
+    parser.add_argument("command", choices=["reextract", "stats"],
+                        help="'reextract' archived pages into the database, or show archive 'stats'")
+    parser.add_argument("--archive", default="page_archive", help="Archive directory")
+    parser.add_argument("--db-path", default="../database.db", help="Products database path")
+    parser.add_argument("--site", default=None, help="Only re-extract pages of this site")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: all cores)")
+    parser.add_argument("--dry-run", action="store_true", help="Extract but do not write to the database")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(process)d - %(levelname)s - %(message)s')
+
+    if args.command == "reextract":
+        summary = reextract(args.archive, args.db_path, args.site, args.workers, dry_run=args.dry_run)
+        print(f"🔁 Re-extracted {summary['products']} products from {summary['pages']} pages")
+    else:
+        print("📦 Page Archive:")
+        for key, value in PageArchive(args.archive).get_stats().items():
+            print(f"   {key.replace('_', ' ').title()}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Profiling Hooks for AgiNet
+cProfile, a wall-clock stack sampler and tracemalloc for a whole run, a single cycle, or on signal
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import pstats
+import signal
+import cProfile
+import logging
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StackSampler(threading.Thread):
+    """Samples every thread's stack at a fixed interval into collapsed-stack counts"""
+
+    def __init__(self, interval: float = 0.005):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.counts = Counter()
+        self.samples = 0
+        self.stop_event = threading.Event()
+
+    @staticmethod
+    def frame_label(code) -> str:
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def run(self):
+        own = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self.frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+class ProfileSession:
+    """One profiling run; stop() writes its reports to <output_root>/<label>_<timestamp>/
+
+    cProfile covers the thread that called start(), and stop() must then be
+    called on that thread too. The sampler covers all threads, wall-clock,
+    and writes flamegraph-ready collapsed stacks. tracemalloc reports the top
+    allocation sites and the growth since start. With call_profile=False the
+    session may be stopped from any thread. Overlapping sessions (e.g. a
+    cycle profile during a live one) share tracemalloc, and it is stopped
+    only when the last one that needed it stops.
+    """
+
+    # Sessions currently relying on tracemalloc, and whether a session (not the program) started it
+    tracing_lock = threading.Lock()
+    tracing_sessions = 0
+    started_tracing = False
+
+    def __init__(self, label: str, output_root: str = "profiles", sample_interval: float = 0.005,
+                 trace_allocations: bool = True, top: int = 40, call_profile: bool = True):
+        self.label = label
+        self.output_root = output_root
+        self.trace_allocations = trace_allocations
+        self.top = top
+        self.profiler = cProfile.Profile() if call_profile else None
+        self.sampler = StackSampler(sample_interval)
+        self.baseline = None
+        self.peak_traced = None
+        self.started_at = None
+
+    def start(self) -> 'ProfileSession':
+        self.started_at = time.time()
+        if self.trace_allocations:
+            with ProfileSession.tracing_lock:
+                if not tracemalloc.is_tracing():
+                    tracemalloc.start(10)
+                    ProfileSession.started_tracing = True
+                ProfileSession.tracing_sessions += 1
+            self.baseline = tracemalloc.take_snapshot()
+        self.sampler.start()
+        try:
+            if self.profiler:
+                self.profiler.enable()
+        except ValueError as e:
+            # Another profiler is already active in this thread; the sampler still runs
+            logger.warning(f"⚠️ cProfile unavailable: {e}")
+            self.profiler = None
+        logger.info(f"🔬 Profiling '{self.label}' started")
+        return self
+
+    def stop(self) -> str:
+        if self.profiler:
+            self.profiler.disable()
+        self.sampler.stop()
+        snapshot = tracemalloc.take_snapshot() if self.trace_allocations else None
+        self.peak_traced = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        if self.trace_allocations:
+            with ProfileSession.tracing_lock:
+                ProfileSession.tracing_sessions -= 1
+                if ProfileSession.tracing_sessions == 0 and ProfileSession.started_tracing:
+                    tracemalloc.stop()
+                    ProfileSession.started_tracing = False
+
+        directory = os.path.join(self.output_root, f"{self.label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        os.makedirs(directory, exist_ok=True)
+        self.write_reports(directory, snapshot)
+        logger.info(f"🔬 Profile of '{self.label}' written to {directory}")
+        return directory
+
+    def write_reports(self, directory: str, snapshot):
+        duration = time.time() - self.started_at
+
+        if self.profiler:
+            self.profiler.dump_stats(os.path.join(directory, "profile.pstats"))
+            report = io.StringIO()
+            stats = pstats.Stats(self.profiler, stream=report).strip_dirs()
+            stats.sort_stats("cumulative").print_stats(self.top)
+            stats.sort_stats("tottime").print_stats(self.top)
+            with open(os.path.join(directory, "profile.txt"), "w", encoding="utf-8") as f:
+                f.write(report.getvalue())
+
+        with open(os.path.join(directory, "stacks.collapsed"), "w", encoding="utf-8") as f:
+            for stack, count in self.sampler.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+        if snapshot is not None:
+            with open(os.path.join(directory, "allocations.txt"), "w", encoding="utf-8") as f:
+                f.write(f"Top {self.top} allocation sites (live at end of profile)\n")
+                for stat in snapshot.statistics("lineno")[:self.top]:
+                    f.write(f"{stat}\n")
+                f.write(f"\nTop {self.top} allocation changes since profile start\n")
+                for stat in snapshot.compare_to(self.baseline, "lineno")[:self.top]:
+                    f.write(f"{stat}\n")
+
+        with open(os.path.join(directory, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump({
+                "label": self.label,
+                "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+                "duration_seconds": round(duration, 3),
+                "stack_samples": self.sampler.samples,
+                "sample_interval_seconds": self.sampler.interval,
+                "cprofile": self.profiler is not None,
+                "peak_traced_memory_bytes": self.peak_traced
+            }, f, indent=2)
+
+
+class ProfilingHooks:
+    """Process-wide switches: profile a whole run, the next cycle, or toggle on a live process
+
+    SIGUSR1 starts a session, and a second SIGUSR1 stops it (or it stops itself
+    after max_seconds). SIGUSR2 asks for the next cycle() block to be profiled
+    on its own.
+    """
+
+    def __init__(self):
+        self.output_root = "profiles"
+        self.max_seconds = 300.0
+        self.session: Optional[ProfileSession] = None
+        self.auto_stop: Optional[threading.Timer] = None
+        self.cycle_requested = threading.Event()
+        self.lock = threading.RLock()  # Signal handlers may re-enter on the main thread
+
+    def toggle(self, label: str = "live"):
+        with self.lock:
+            if self.session is None:
+                self.session = ProfileSession(label, self.output_root).start()
+                self.auto_stop = threading.Timer(self.max_seconds, self.expire, args=(self.session,))
+                self.auto_stop.daemon = True
+                self.auto_stop.start()
+                return
+        self.stop_live()
+
+    def expire(self, session: ProfileSession):
+        # cProfile must be disabled on the thread that enabled it, so go through the signal handler
+        if self.session is session:
+            os.kill(os.getpid(), signal.SIGUSR1)
+
+    def stop_live(self):
+        with self.lock:
+            session, self.session = self.session, None
+            if self.auto_stop:
+                self.auto_stop.cancel()
+                self.auto_stop = None
+        if session:
+            session.stop()
+
+    def request_cycle(self):
+        self.cycle_requested.set()
+        logger.info("🔬 The next cycle will be profiled")
+
+    def begin_cycle(self, label: str, call_profile: bool = True) -> Optional[ProfileSession]:
+        """A started session if a single-cycle profile was requested, else None"""
+        if not self.cycle_requested.is_set() or self.session is not None:
+            return None
+        self.cycle_requested.clear()
+        return ProfileSession(label, self.output_root, call_profile=call_profile).start()
+
+    @contextmanager
+    def cycle(self, label: str):
+        """Profile this block if a single-cycle profile was requested"""
+        session = self.begin_cycle(label)
+        try:
+            yield
+        finally:
+            if session:
+                session.stop()
+
+    def install_signal_handlers(self, label: str):
+        """SIGUSR1 toggles live profiling, SIGUSR2 profiles the next cycle (POSIX, main thread only)"""
+        if not hasattr(signal, "SIGUSR1") or threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.toggle(label))
+        signal.signal(signal.SIGUSR2, lambda signum, frame: self.request_cycle())
+        logger.debug(f"Profiling signals installed for pid {os.getpid()}")
+
+
+HOOKS = ProfilingHooks()
+
+
+def add_profiling_arguments(parser):
+    parser.add_argument("--profile", action="store_true",
+                        help="Profile the whole run (cProfile, stack samples, allocations)")
+    parser.add_argument("--profile-dir", default="profiles", help="Directory for profile reports")
+    parser.add_argument("--profile-max-seconds", type=float, default=300.0,
+                        help="Auto-stop a signal-started profile after this many seconds")
+
+
+@contextmanager
+def profiling_from_args(args, label: str):
+    """Install the signal hooks and, with --profile, profile the wrapped run"""
+    HOOKS.output_root = args.profile_dir
+    HOOKS.max_seconds = args.profile_max_seconds
+    HOOKS.install_signal_handlers(label)
+    if not args.profile:
+        yield
+        return
+    session = ProfileSession(label, args.profile_dir).start()
+    try:
+        yield
+    finally:
+        session.stop()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Retry and Circuit Breaking for AgiNet
+Retries transient HTTP failures with backoff and stops calling hosts that keep failing
+"""
+
+import time
+import random
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from metrics import CIRCUIT_REJECTIONS, HTTP_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpen(Exception):
+    """A request was refused because its host's circuit is open"""
+
+    def __init__(self, host: str, retry_in: float):
+        self.host = host
+        self.retry_in = retry_in
+        super().__init__(f"Circuit open for {host}, next try in {retry_in:.0f}s")
+
+
+@dataclass
+class RetryPolicy:
+    """Exponential backoff with full jitter, for idempotent requests only"""
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    idempotent_methods: Tuple[str, ...] = ("GET", "HEAD", "OPTIONS")
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Seconds to wait after failed attempt number `attempt` (1-based)"""
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def retryable(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+
+class CircuitBreaker:
+    """Per-host circuit: opens after consecutive failures, half-opens after a cooldown
+
+    While open, requests to the host fail at once with CircuitOpen. After
+    `reset_timeout` seconds one trial request is let through; its success
+    closes the circuit and its failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.lock = threading.Lock()
+        self.hosts: Dict[str, Dict] = {}
+
+    def host_state(self, host: str) -> Dict:
+        return self.hosts.setdefault(host, {"state": "closed", "failures": 0, "opened_at": None,
+                                            "trial_started": None, "opens": 0, "rejected": 0})
+
+    def before_request(self, host: str):
+        """Raise CircuitOpen unless a request to `host` may go ahead"""
+        with self.lock:
+            state = self.host_state(host)
+            if state["state"] == "closed":
+                return
+            waited = time.monotonic() - state["opened_at"]
+            if state["state"] == "open" and waited >= self.reset_timeout:
+                state["state"] = "half_open"
+            # A trial that never reported back (e.g. an unexpected error) expires after a cooldown
+            now = time.monotonic()
+            if state["state"] == "half_open" and (state["trial_started"] is None
+                                                  or now - state["trial_started"] >= self.reset_timeout):
+                state["trial_started"] = now
+                logger.info(f"🔌 Circuit for {host} half-open, sending a trial request")
+                return
+            state["rejected"] += 1
+            retry_in = max(self.reset_timeout - waited, 0)
+        CIRCUIT_REJECTIONS.labels(host).inc()
+        raise CircuitOpen(host, retry_in)
+
+    def record_success(self, host: str):
+        with self.lock:
+            state = self.host_state(host)
+            if state["state"] != "closed":
+                logger.info(f"🔌 Circuit for {host} closed again")
+            state.update(state="closed", failures=0, opened_at=None, trial_started=None)
+
+    def record_failure(self, host: str):
+        with self.lock:
+            state = self.host_state(host)
+            state["failures"] += 1
+            reopen = state["state"] == "half_open"
+            if not reopen and (state["state"] == "open" or state["failures"] < self.failure_threshold):
+                return
+            state.update(state="open", opened_at=time.monotonic(), trial_started=None)
+            state["opens"] += 1
+            failures = state["failures"]
+        logger.warning(f"🔌 Circuit for {host} opened after {failures} consecutive failures; "
+                       f"pausing requests for {self.reset_timeout:.0f}s")
+
+    def get_status(self) -> Dict:
+        with self.lock:
+            return {host: {key: value for key, value in state.items() if key not in ("opened_at", "trial_started")}
+                    for host, state in self.hosts.items()}
+
+
+def resilient_request(session: requests.Session, method: str, url: str, policy: RetryPolicy = None,
+                      breaker: CircuitBreaker = None, **kwargs) -> requests.Response:
+    """Send a request through the host's circuit, retrying transient failures per the policy
+
+    Timeouts, connection errors and retryable statuses count as host
+    failures. After the last attempt the final response is returned (so the
+    caller's raise_for_status still applies) or the final error is raised.
+    """
+    policy = policy or RetryPolicy()
+    host = urlsplit(url).netloc
+    attempts = policy.max_attempts if policy.retryable(method) else 1
+
+    for attempt in range(1, attempts + 1):
+        if breaker:
+            breaker.before_request(host)
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if breaker:
+                breaker.record_failure(host)
+            if attempt == attempts:
+                raise
+            wait = policy.delay(attempt)
+            logger.warning(f"🔁 {method} {url} failed ({type(e).__name__}), attempt {attempt}/{attempts}; "
+                           f"retrying in {wait:.1f}s")
+        else:
+            if response.status_code not in policy.retry_statuses:
+                if breaker:
+                    breaker.record_success(host)
+                return response
+            if breaker:
+                breaker.record_failure(host)
+            if attempt == attempts:
+                return response
+            wait = policy.delay(attempt, response.headers.get("Retry-After"))
+            logger.warning(f"🔁 {method} {url} returned {response.status_code}, attempt {attempt}/{attempts}; "
+                           f"retrying in {wait:.1f}s")
+        HTTP_RETRIES.labels(host).inc()
+        time.sleep(wait)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Resource Blocking for AgiNet
+Blocks fonts, stylesheets, media, analytics and ads in headless Chrome through CDP Network.setBlockedURLs
+"""
+
+import logging
+import threading
+from fnmatch import fnmatchcase
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# URL patterns per resource group (CDP patterns: '*' matches any run of characters)
+RESOURCE_GROUPS = {
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "stylesheet": ["*.css", "*.css?*"],
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+              "*.png?*", "*.jpg?*", "*.jpeg?*", "*.webp?*"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*youtube.com/embed*", "*player.vimeo.com*"],
+    "analytics": ["*google-analytics.com*", "*googletagmanager.com*", "*analytics.js*", "*hotjar.com*",
+                  "*clarity.ms*", "*segment.io*", "*mixpanel.com*", "*connect.facebook.net*"],
+    "ads": ["*doubleclick.net*", "*googlesyndication.com*", "*adservice.google.*", "*amazon-adsystem.com*",
+            "*taboola.com*", "*outbrain.com*", "*criteo.com*"],
+    "chat": ["*tawk.to*", "*intercom.io*", "*zopim.com*", "*freshchat.com*", "*crisp.chat*"]
+}
+
+# Groups blocked by each profile; images are also off through Chrome prefs
+BLOCKING_PROFILES = {
+    "off": [],
+    "safe": ["font", "media", "analytics", "ads", "chat"],
+    "lean": ["font", "stylesheet", "media", "analytics", "ads", "chat"],
+    "aggressive": ["font", "stylesheet", "image", "media", "analytics", "ads", "chat"]
+}
+
+# Typical transfer size per group, for estimating the bytes a blocked request saved
+TYPICAL_BYTES = {
+    "font": 40_000, "stylesheet": 60_000, "image": 50_000, "media": 1_500_000,
+    "analytics": 80_000, "ads": 120_000, "chat": 150_000, "other": 20_000
+}
+
+
+class ResourceBlocker:
+    """Applies a blocking profile per page and counts what it blocked
+
+    Sites can opt groups back in (`allow`), e.g. a shop whose lazy loading
+    depends on its stylesheet. Counting needs the driver's performance log,
+    which the caller reads once per page and passes to record().
+    """
+
+    def __init__(self, profile: str = "lean", allow: Dict[str, List[str]] = None,
+                 extra_patterns: List[str] = None):
+        if profile not in BLOCKING_PROFILES:
+            raise ValueError(f"Unknown blocking profile '{profile}' (choose from {', '.join(BLOCKING_PROFILES)})")
+        self.profile = profile
+        self.allow = allow or {}
+        self.extra_patterns = extra_patterns or []
+        self.applied = {}  # browser session -> site whose patterns are active in it
+        self.lock = threading.Lock()
+        self.stats = {"pages": 0, "blocked_requests": 0, "estimated_bytes_saved": 0,
+                      "bytes_loaded": 0, "blocked_by_group": {}}
+
+    def groups_for(self, site: Optional[str]) -> List[str]:
+        allowed = set(self.allow.get(site, []))
+        return [group for group in BLOCKING_PROFILES[self.profile] if group not in allowed]
+
+    def patterns_for(self, site: Optional[str]) -> List[str]:
+        patterns = [pattern for group in self.groups_for(site) for pattern in RESOURCE_GROUPS[group]]
+        return patterns + self.extra_patterns
+
+    def apply(self, driver, site: Optional[str] = None):
+        """Set the site's block list on the driver; a no-op when it is already set"""
+        # Session IDs are never reused, unlike id() of a recycled pool driver
+        key = getattr(driver, "session_id", None) or id(driver)
+        if self.applied.get(key, object()) == site:
+            return
+        patterns = self.patterns_for(site)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            self.applied[key] = site
+            logger.debug(f"Blocking {len(patterns)} URL patterns for {site or 'all sites'} ({self.profile})")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not set blocked URLs: {e}")
+
+    def classify(self, url: str) -> str:
+        for group, patterns in RESOURCE_GROUPS.items():
+            if any(fnmatchcase(url, pattern) for pattern in patterns):
+                return group
+        return "other"
+
+    def record(self, messages: List[Dict], new_page: bool = True):
+        """Count blocked requests and loaded bytes among one page's DevTools messages"""
+        urls = {}
+        blocked, loaded = [], 0
+        for message in messages:
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+            elif method == "Network.loadingFailed" and (params.get("blockedReason")
+                                                        or "BLOCKED_BY_CLIENT" in params.get("errorText", "")):
+                blocked.append(self.classify(urls.get(params.get("requestId"), "")))
+            elif method == "Network.loadingFinished":
+                loaded += params.get("encodedDataLength", 0)
+
+        with self.lock:
+            self.stats["pages"] += int(new_page)
+            self.stats["bytes_loaded"] += int(loaded)
+            self.stats["blocked_requests"] += len(blocked)
+            for group in blocked:
+                self.stats["estimated_bytes_saved"] += TYPICAL_BYTES[group]
+                self.stats["blocked_by_group"][group] = self.stats["blocked_by_group"].get(group, 0) + 1
+
+    def get_stats(self) -> Dict:
+        with self.lock:
+            stats = dict(self.stats, blocked_by_group=dict(self.stats["blocked_by_group"]))
+        stats["profile"] = self.profile
+        stats["blocked_per_page"] = round(stats["blocked_requests"] / stats["pages"], 1) if stats["pages"] else 0.0
+        return stats
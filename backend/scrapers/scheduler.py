@@ -10,9 +10,18 @@ import logging
 from datetime import datetime
 import os
 import json
-from agri_scraper import AgriScraper
-from selenium_scraper import SeleniumAgriScraper
-from data_integrator import AgiNetDataIntegrator
+from agri_scraper import AgriScraper, SITES
+from selenium_scraper import SeleniumAgriScraper, SELENIUM_SITES, site_resource_blocker
+from data_integrator import AgrokartDataIntegrator
+from job_executor import JobExecutor, JobSpec
+from driver_pool import WebDriverPool
+from hybrid_fetcher import HybridFetcher
+from adaptive_schedule import AdaptiveRecrawlScheduler
+from crawl_checkpoint import CrawlCheckpoint
+from page_archive import PageArchive
+from metrics import REGISTRY, start_metrics_server
+from profiling import add_profiling_arguments, profiling_from_args
+from tracing import add_logging_arguments, configure_logging, run_context
 
 # Setup logging
 logging.basicConfig(
@@ -28,21 +37,53 @@ logger = logging.getLogger(__name__)
 class ScrapingScheduler:
     """Manages scheduled scraping tasks"""
     
-    def __init__(self):
-        self.scraper = AgriScraper()
+    def __init__(self, archive_json: bool = True, page_archive_dir: str = "page_archive", browser_pool_size: int = 2):
+        # Raw page bodies are archived so fixed extractors can be rerun without recrawling
+        self.page_archive = PageArchive(page_archive_dir) if page_archive_dir else None
+        # Warm browsers shared by Selenium jobs; launched on first use, not here
+        self.driver_pool = WebDriverPool(size=browser_pool_size, max_pages_per_driver=30, capture_network=True)
+        # Shared by every Selenium run, so blocking stats accumulate across runs
+        self.resource_blocker = site_resource_blocker()
+        self.integrator = AgrokartDataIntegrator()
+        # Static sites borrow a pooled browser only for pages that need JavaScript
+        self.hybrid = HybridFetcher(self.driver_pool, self.integrator.db_path, blocker=self.resource_blocker)
+        self.scraper = AgriScraper(page_archive=self.page_archive, hybrid=self.hybrid)
         self.selenium_scraper = None
-        self.integrator = AgiNetDataIntegrator()
         self.last_run = None
+        self.archive_json = archive_json  # Keep rotated JSON archives of each scrape
+        self.checkpoint_dir = "checkpoints"
+        self.executor = JobExecutor(max_workers=4)
+        self.register_jobs()
+        
+        # Recrawl frequency per (site, category) follows observed change rates
+        self.recrawl = AdaptiveRecrawlScheduler(self.integrator.db_path)
+        self.recrawl.register([(site, category) for site in SITES for category in SITES[site]["categories"]])
+        self.recrawl.register([(site, category) for site in SELENIUM_SITES
+                               for category in SELENIUM_SITES[site]["categories"]], pages_per_crawl=1)
+        
+    def register_jobs(self):
+        """Register scheduled jobs; status saves jump the queue, scrapes start with jitter"""
+        self.executor.register(JobSpec("save_status", self.save_status, priority=0))
+        self.executor.register(JobSpec("export_database", self.export_database, priority=10, jitter=30))
+        # Both scrape through self.scraper, whose session, quality verdicts and circuits are not per run
+        self.executor.register(JobSpec("basic_scraping", self.run_basic_scraping, priority=20, jitter=60,
+                                       group="static_scraper"))
+        self.executor.register(JobSpec("selenium_scraping", self.run_selenium_scraping, priority=30, jitter=120))
+        self.executor.register(JobSpec("adaptive_scraping", self.run_adaptive_scraping, priority=20, jitter=30,
+                                       group="static_scraper"))
         
     def run_basic_scraping(self):
         """Run basic scraping with requests/BeautifulSoup"""
         try:
             logger.info("🌾 Starting scheduled basic scraping...")
 
+            # A crawl killed midway resumes from its checkpoint
+            checkpoint = CrawlCheckpoint(os.path.join(self.checkpoint_dir, "basic_scraping.jsonl"))
+            
             # Try real scraping first, fallback to sample data
             try:
                 logger.info("Attempting real website scraping...")
-                products = self.scraper.scrape_all_sites(max_pages_per_site=2)
+                products = self.scraper.scrape_all_sites(max_pages_per_site=2, checkpoint=checkpoint)
                 if not products:
                     logger.warning("No products from real scraping, using sample data")
                     products = self.scraper.generate_sample_data(100)
@@ -51,20 +92,20 @@ class ScrapingScheduler:
                 products = self.scraper.generate_sample_data(100)
             
             if products:
-                # Save to JSON
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                json_file = f"scheduled_scrape_{timestamp}.json"
+                # Integrate into database straight from memory, per category so change rates learn from it
+                by_category, rest = self.split_by_category(products)
+                results = [self.record_recrawl(site, category, category_products)
+                           for (site, category), category_products in by_category.items()]
+                if rest:
+                    results.append(self.integrator.integrate_products(rest, source="basic_scraping"))
+                checkpoint.finish()
+                result = {key: sum(r.get(key, 0) for r in results) for key in ("products", "updated", "unchanged")}
+                if all(r.get("skipped") for r in results):
+                    logger.info("⏭️ Scraped data unchanged since last run, database left as is")
+                logger.info(f"✅ Basic scraping completed: {result}")
                 
-                if self.scraper.save_to_json(products, json_file):
-                    # Integrate into database
-                    result = self.integrator.integrate_scraped_data(json_file)
-                    logger.info(f"✅ Basic scraping completed: {result}")
-                    
-                    # Cleanup old JSON files (keep last 5)
-                    self.cleanup_old_files("scheduled_scrape_*.json", keep=5)
-                    
-                else:
-                    logger.error("❌ Failed to save scraped data")
+                # Archive to JSON in the background (keep last 5)
+                self.archive_products(self.scraper, products, "scheduled_scrape", keep=5)
             else:
                 logger.warning("⚠️ No products scraped")
                 
@@ -73,17 +114,85 @@ class ScrapingScheduler:
         except Exception as e:
             logger.error(f"❌ Basic scraping failed: {e}")
             
+    def split_by_category(self, products):
+        """Group a sweep's products by (site, category path); sample data and strays are returned apart"""
+        paths = {(site, category.split('/')[-1].replace('-', ' ').title()): category
+                 for site in SITES for category in SITES[site]["categories"]}
+        by_category, rest = {}, []
+        for product in products:
+            key = (product.source_site, paths.get((product.source_site, product.category)))
+            if key[1] is None:
+                rest.append(product)
+            else:
+                by_category.setdefault(key, []).append(product)
+        return by_category, rest
+        
+    def record_recrawl(self, site: str, category: str, products) -> dict:
+        """Integrate one category's products and feed the outcome to the adaptive scheduler"""
+        result = self.integrator.integrate_products(products, source=f"{site}{category}")
+        changed = 0 if result.get("skipped") else result["products"] + result.get("updated", 0)
+        self.recrawl.record_crawl(site, category, len(products), changed)
+        return result
+        
+    def run_adaptive_scraping(self, max_pages: int = 2):
+        """Recrawl only the categories the adaptive scheduler says are due"""
+        due = self.recrawl.due()
+        if not due:
+            logger.info("😴 No categories due for recrawl")
+            return
+            
+        logger.info(f"🌾 Adaptive recrawl of {len(due)} categories: {due}")
+        self.scraper.quality.start_run()
+        selenium_due = [(site, category) for site, category in due if site in SELENIUM_SITES]
+        
+        for site, category in due:
+            if site not in SITES:
+                continue
+            try:
+                products = self.scraper.scrape_category(site, category, max_pages)
+                if products:
+                    self.record_recrawl(site, category, products)
+                else:
+                    # Nothing to learn from an empty crawl, but do not retry it immediately
+                    self.recrawl.record_crawl(site, category, 0, 0)
+            except Exception as e:
+                logger.error(f"❌ Recrawl of {site} {category} failed: {e}")
+                
+        if selenium_due:
+            scraper = SeleniumAgriScraper(pool=self.driver_pool, blocker=self.resource_blocker)
+            try:
+                # One call, so the due categories load in parallel across the pooled browsers
+                results = scraper.scrape_krishijagran_categories([category for _, category in selenium_due])
+            except Exception as e:
+                logger.error(f"❌ Selenium recrawl failed: {e}")
+                results = {}
+            for site, category in selenium_due:
+                products = results.get(category)
+                try:
+                    if products:
+                        self.record_recrawl(site, category, products)
+                    elif products is not None:
+                        self.recrawl.record_crawl(site, category, 0, 0)
+                    else:
+                        logger.error(f"❌ Recrawl of {site} {category} failed")
+                except Exception as e:
+                    logger.error(f"❌ Recrawl of {site} {category} failed: {e}")
+                
+        self.last_run = datetime.now()
+        
     def run_selenium_scraping(self):
         """Run advanced scraping with Selenium"""
         try:
             logger.info("🚀 Starting scheduled Selenium scraping...")
 
-            self.selenium_scraper = SeleniumAgriScraper(headless=True)
+            self.selenium_scraper = SeleniumAgriScraper(pool=self.driver_pool, blocker=self.resource_blocker)
 
+            checkpoint = CrawlCheckpoint(os.path.join(self.checkpoint_dir, "selenium_scraping.jsonl"))
+            
             # Try real Selenium scraping first, fallback to sample data
             try:
                 logger.info("Attempting Selenium website scraping...")
-                products = self.selenium_scraper.scrape_with_selenium()
+                products = self.selenium_scraper.scrape_with_selenium(checkpoint=checkpoint)
                 if not products:
                     logger.warning("No products from Selenium scraping, using sample data")
                     products = self.selenium_scraper.generate_sample_data(50)
@@ -92,16 +201,11 @@ class ScrapingScheduler:
                 products = self.selenium_scraper.generate_sample_data(50)
             
             if products:
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                json_file = f"selenium_scrape_{timestamp}.json"
+                result = self.integrator.integrate_products(products, source="selenium_scraping")
+                checkpoint.finish()
+                logger.info(f"✅ Selenium scraping completed: {result}")
                 
-                if self.selenium_scraper.save_to_json(products, json_file):
-                    result = self.integrator.integrate_scraped_data(json_file)
-                    logger.info(f"✅ Selenium scraping completed: {result}")
-                    
-                    self.cleanup_old_files("selenium_scrape_*.json", keep=3)
-                else:
-                    logger.error("❌ Failed to save Selenium scraped data")
+                self.archive_products(self.selenium_scraper, products, "selenium_scrape", keep=3)
             else:
                 logger.warning("⚠️ No products scraped with Selenium")
                 
@@ -109,10 +213,18 @@ class ScrapingScheduler:
             logger.error(f"❌ Selenium scraping failed: {e}")
             
         finally:
-            if self.selenium_scraper:
-                self.selenium_scraper.close()
-                self.selenium_scraper = None
+            self.selenium_scraper = None
                 
+    def archive_products(self, scraper, products, prefix: str, keep: int):
+        """Write a JSON archive in the background and rotate old archives once it lands"""
+        if not self.archive_json:
+            return None
+            
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        future = scraper.archive_to_json(products, f"{prefix}_{timestamp}.json")
+        future.add_done_callback(lambda f: f.result() and self.cleanup_old_files(f"{prefix}_*.json", keep=keep))
+        return future
+            
     def cleanup_old_files(self, pattern: str, keep: int = 5):
         """Clean up old scraping files"""
         try:
@@ -160,7 +272,15 @@ class ScrapingScheduler:
             "last_run": self.last_run.isoformat() if self.last_run else None,
             "database_stats": stats,
             "next_basic_run": schedule.next_run(),
-            "scheduler_active": True
+            "scheduler_active": True,
+            "executor": self.executor.get_status(),
+            "recrawl": self.recrawl.get_status(),
+            "browser_pool": self.driver_pool.get_stats(),
+            "resource_blocking": self.resource_blocker.get_stats(),
+            "hybrid_fetch": self.hybrid.get_status(),
+            "extraction_quality": self.scraper.quality.get_status(),
+            "circuits": self.scraper.circuits.get_status(),
+            "metrics": REGISTRY.snapshot()
         }
         
     def save_status(self):
@@ -173,34 +293,37 @@ class ScrapingScheduler:
             logger.error(f"Error saving status: {e}")
 
 
-def setup_schedule():
+def setup_schedule(archive_json: bool = True, page_archive_dir: str = "page_archive", browser_pool_size: int = 2):
     """Setup scraping schedule"""
-    scheduler = ScrapingScheduler()
+    scheduler = ScrapingScheduler(archive_json, page_archive_dir, browser_pool_size)
+
+    # Schedule entries only enqueue jobs; the executor runs them so they never delay each other
+    submit = scheduler.executor.submit
 
-    # Schedule basic scraping every 4 hours for fresh data
-    schedule.every(4).hours.do(scheduler.run_basic_scraping)
+    # Check every 15 minutes which categories are due; volatile ones come up more often
+    schedule.every(15).minutes.do(submit, "adaptive_scraping")
 
-    # Schedule Selenium scraping twice daily (2 AM and 2 PM)
-    schedule.every().day.at("02:00").do(scheduler.run_selenium_scraping)
-    schedule.every().day.at("14:00").do(scheduler.run_selenium_scraping)
+    # Daily full sweep as a safety net: reaches every category and falls back to sample data if sites are down
+    schedule.every().day.at("02:00").do(submit, "basic_scraping")
 
     # Schedule database export every 6 hours for frontend sync
-    schedule.every(6).hours.do(scheduler.export_database)
+    schedule.every(6).hours.do(submit, "export_database")
 
     # Schedule status save every 30 minutes for monitoring
-    schedule.every(30).minutes.do(scheduler.save_status)
+    schedule.every(30).minutes.do(submit, "save_status")
 
     logger.info("📅 Enhanced scraping schedule configured:")
-    logger.info("   - Basic scraping: Every 4 hours")
-    logger.info("   - Selenium scraping: Twice daily (2 AM & 2 PM)")
+    logger.info("   - Adaptive recrawl: Due categories checked every 15 minutes "
+                f"(budget {scheduler.recrawl.daily_request_budget} requests/day)")
+    logger.info("   - Full basic sweep: Daily at 2 AM (sample data if no site answers)")
     logger.info("   - Database export: Every 6 hours")
     logger.info("   - Status update: Every 30 minutes")
 
     return scheduler
 
-def run_scheduler():
+def run_scheduler(archive_json: bool = True, page_archive_dir: str = "page_archive", browser_pool_size: int = 2):
     """Run the scheduler"""
-    scheduler = setup_schedule()
+    scheduler = setup_schedule(archive_json, page_archive_dir, browser_pool_size)
     
     # Run initial scraping
     logger.info("🚀 Running initial scraping...")
@@ -208,6 +331,7 @@ def run_scheduler():
     scheduler.export_database()
     scheduler.save_status()
     
+    scheduler.executor.start()
     logger.info("⏰ Scheduler started. Press Ctrl+C to stop.")
     
     try:
@@ -222,20 +346,22 @@ def run_scheduler():
         logger.error(f"❌ Scheduler error: {e}")
         
     finally:
-        if scheduler.selenium_scraper:
-            scheduler.selenium_scraper.close()
+        scheduler.executor.shutdown(wait=True)
+        scheduler.driver_pool.close()
 
-def run_once():
+def run_once(archive_json: bool = True, page_archive_dir: str = "page_archive"):
     """Run scraping once and exit"""
-    scheduler = ScrapingScheduler()
+    scheduler = ScrapingScheduler(archive_json, page_archive_dir)
     
     print("🌾 Running one-time scraping...")
     
-    # Run basic scraping
-    scheduler.run_basic_scraping()
-    
-    # Export database
-    scheduler.export_database()
+    # One run ID covers the scrape and the export it feeds
+    with run_context():
+        # Run basic scraping
+        scheduler.run_basic_scraping()
+        
+        # Export database
+        scheduler.export_database()
     
     # Show stats
     stats = scheduler.get_status()
@@ -252,13 +378,30 @@ def main():
     parser = argparse.ArgumentParser(description="AgiNet Scraping Scheduler")
     parser.add_argument("--mode", choices=["schedule", "once"], default="once",
                        help="Run mode: 'schedule' for continuous, 'once' for single run")
+    parser.add_argument("--no-archive", action="store_true",
+                       help="Do not keep JSON archives of scraped products")
+    parser.add_argument("--page-archive", default="page_archive",
+                       help="Directory for the raw page archive ('' to disable)")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                       help="Serve Prometheus metrics on this port")
+    parser.add_argument("--browsers", type=int, default=2,
+                       help="Warm headless browsers kept for Selenium jobs")
+    add_profiling_arguments(parser)
+    add_logging_arguments(parser)
     
     args = parser.parse_args()
+    configure_logging(args.log_format)
+    
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
     
-    if args.mode == "schedule":
-        run_scheduler()
-    else:
-        run_once()
+    # kill -USR1 <pid> toggles profiling; kill -USR2 <pid> profiles the next job
+    with profiling_from_args(args, "scheduler"):
+        if args.mode == "schedule":
+            run_scheduler(archive_json=not args.no_archive, page_archive_dir=args.page_archive,
+                          browser_pool_size=args.browsers)
+        else:
+            run_once(archive_json=not args.no_archive, page_archive_dir=args.page_archive)
 
 if __name__ == "__main__":
     main()
@@ -4,62 +4,169 @@ Advanced Agricultural Product Scraper using Selenium
 For websites with dynamic content and JavaScript
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 import json
 import time
 import logging
-from typing import List, Dict
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 from agri_scraper import Product, AgriScraper
+from driver_pool import WebDriverPool, create_chrome_driver
+from api_capture import capture_product_api, read_performance_log, replay_endpoint
+from resource_blocking import ResourceBlocker
 import random
 
 logger = logging.getLogger(__name__)
 
+# Dynamic sites that need a real browser
+SELENIUM_SITES = {
+    "Krishi Jagran Shop": {
+        "base_url": "https://shop.krishijagran.com",
+        "categories": [
+            "/fertilizers",
+            "/seeds",
+            "/pesticides-insecticides"
+        ],
+        # Resource groups this site needs despite the blocking profile (see resource_blocking.py)
+        "allow_resources": []
+    }
+}
+
+# Product containers on dynamic listing pages
+PRODUCT_CONTAINERS = ".product-item, .product-card, [data-product-id]"
+
+# Selector cascades per field, tried in order inside each product container
+DYNAMIC_SELECTORS = {
+    "name": [".product-title", ".product-name", "h3", "h4", "[data-product-title]", ".title"],
+    "price": [".price", ".product-price", ".money", ".cost", "[data-price]", ".price-current"],
+    "original_price": [".price-original", ".was-price", ".strike", ".old-price"],
+    "brand": [".brand", ".manufacturer", "[data-brand]"],
+    "rating": [".rating", ".stars", "[data-rating]"],
+    "image": ["img", ".product-image img", ".image img"],
+    "link": ["a", ".product-link"]
+}
+
+# Evaluates every selector cascade for every container in the browser, in one round trip
+BATCH_EXTRACT_SCRIPT = """
+const [containerSelector, selectors] = arguments;
+const text = (root, cascade) => {
+    for (const selector of cascade) {
+        const el = root.querySelector(selector);
+        const value = el && (el.innerText || el.textContent || "").trim();
+        if (value) return value;
+    }
+    return "";
+};
+const attr = (root, cascade, names) => {
+    for (const selector of cascade) {
+        const el = root.querySelector(selector);
+        if (!el) continue;
+        for (const name of names) {
+            const value = el.getAttribute(name);
+            if (value) {
+                try { return new URL(value, document.baseURI).href; } catch (e) { return value; }
+            }
+        }
+    }
+    return "";
+};
+return Array.from(document.querySelectorAll(containerSelector), (item) => ({
+    name: text(item, selectors.name),
+    price: text(item, selectors.price),
+    original_price: text(item, selectors.original_price),
+    brand: text(item, selectors.brand),
+    rating: text(item, selectors.rating),
+    image: attr(item, selectors.image, ["src", "data-src"]),
+    link: attr(item, selectors.link, ["href"])
+}));
+"""
+
+# Counts in-flight fetch/XHR requests so scrolling can wait for the network to go quiet
+TRACK_REQUESTS_SCRIPT = """
+if (!window.__aginetRequests) {
+    window.__aginetRequests = {pending: 0};
+    const tracker = window.__aginetRequests;
+    const done = () => { tracker.pending = Math.max(0, tracker.pending - 1); };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            tracker.pending++;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        tracker.pending++;
+        this.addEventListener("loadend", done, {once: true});
+        return send.apply(this, arguments);
+    };
+}
+"""
+
+# Scrolls to the bottom and clicks a visible "Load More"/"Show More" button, if any
+# (links with an href are left alone, as clicking one would navigate away)
+SCROLL_SCRIPT = """
+window.scrollTo(0, document.body.scrollHeight);
+const button = Array.from(document.querySelectorAll("button, a:not([href])")).find((el) =>
+    /load more|show more/i.test(el.textContent || "") && el.offsetParent !== null && !el.disabled);
+if (button) button.click();
+return Boolean(button);
+"""
+
+# Product count and in-flight requests, polled while waiting for a scroll to pay off
+PAGE_STATE_SCRIPT = """
+const tracker = window.__aginetRequests;
+return {count: document.querySelectorAll(arguments[0]).length, pending: tracker ? tracker.pending : 0};
+"""
+
+def site_resource_blocker(profile: str = "lean") -> ResourceBlocker:
+    """A blocker for `profile` that honours each Selenium site's allow_resources"""
+    return ResourceBlocker(profile, allow={
+        name: site.get("allow_resources", []) for name, site in SELENIUM_SITES.items()
+    })
+
 class SeleniumAgriScraper(AgriScraper):
     """Advanced scraper using Selenium for dynamic content"""
     
-    def __init__(self, headless=True):
-        super().__init__()
+    def __init__(self, headless=True, base_urls: Dict[str, str] = None, pool: WebDriverPool = None,
+                 capture_network: bool = False, blocker: ResourceBlocker = None):
+        super().__init__(base_urls)
         self.driver = None
         self.headless = headless
-        self.setup_driver()
+        # Read products from the page's own JSON API when one shows up in the network log
+        self.capture_api = pool.capture_network if pool else capture_network
+        # Page through a discovered API over plain HTTP instead of scrolling the browser
+        self.replay_api = True
+        # Product API endpoint discovered for each category
+        self.api_endpoints = {}
+        # With a shared WebDriverPool, browsers are borrowed per category instead of owned
+        self.pool = pool
+        # 'batch' extracts a whole page in one execute_script; 'elements' walks WebElements
+        self.extraction = "batch"
+        # Infinite-scroll report of the last load of each category
+        self.scroll_reports = {}
+        # Fonts, stylesheets, media and trackers blocked through CDP before each page load
+        self.blocker = blocker or site_resource_blocker()
+        if pool is None:
+            self.setup_driver()
         
     def setup_driver(self):
         """Setup Chrome WebDriver with options"""
-        chrome_options = Options()
-        
-        if self.headless:
-            chrome_options.add_argument("--headless")
-            
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
-        
-        # Disable images and CSS for faster loading
-        prefs = {
-            "profile.managed_default_content_settings.images": 2,
-            "profile.default_content_setting_values.notifications": 2
-        }
-        chrome_options.add_experimental_option("prefs", prefs)
-        
         try:
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.implicitly_wait(10)
+            self.driver = create_chrome_driver(self.headless, capture_network=self.capture_api)
             logger.info("Chrome WebDriver initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize WebDriver: {e}")
             raise
             
-    def wait_for_element(self, by, value, timeout=10):
+    def wait_for_element(self, by, value, timeout=10, driver=None):
         """Wait for element to be present"""
         try:
-            element = WebDriverWait(self.driver, timeout).until(
+            element = WebDriverWait(driver or self.driver, timeout).until(
                 EC.presence_of_element_located((by, value))
             )
             return element
@@ -67,131 +174,275 @@ class SeleniumAgriScraper(AgriScraper):
             logger.warning(f"Element not found: {by}={value}")
             return None
             
-    def scroll_to_load_more(self, max_scrolls=5):
-        """Scroll down to load more products (for infinite scroll)"""
-        for i in range(max_scrolls):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+    def scroll_to_load_more(self, max_scrolls=100, driver=None, settle_timeout=5.0,
+                            idle_window=0.5, poll=0.1, patience=2) -> Dict:
+        """Scroll until the product count stops growing (for infinite scroll)
+        
+        After each scroll the page is polled until more products appear, or
+        the network has been idle for `idle_window` seconds with no new ones,
+        or `settle_timeout` passes. Requests already in flight before the
+        scroll (long polls, analytics beacons) do not count against idle. Loading stops after `patience` scrolls in
+        a row that add nothing, so short pages finish in about a second and
+        long pages are followed to the end.
+        """
+        driver = driver or self.driver
+        started = time.perf_counter()
+        driver.execute_script(TRACK_REQUESTS_SCRIPT)
+        state = driver.execute_script(PAGE_STATE_SCRIPT, PRODUCT_CONTAINERS)
+        count = initial = state["count"]
+        scrolls = productive = idle_scrolls = 0
+        
+        while scrolls < max_scrolls and idle_scrolls < patience:
+            clicked = driver.execute_script(SCROLL_SCRIPT)
+            scrolls += 1
+            before, background = count, state["pending"]
+            quiet_since = [None]
             
-            # Check if "Load More" button exists and click it
+            def settled(d):
+                state = d.execute_script(PAGE_STATE_SCRIPT, PRODUCT_CONTAINERS)
+                if state["count"] > before:
+                    return state  # Grew; later requests belong to the next scroll
+                if state["pending"] > background:
+                    quiet_since[0] = None
+                    return False
+                now = time.monotonic()
+                quiet_since[0] = quiet_since[0] or now
+                # A click may need a moment to start its request, so quiet must last a while
+                return state if now - quiet_since[0] >= idle_window * (2 if clicked else 1) else False
+                
             try:
-                load_more_btn = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Load More') or contains(text(), 'Show More')]")
-                if load_more_btn.is_displayed():
-                    load_more_btn.click()
-                    time.sleep(3)
-            except NoSuchElementException:
-                pass
+                state = WebDriverWait(driver, settle_timeout, poll_frequency=poll).until(settled)
+            except TimeoutException:
+                state = driver.execute_script(PAGE_STATE_SCRIPT, PRODUCT_CONTAINERS)
+            count = state["count"]
+                
+            if count > before:
+                productive += 1
+                idle_scrolls = 0
+            else:
+                idle_scrolls += 1
                 
-    def scrape_krishijagran_shop(self, max_pages=3) -> List[Product]:
+        report = {
+            "initial_items": initial,
+            "items": count,
+            "scrolls": scrolls,
+            "productive_scrolls": productive,
+            "scroll_efficiency": round(productive / scrolls, 2) if scrolls else None,
+            "items_per_scroll": round((count - initial) / scrolls, 1) if scrolls else None,
+            "seconds": round(time.perf_counter() - started, 2),
+            "stopped": "max_scrolls" if idle_scrolls < patience else "no_growth"
+        }
+        logger.info(f"📜 Loaded {count} products ({count - initial} by scrolling) in {scrolls} scrolls, "
+                    f"{productive} productive ({productive / max(scrolls, 1):.0%}), {report['seconds']}s")
+        return report
+        
+    def scrape_krishijagran_shop(self, max_pages=3, categories: List[str] = None, checkpoint=None) -> List[Product]:
         """Scrape Krishi Jagran Shop (example dynamic site)"""
         logger.info("Starting Krishi Jagran Shop scraping...")
-        products = []
+        results = self.scrape_krishijagran_categories(categories, checkpoint)
+        products = [product for category_products in results.values() if category_products
+                    for product in category_products]
+        logger.info(f"Krishi Jagran Shop scraping completed. Found {len(products)} products")
+        return products
         
-        base_url = "https://shop.krishijagran.com"
-        categories = [
-            "/fertilizers",
-            "/seeds",
-            "/pesticides-insecticides"
-        ]
+    def scrape_krishijagran_categories(self, categories: List[str] = None,
+                                       checkpoint=None) -> Dict[str, Optional[List[Product]]]:
+        """Products of each Krishi Jagran Shop category, None for categories that failed
         
+        With a pool the categories load in parallel, one per browser.
+        """
+        site = SELENIUM_SITES["Krishi Jagran Shop"]
+        base_url = self.base_urls.get("Krishi Jagran Shop", site["base_url"])
+        categories = categories or site["categories"]
+        by_category = {}
+        
+        # Categories finished by an interrupted earlier run come from the checkpoint
+        pending = []
         for category in categories:
-            try:
-                url = f"{base_url}{category}"
-                logger.info(f"Scraping: {url}")
-                
-                self.driver.get(url)
-                time.sleep(3)
-                
-                # Wait for products to load
-                self.wait_for_element(By.CLASS_NAME, "product-item", timeout=15)
-                
-                # Scroll to load more products
-                self.scroll_to_load_more()
-                
-                # Extract products
-                product_elements = self.driver.find_elements(By.CSS_SELECTOR, ".product-item, .product-card, [data-product-id]")
-                
-                for element in product_elements:
-                    try:
-                        product = self.extract_dynamic_product(element, base_url, category)
-                        if product:
-                            products.append(product)
-                    except Exception as e:
-                        logger.error(f"Error extracting product: {e}")
-                        continue
-                        
-                self.random_delay(2, 4)
+            if checkpoint and checkpoint.has_page("Krishi Jagran Shop", category, 1):
+                saved = checkpoint.page_products("Krishi Jagran Shop", category, 1)
+                by_category[category] = [Product(**record) for record in saved]
+            else:
+                pending.append(category)
                 
-            except Exception as e:
-                logger.error(f"Error scraping {url}: {e}")
-                continue
+        if self.pool and len(pending) > 1:
+            # One category per pooled browser at a time; results come back in category order
+            with ThreadPoolExecutor(max_workers=min(self.pool.size, len(pending)),
+                                    thread_name_prefix="selenium") as executor:
+                futures = [executor.submit(contextvars.copy_context().run, self.scrape_pooled_category,
+                                           base_url, category, "Krishi Jagran Shop")
+                           for category in pending]
+                results = [future.result() for future in futures]
+        else:
+            results = [self.scrape_pooled_category(base_url, category, "Krishi Jagran Shop") if self.pool
+                       else self.scrape_dynamic_category(self.driver, base_url, category, "Krishi Jagran Shop")
+                       for category in pending]
+            
+        for category, category_products in zip(pending, results):
+            by_category[category] = category_products
+            if checkpoint and category_products is not None:
+                checkpoint.record_page("Krishi Jagran Shop", category, 1, category_products)
                 
-        logger.info(f"Krishi Jagran Shop scraping completed. Found {len(products)} products")
-        return products
+        # In the order asked for, whether a category came from the checkpoint or the browser
+        return {category: by_category[category] for category in categories}
         
-    def extract_dynamic_product(self, element, base_url, category) -> Product:
-        """Extract product from dynamic element"""
+    def scrape_pooled_category(self, base_url: str, category: str, site: str = None) -> List[Product]:
+        """Scrape one category on a browser borrowed from the pool"""
         try:
-            # Product name
-            name_selectors = [
-                ".product-title", ".product-name", "h3", "h4", 
-                "[data-product-title]", ".title"
-            ]
-            name = self.find_text_by_selectors(element, name_selectors) or "Unknown Product"
-            
-            # Price
-            price_selectors = [
-                ".price", ".product-price", ".money", ".cost",
-                "[data-price]", ".price-current"
-            ]
-            price = self.find_text_by_selectors(element, price_selectors) or "0"
-            price = self.extract_price(price)
+            with self.pool.driver() as pooled:
+                products = self.scrape_dynamic_category(pooled.driver, base_url, category, site)
+                pooled.record_page()
+                return products
+        except Exception as e:
+            logger.error(f"Error scraping {base_url}{category}: {e}")
+            return None
             
-            # Original price
-            original_price_selectors = [
-                ".price-original", ".was-price", ".strike", ".old-price"
-            ]
-            original_price = self.find_text_by_selectors(element, original_price_selectors)
-            original_price = self.extract_price(original_price) if original_price else None
+    def scrape_dynamic_category(self, driver, base_url: str, category: str, site: str = None) -> List[Product]:
+        """Load, scroll and extract one category page; None if the page failed"""
+        url = f"{base_url}{category}"
+        try:
+            logger.info(f"Scraping: {url}")
             
-            # Image
-            img_selectors = ["img", ".product-image img", ".image img"]
-            image_url = self.find_image_by_selectors(element, img_selectors, base_url)
+            self.blocker.apply(driver, site)
+            driver.get(url)
             
-            # Product URL
-            link_selectors = ["a", ".product-link"]
-            product_url = self.find_link_by_selectors(element, link_selectors, base_url)
+            # Wait for the first products to render
+            self.wait_for_element(By.CSS_SELECTOR, PRODUCT_CONTAINERS, timeout=15, driver=driver)
             
-            # Brand
-            brand_selectors = [".brand", ".manufacturer", "[data-brand]"]
-            brand = self.find_text_by_selectors(element, brand_selectors) or ""
+            # The JSON behind the page, when there is one, beats rendering and scraping it
+            if self.capture_api:
+                messages = read_performance_log(driver)
+                self.blocker.record(messages)
+                api_products = self.extract_from_api(driver, messages, base_url, category)
+                if api_products is not None:
+                    self.random_delay(2, 4)
+                    return api_products
+                    
+            # Scroll until no more products appear
+            self.scroll_reports[category] = self.scroll_to_load_more(driver=driver)
+            if self.capture_api:
+                self.blocker.record(read_performance_log(driver), new_page=False)
             
-            # Rating
-            rating_selectors = [".rating", ".stars", "[data-rating]"]
-            rating_text = self.find_text_by_selectors(element, rating_selectors)
-            rating = self.extract_rating(rating_text) if rating_text else None
+            # Extract products
+            started = time.perf_counter()
+            if self.extraction == "batch":
+                category_products = self.extract_page_batch(driver, base_url, category)
+            else:
+                category_products = self.extract_page_elements(driver, base_url, category)
+            logger.info(f"Extracted {len(category_products)} products from {url} "
+                        f"in {(time.perf_counter() - started) * 1000:.0f}ms ({self.extraction})")
+                    
+            self.random_delay(2, 4)
+            return category_products
             
-            category_name = category.split('/')[-1].replace('-', ' ').title()
+        except Exception as e:
+            if self.pool:
+                raise  # Lets the pool retire a browser that broke mid-page; logged by the caller
+            logger.error(f"Error scraping {url}: {e}")
+            return None
+        
+    def extract_from_api(self, driver, messages: List[Dict], base_url: str, category: str) -> List[Product]:
+        """Products from the listing API the page called; None if it called none"""
+        captured = capture_product_api(driver, messages)
+        if captured is None:
+            logger.info(f"No product API seen for {category}, extracting from the DOM")
+            return None
             
-            return Product(
-                name=self.clean_text(name),
-                price=price,
-                original_price=original_price,
-                image_url=image_url,
-                description="",
-                category=category_name,
-                brand=self.clean_text(brand),
-                availability="Available",
-                rating=rating,
-                reviews_count=None,
-                source_url=product_url,
-                source_site="Krishi Jagran Shop"
+        endpoint, records = captured
+        self.api_endpoints[category] = endpoint.url
+        if self.replay_api and endpoint.replayable:
+            # Same cookies as the browser, so session-bound endpoints answer the same way
+            for cookie in driver.get_cookies():
+                self.session.cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"))
+            try:
+                records += replay_endpoint(self.session, endpoint, len(records))
+            except Exception as e:
+                logger.warning(f"⚠️ API replay failed for {category}, keeping the first page: {e}")
+                
+        return self.products_from_records(records, base_url, category)
+        
+    def extract_page_batch(self, driver, base_url: str, category: str) -> List[Product]:
+        """Extract every product on the page with a single execute_script round trip"""
+        records = driver.execute_script(BATCH_EXTRACT_SCRIPT, PRODUCT_CONTAINERS, DYNAMIC_SELECTORS) or []
+        return self.products_from_records(records, base_url, category)
+        
+    def products_from_records(self, records: List[Dict], base_url: str, category: str) -> List[Product]:
+        """Products from raw field records (batch extraction or a captured API)"""
+        products = []
+        for record in records:
+            try:
+                products.append(self.build_dynamic_product(
+                    name=record.get("name"),
+                    price=record.get("price"),
+                    original_price=record.get("original_price"),
+                    image_url=self.absolute_url(record.get("image"), base_url),
+                    product_url=self.absolute_url(record.get("link"), base_url),
+                    brand=record.get("brand"),
+                    rating_text=record.get("rating"),
+                    category=category
+                ))
+            except Exception as e:
+                logger.error(f"Error extracting product: {e}")
+        return products
+        
+    def extract_page_elements(self, driver, base_url: str, category: str) -> List[Product]:
+        """Extract products one WebElement lookup at a time (slow; kept for comparison)"""
+        product_elements = driver.find_elements(By.CSS_SELECTOR, PRODUCT_CONTAINERS)
+        
+        products = []
+        for element in product_elements:
+            try:
+                product = self.extract_dynamic_product(element, base_url, category)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                logger.error(f"Error extracting product: {e}")
+                continue
+        return products
+        
+    def extract_dynamic_product(self, element, base_url, category) -> Product:
+        """Extract product from dynamic element"""
+        try:
+            return self.build_dynamic_product(
+                name=self.find_text_by_selectors(element, DYNAMIC_SELECTORS["name"]),
+                price=self.find_text_by_selectors(element, DYNAMIC_SELECTORS["price"]),
+                original_price=self.find_text_by_selectors(element, DYNAMIC_SELECTORS["original_price"]),
+                image_url=self.find_image_by_selectors(element, DYNAMIC_SELECTORS["image"], base_url),
+                product_url=self.find_link_by_selectors(element, DYNAMIC_SELECTORS["link"], base_url),
+                brand=self.find_text_by_selectors(element, DYNAMIC_SELECTORS["brand"]),
+                rating_text=self.find_text_by_selectors(element, DYNAMIC_SELECTORS["rating"]),
+                category=category
             )
             
         except Exception as e:
             logger.error(f"Error extracting dynamic product: {e}")
             return None
             
+    def build_dynamic_product(self, name, price, original_price, image_url, product_url,
+                              brand, rating_text, category) -> Product:
+        """Normalize raw field text from either extraction mode into a Product"""
+        category_name = category.split('/')[-1].replace('-', ' ').title()
+        
+        return Product(
+            name=self.clean_text(name or "Unknown Product"),
+            price=self.extract_price(price or "0"),
+            original_price=self.extract_price(original_price) if original_price else None,
+            image_url=image_url,
+            description="",
+            category=category_name,
+            brand=self.clean_text(brand or ""),
+            availability="Available",
+            rating=self.extract_rating(rating_text) if rating_text else None,
+            reviews_count=None,
+            source_url=product_url,
+            source_site="Krishi Jagran Shop"
+        )
+        
+    def absolute_url(self, url: str, base_url: str) -> str:
+        if not url or url.startswith('http'):
+            return url or ""
+        return base_url + url if url.startswith('/') else base_url + '/' + url
+            
     def find_text_by_selectors(self, element, selectors: List[str]) -> str:
         """Find text using multiple CSS selectors"""
         for selector in selectors:
@@ -211,9 +462,7 @@ class SeleniumAgriScraper(AgriScraper):
                 img_element = element.find_element(By.CSS_SELECTOR, selector)
                 img_url = img_element.get_attribute('src') or img_element.get_attribute('data-src')
                 if img_url:
-                    if not img_url.startswith('http'):
-                        img_url = base_url + img_url if img_url.startswith('/') else base_url + '/' + img_url
-                    return img_url
+                    return self.absolute_url(img_url, base_url)
             except NoSuchElementException:
                 continue
         return ""
@@ -225,9 +474,7 @@ class SeleniumAgriScraper(AgriScraper):
                 link_element = element.find_element(By.CSS_SELECTOR, selector)
                 link_url = link_element.get_attribute('href')
                 if link_url:
-                    if not link_url.startswith('http'):
-                        link_url = base_url + link_url if link_url.startswith('/') else base_url + '/' + link_url
-                    return link_url
+                    return self.absolute_url(link_url, base_url)
             except NoSuchElementException:
                 continue
         return ""
@@ -243,8 +490,8 @@ class SeleniumAgriScraper(AgriScraper):
             return min(rating, 5.0)  # Cap at 5.0
         return None
         
-    def scrape_with_selenium(self, sites: List[str] = None) -> List[Product]:
-        """Scrape multiple sites using Selenium"""
+    def scrape_with_selenium(self, sites: List[str] = None, checkpoint=None) -> List[Product]:
+        """Scrape multiple sites using Selenium (resumable with a CrawlCheckpoint)"""
         all_products = []
         
         if not sites:
@@ -253,7 +500,7 @@ class SeleniumAgriScraper(AgriScraper):
         for site in sites:
             try:
                 if site == "krishijagran":
-                    products = self.scrape_krishijagran_shop()
+                    products = self.scrape_krishijagran_shop(checkpoint=checkpoint)
                     all_products.extend(products)
                 # Add more sites here
                     
@@ -264,9 +511,10 @@ class SeleniumAgriScraper(AgriScraper):
         return self.remove_duplicates(all_products)
         
     def close(self):
-        """Close the WebDriver"""
+        """Close the WebDriver (pooled browsers stay with their pool)"""
         if self.driver:
             self.driver.quit()
+            self.driver = None
             logger.info("WebDriver closed")
             
     def __del__(self):
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+Synthetic Agri-Site Stand-in Server for AgiNet
+Serves BigHaat/AgroStar-shaped listing pages and a JS-rendered shop for any number of synthetic products
+"""
+
+import json
+import time
+import random
+import hashlib
+import logging
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+# URL prefix of each stand-in site; point a scraper at http://host:port<prefix>
+SITE_PREFIXES = {
+    "BigHaat": "/bighaat",
+    "AgroStar": "/agrostar",
+    "Krishi Jagran Shop": "/krishijagran"
+}
+
+BRANDS = ["IFFCO", "Coromandel", "Tata Rallis", "UPL", "Bayer", "Syngenta", "Dhanuka", "Mahindra",
+          "Nuziveedu", "Advanta", "Chambal", "Deepak", "PI Industries", "Godrej Agrovet", "Kribhco"]
+PRODUCT_TYPES = {
+    "fertilizers": ["Urea", "DAP", "NPK 19:19:19", "Potash", "Zinc Sulphate", "Calcium Nitrate", "Vermicompost"],
+    "seeds": ["Hybrid Tomato Seeds", "Paddy Seeds", "Cotton Seeds", "Maize Seeds", "Chilli Seeds", "Onion Seeds"],
+    "pesticides": ["Imidacloprid", "Chlorpyrifos", "Mancozeb", "Glyphosate", "Neem Oil", "Cypermethrin"],
+    "implements": ["Knapsack Sprayer", "Hand Weeder", "Drip Kit", "Pruning Shears", "Seed Drill", "Soil Tester"]
+}
+PACK_SIZES = ["100 g", "250 g", "500 g", "1 kg", "5 kg", "25 kg", "50 kg", "250 ml", "1 L", "5 L"]
+
+
+class SyntheticCatalog:
+    """Deterministic products generated on demand, so memory stays flat at any catalog size"""
+
+    def __init__(self, total_products: int = 10000, page_size: int = 24, seed: int = 42):
+        from agri_scraper import SITES
+        from selenium_scraper import SELENIUM_SITES
+
+        self.page_size = page_size
+        self.seed = seed
+        self.categories = {site: config["categories"] for site, config in SITES.items()}
+        self.categories.update({site: config["categories"] for site, config in SELENIUM_SITES.items()})
+
+        # Products are split evenly over every (site, category)
+        slots = sum(len(categories) for categories in self.categories.values())
+        self.per_category = max(1, total_products // slots)
+        self.total_products = self.per_category * slots
+
+    def product_type(self, category: str) -> List[str]:
+        for key, names in PRODUCT_TYPES.items():
+            if key in category or (key == "pesticides" and "protection" in category):
+                return names
+        return PRODUCT_TYPES["implements"]
+
+    def product(self, site: str, category: str, index: int) -> Dict:
+        digest = hashlib.blake2b(f"{self.seed}:{site}:{category}:{index}".encode(), digest_size=8).digest()
+        rng = random.Random(int.from_bytes(digest, "big"))
+
+        brand = rng.choice(BRANDS)
+        price = rng.randrange(50, 25000)
+        discounted = rng.random() < 0.4
+        product_id = f"{SITE_PREFIXES[site].strip('/')}-{category.strip('/').replace('/', '-')}-{index}"
+        return {
+            "id": product_id,
+            "name": f"{brand} {rng.choice(self.product_type(category))} {rng.choice(PACK_SIZES)} (Lot {index})",
+            "price": price,
+            "original_price": int(price * rng.uniform(1.1, 1.6)) if discounted else None,
+            "brand": brand,
+            "rating": round(rng.uniform(3.0, 5.0), 1) if rng.random() < 0.7 else None,
+            "reviews": rng.randrange(0, 2000),
+            "image": f"/static/img/{product_id}.jpg",
+            "url": f"{SITE_PREFIXES[site]}/products/{product_id}"
+        }
+
+    def products(self, site: str, category: str, offset: int, limit: int) -> List[Dict]:
+        end = min(offset + limit, self.per_category)
+        return [self.product(site, category, index) for index in range(max(offset, 0), end)]
+
+    def page(self, site: str, category: str, page: int) -> List[Dict]:
+        return self.products(site, category, (page - 1) * self.page_size, self.page_size)
+
+
+def format_rupees(amount: int) -> str:
+    return f"₹ {amount:,}"
+
+
+def render_bighaat(products: List[Dict], category: str) -> str:
+    cards = "".join(f'''
+      <div class="product-card" data-product-id="{p['id']}">
+        <a class="card-link" href="{p['url']}"><img src="{p['image']}" alt="{p['name']}"></a>
+        <h3 class="product-title">{p['name']}</h3>
+        <span class="money">{format_rupees(p['price'])}</span>
+        {f'<span class="strike">{format_rupees(p["original_price"])}</span>' if p['original_price'] else ''}
+        <div class="vendor">{p['brand']}</div>
+      </div>''' for p in products)
+    return f'''<!DOCTYPE html>
+<html><head><title>{category} | BigHaat</title></head>
+<body><main class="collection">{cards}
+</main></body></html>'''
+
+
+def render_agrostar(products: List[Dict], category: str) -> str:
+    cards = "".join(f'''
+      <article class="card" data-sku="{p['id']}">
+        <a href="{p['url']}"><img data-src="{p['image']}" alt=""></a>
+        <h4 class="name">{p['name']}</h4>
+        <span class="rupee">{format_rupees(p['price'])}</span>
+      </article>''' for p in products)
+    return f'''<!DOCTYPE html>
+<html><head><title>{category} | AgroStar</title></head>
+<body><section class="listing">{cards}
+</section></body></html>'''
+
+
+def render_js_shop(prefix: str, category: str, page_size: int) -> str:
+    """Empty shell whose products are fetched from the JSON API and rendered on scroll"""
+    return f'''<!DOCTYPE html>
+<html><head><title>{category} | Krishi Jagran Shop</title></head>
+<body>
+<div id="products" class="product-grid"></div>
+<div id="sentinel" style="height: 1px"></div>
+<script>
+let offset = 0, loading = false, done = false;
+const grid = document.getElementById("products");
+function render(p) {{
+  const el = document.createElement("div");
+  el.className = "product-item";
+  el.dataset.productId = p.id;
+  el.innerHTML = `<a href="${{p.url}}"><img src="${{p.image}}"></a>
+    <h3 class="product-title">${{p.name}}</h3>
+    <span class="price">₹ ${{p.price.toLocaleString("en-IN")}}</span>
+    ${{p.original_price ? `<span class="price-original">₹ ${{p.original_price.toLocaleString("en-IN")}}</span>` : ""}}
+    <div class="brand">${{p.brand}}</div>
+    ${{p.rating ? `<div class="rating">${{p.rating}}</div>` : ""}}
+    <div style="height: 180px"></div>`;
+  grid.appendChild(el);
+}}
+async function loadMore() {{
+  if (loading || done) return;
+  loading = true;
+  const response = await fetch(`{prefix}/api/products?category={category}&offset=${{offset}}&limit={page_size}`);
+  const data = await response.json();
+  data.products.forEach(render);
+  offset += data.products.length;
+  done = !data.has_more;
+  loading = false;
+}}
+new IntersectionObserver(entries => {{
+  if (entries.some(e => e.isIntersecting)) loadMore();
+}}).observe(document.getElementById("sentinel"));
+loadMore();
+</script>
+</body></html>'''
+
+
+class FaultInjector:
+    """Latency, random errors, random throttling and a token-bucket rate limit"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, rate_limit: float = 0.0, seed: int = 42):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.rate_limit = rate_limit  # Requests/second before 429s; 0 disables
+        self.random = random.Random(seed)
+        self.tokens = rate_limit
+        self.refilled_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self.lock:
+            jitter = self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        return max(0.0, self.latency + jitter)
+
+    def fault(self) -> Optional[int]:
+        """Status code to fail this request with, if any"""
+        with self.lock:
+            if self.rate_limit:
+                now = time.monotonic()
+                self.tokens = min(self.rate_limit, self.tokens + (now - self.refilled_at) * self.rate_limit)
+                self.refilled_at = now
+                if self.tokens < 1:
+                    return 429
+                self.tokens -= 1
+            roll = self.random.random()
+        if roll < self.throttle_rate:
+            return 429
+        if roll < self.throttle_rate + self.error_rate:
+            return 503 if roll < self.throttle_rate + self.error_rate / 2 else 500
+        return None
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """Routes /<site-prefix>/<category>?page=N, the JSON API, /stats and /health"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "AgiNetStandin/1.0"
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def send_body(self, status: int, body: str, content_type: str = "text/html; charset=utf-8",
+                  headers: Dict[str, str] = None):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.stats[status] += 1
+
+    def route(self, path: str) -> Optional[Tuple[str, str]]:
+        """(site, category) for a listing path"""
+        for site, prefix in SITE_PREFIXES.items():
+            if path.startswith(prefix + "/"):
+                category = path[len(prefix):]
+                if category in self.server.catalog.categories[site]:
+                    return site, category
+        return None
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        server = self.server
+
+        if parts.path == "/health":
+            return self.send_body(200, '{"status": "ok"}', "application/json")
+        if parts.path == "/stats":
+            return self.send_body(200, json.dumps(server.get_stats()), "application/json")
+
+        delay = server.faults.delay()
+        if delay:
+            time.sleep(delay)
+        status = server.faults.fault()
+        if status == 429:
+            return self.send_body(429, "Too Many Requests", "text/plain", {"Retry-After": "1"})
+        if status:
+            return self.send_body(status, "Server Error", "text/plain")
+
+        catalog = server.catalog
+        if parts.path == SITE_PREFIXES["Krishi Jagran Shop"] + "/api/products":
+            category = query.get("category", [""])[0]
+            if category not in catalog.categories["Krishi Jagran Shop"]:
+                return self.send_body(404, '{"error": "unknown category"}', "application/json")
+            offset = int(query.get("offset", ["0"])[0])
+            limit = min(int(query.get("limit", [str(catalog.page_size)])[0]), 100)
+            products = catalog.products("Krishi Jagran Shop", category, offset, limit)
+            body = {"products": products, "offset": offset, "total": catalog.per_category,
+                    "has_more": offset + len(products) < catalog.per_category}
+            return self.send_body(200, json.dumps(body), "application/json")
+
+        target = self.route(parts.path)
+        if target is None:
+            return self.send_body(404, "Not Found", "text/plain")
+
+        site, category = target
+        if site == "Krishi Jagran Shop":
+            return self.send_body(200, render_js_shop(SITE_PREFIXES[site], category, catalog.page_size))
+
+        page = int(query.get("page", ["1"])[0])
+        products = catalog.page(site, category, page)
+        render = render_bighaat if site == "BigHaat" else render_agrostar
+        self.send_body(200, render(products, category))
+
+
+class StandinServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding the catalog, fault settings and response counters"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, address: Tuple[str, int], catalog: SyntheticCatalog, faults: FaultInjector):
+        super().__init__(address, StandinRequestHandler)
+        self.catalog = catalog
+        self.faults = faults
+        self.stats = Counter()
+        self.started_at = time.time()
+
+    def base_urls(self) -> Dict[str, str]:
+        """Base URL overrides that point each scraper site at this server"""
+        host, port = self.server_address[:2]
+        return {site: f"http://{host}:{port}{prefix}" for site, prefix in SITE_PREFIXES.items()}
+
+    def get_stats(self) -> Dict:
+        uptime = time.time() - self.started_at
+        total = sum(self.stats.values())
+        return {
+            "products": self.catalog.total_products,
+            "products_per_category": self.catalog.per_category,
+            "requests": total,
+            "requests_per_second": round(total / uptime, 1) if uptime else 0.0,
+            "responses": {str(status): count for status, count in sorted(self.stats.items())}
+        }
+
+
+def start_standin(host: str = "127.0.0.1", port: int = 0, **settings) -> StandinServer:
+    """Start a stand-in in a background thread (port 0 picks a free port)"""
+    catalog = SyntheticCatalog(settings.pop("products", 10000), settings.pop("page_size", 24),
+                               settings.get("seed", 42))
+    server = StandinServer((host, port), catalog, FaultInjector(**settings))
+    threading.Thread(target=server.serve_forever, name="standin-server", daemon=True).start()
+    return server
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AgiNet synthetic agri-site stand-in server")
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    parser.add_argument("--port", type=int, default=8090, help="Bind port")
+    parser.add_argument("--products", type=int, default=100000, help="Total synthetic products across all sites")
+    parser.add_argument("--page-size", type=int, default=24, help="Products per listing page")
+    parser.add_argument("--latency", type=float, default=0.0, help="Response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random +/- latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 500/503")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered 429")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second before 429s (0 = off)")
+    parser.add_argument("--seed", type=int, default=42, help="Catalog and fault seed")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    catalog = SyntheticCatalog(args.products, args.page_size, args.seed)
+    faults = FaultInjector(args.latency, args.jitter, args.error_rate, args.throttle_rate, args.rate_limit, args.seed)
+    server = StandinServer((args.host, args.port), catalog, faults)
+
+    logger.info(f"🧪 Stand-in serving {catalog.total_products:,} products "
+                f"({catalog.per_category:,} per category, {catalog.page_size} per page)")
+    for site, url in server.base_urls().items():
+        logger.info(f"   {site}: {url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("🛑 Stand-in stopped")
+    finally:
+        logger.info(f"📊 {server.get_stats()}")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
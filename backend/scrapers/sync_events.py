@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Sync Event Sources for AgiNet
+Watches the scrape drop directory and the database so auto-sync runs only when something changed
+"""
+
+import os
+import queue
+import select
+import sqlite3
+import struct
+import threading
+import time
+import ctypes
+import ctypes.util
+import logging
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# inotify constants from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+@dataclass
+class SyncEvent:
+    """A reason to run a sync"""
+    kind: str  # "file", "db" or "signal"
+    path: Optional[str] = None
+    detail: Optional[str] = None
+    at: float = field(default_factory=time.time)
+
+
+class SyncTrigger:
+    """Collects sync events and hands them out in debounced batches"""
+
+    def __init__(self):
+        self.events = queue.Queue()
+
+    def signal(self, kind: str = "signal", path: str = None, detail: str = None):
+        """Request a sync; safe to call from any thread"""
+        self.events.put(SyncEvent(kind, path, detail))
+
+    def wait_batch(self, debounce: float = 2.0, max_delay: float = 30.0,
+                   timeout: float = None) -> List[SyncEvent]:
+        """Block until an event arrives, then gather the burst until it goes quiet"""
+        try:
+            batch = [self.events.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+
+        deadline = time.monotonic() + max_delay
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.events.get(timeout=min(debounce, remaining)))
+            except queue.Empty:
+                break
+        return batch
+
+
+class DropDirectoryWatcher(threading.Thread):
+    """Emits a file event whenever a finished scrape file lands in the drop directory"""
+
+    def __init__(self, directory: str, trigger: SyncTrigger, pattern: str = "*.json",
+                 poll_interval: float = 2.0):
+        super().__init__(name="drop-dir-watcher", daemon=True)
+        self.directory = directory
+        self.trigger = trigger
+        self.pattern = pattern
+        self.poll_interval = poll_interval
+        self.stop_event = threading.Event()
+        self.wake_read, self.wake_write = os.pipe()
+
+    def stop(self, timeout: float = 5.0):
+        self.stop_event.set()
+        os.write(self.wake_write, b"x")
+        self.join(timeout)
+        os.close(self.wake_read)
+        os.close(self.wake_write)
+
+    def run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        fd = self.inotify_watch()
+        try:
+            if fd is not None:
+                logger.info(f"👀 Watching {self.directory} with inotify")
+                self.run_inotify(fd)
+            else:
+                logger.info(f"👀 Polling {self.directory} every {self.poll_interval}s")
+                self.run_polling()
+        except Exception as e:
+            logger.error(f"Drop directory watcher failed: {e}")
+        finally:
+            if fd is not None:
+                os.close(fd)
+
+    def inotify_watch(self) -> Optional[int]:
+        """Set up an inotify watch, or return None where inotify is unavailable"""
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            return None
+        try:
+            libc = ctypes.CDLL(libc_name, use_errno=True)
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return None
+            wd = libc.inotify_add_watch(fd, os.fsencode(self.directory), IN_CLOSE_WRITE | IN_MOVED_TO)
+            if wd < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (AttributeError, OSError):
+            return None
+
+    def emit(self, name: str):
+        if fnmatch(name, self.pattern):
+            self.trigger.signal("file", os.path.join(self.directory, name))
+
+    def run_inotify(self, fd: int):
+        # Blocks without waking up until a file lands or stop() is called
+        while not self.stop_event.is_set():
+            readable, _, _ = select.select([fd, self.wake_read], [], [])
+            if fd not in readable:
+                continue
+
+            data = os.read(fd, 65536)
+            offset = 0
+            while offset < len(data):
+                _, _, _, name_len = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = data[offset:offset + name_len].rstrip(b"\0").decode(errors="replace")
+                offset += name_len
+                self.emit(name)
+
+    def run_polling(self):
+        seen = self.snapshot()
+        while not self.stop_event.wait(self.poll_interval):
+            current = self.snapshot()
+            for name, signature in current.items():
+                if seen.get(name) != signature:
+                    self.emit(name)
+            seen = current
+
+    def snapshot(self):
+        result = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    stat = entry.stat()
+                    result[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return result
+
+
+class DataVersionWatcher(threading.Thread):
+    """Emits a db event when another connection commits to the database"""
+
+    def __init__(self, db_path: str, trigger: SyncTrigger, interval: float = 1.0):
+        super().__init__(name="data-version-watcher", daemon=True)
+        self.trigger = trigger
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.last_version = self.current_version()
+
+    def current_version(self) -> int:
+        """PRAGMA data_version is a header read, cheap enough to poll"""
+        with self.lock:
+            return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def stop(self):
+        self.stop_event.set()
+
+    def run(self):
+        try:
+            while not self.stop_event.wait(self.interval):
+                version = self.current_version()
+                if version != self.last_version:
+                    self.last_version = version
+                    self.trigger.signal("db", detail=f"data_version={version}")
+        except Exception as e:
+            logger.error(f"Data version watcher failed: {e}")
+        finally:
+            with self.lock:
+                self.conn.close()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Staged Pipeline for AgiNet
+Runs sync steps as threads joined by bounded queues so consecutive cycles overlap
+"""
+
+import queue
+import threading
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from tracing import new_run_id, run_context, span
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the input stream
+END_OF_STREAM = object()
+
+
+@dataclass
+class PipelineItem:
+    """One cycle travelling through the pipeline"""
+    cycle: int
+    payload: Any
+    started_at: float = field(default_factory=time.perf_counter)
+    timings: Dict[str, float] = field(default_factory=dict)
+    run_id: str = field(default_factory=new_run_id)
+
+
+class StageStats:
+    """Running timing figures for one stage"""
+
+    def __init__(self, window: int = 100):
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.recent = deque(maxlen=window)
+        self.max_seconds = 0.0
+        self.blocked_seconds = 0.0  # Time spent waiting on a full downstream queue
+
+    def record(self, seconds: float):
+        self.recent.append(seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def to_dict(self) -> Dict:
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "avg_ms": round(sum(self.recent) / len(self.recent) * 1000, 2) if self.recent else 0.0,
+            "last_ms": round(self.recent[-1] * 1000, 2) if self.recent else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "blocked_ms": round(self.blocked_seconds * 1000, 2)
+        }
+
+
+class StagedPipeline:
+    """Source plus worker stages, one thread each, connected by bounded queues
+
+    A stage function takes the payload and returns the payload for the next
+    stage; returning None (or raising) drops that cycle without stopping the
+    pipeline.
+    """
+
+    def __init__(self, stages: List[Tuple[str, Callable[[Any], Any]]], queue_size: int = 1):
+        self.stages = stages
+        self.queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self.stats = {name: StageStats() for name, _ in [("source", None)] + stages}
+        self.cancel_event = threading.Event()
+        self.threads = []
+        self.completed = 0
+        self.latencies = deque(maxlen=100)
+        self.on_complete = None  # Optional callback(item) after the last stage
+        self.on_drop = None  # Optional callback(item, stage_name) when a stage drops a cycle
+
+    def cancel(self):
+        """Stop all stages; in-flight cycles are abandoned"""
+        self.cancel_event.set()
+
+    def put(self, q: queue.Queue, item, stats: StageStats) -> bool:
+        """Blocking put that gives up on cancellation (backpressure point)"""
+        start = time.perf_counter()
+        while not self.cancel_event.is_set():
+            try:
+                q.put(item, timeout=0.2)
+                stats.blocked_seconds += time.perf_counter() - start
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(self, q: queue.Queue):
+        while not self.cancel_event.is_set():
+            try:
+                return q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+        return END_OF_STREAM
+
+    def run_source(self, source: Iterable):
+        stats = self.stats["source"]
+        iterator = iter(source)
+        cycle = 0
+        try:
+            while not self.cancel_event.is_set():
+                # The source may pace itself, so its time is not counted as cycle latency
+                try:
+                    payload = next(iterator)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    stats.failed += 1
+                    logger.error(f"❌ Pipeline source failed: {e}")
+                    continue
+
+                cycle += 1
+                if payload is None:
+                    stats.dropped += 1
+                    continue
+
+                stats.processed += 1
+                if not self.put(self.queues[0], PipelineItem(cycle, payload), stats):
+                    break
+        finally:
+            self.put(self.queues[0], END_OF_STREAM, stats)
+
+    def run_stage(self, index: int):
+        name, func = self.stages[index]
+        stats = self.stats[name]
+        inbox = self.queues[index]
+        outbox = self.queues[index + 1] if index + 1 < len(self.queues) else None
+
+        while True:
+            item = self.get(inbox)
+            if item is END_OF_STREAM:
+                if outbox is not None:
+                    self.put(outbox, END_OF_STREAM, stats)
+                return
+
+            started = time.perf_counter()
+            if index == 0:
+                # Latency counts from when work starts, not from when the tick was queued
+                item.started_at = started
+            try:
+                # Each cycle is its own run, whichever stage thread it is on
+                with run_context(item.run_id), span(f"stage:{name}", cycle=item.cycle):
+                    result = func(item.payload)
+            except Exception as e:
+                result = None
+                stats.failed += 1
+                logger.error(f"❌ Pipeline stage '{name}' failed on cycle {item.cycle}: {e}")
+
+            elapsed = time.perf_counter() - started
+            stats.record(elapsed)
+            item.timings[name] = elapsed
+
+            if result is None:
+                stats.dropped += 1
+                if self.on_drop:
+                    self.on_drop(item, name)
+                continue
+
+            stats.processed += 1
+            item.payload = result
+            if outbox is not None:
+                self.put(outbox, item, stats)
+            else:
+                self.finish(item)
+
+    def finish(self, item: PipelineItem):
+        latency = time.perf_counter() - item.started_at
+        self.completed += 1
+        self.latencies.append(latency)
+        stages = ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in item.timings.items())
+        with run_context(item.run_id):
+            logger.info(f"✅ Pipeline cycle {item.cycle} completed in {latency:.2f}s ({stages})")
+            if self.on_complete:
+                self.on_complete(item)
+
+    def start(self, source: Iterable):
+        self.threads = [threading.Thread(target=self.run_source, args=(source,),
+                                         name="pipeline-source", daemon=True)]
+        for index, (name, _) in enumerate(self.stages):
+            self.threads.append(threading.Thread(target=self.run_stage, args=(index,),
+                                                 name=f"pipeline-{name}", daemon=True))
+        for thread in self.threads:
+            thread.start()
+
+    def join(self, timeout: Optional[float] = None):
+        for thread in self.threads:
+            thread.join(timeout)
+
+    def run(self, source: Iterable):
+        """Run until the source is exhausted or the pipeline is cancelled"""
+        self.start(source)
+        try:
+            while any(thread.is_alive() for thread in self.threads):
+                self.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.cancel()
+            self.join(timeout=5)
+            raise
+
+    def get_stats(self) -> Dict:
+        return {
+            "cycles_completed": self.completed,
+            "avg_cycle_latency_ms": round(sum(self.latencies) / len(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            "queue_depths": {name: q.qsize() for (name, _), q in zip(self.stages, self.queues)},
+            "stages": {name: stats.to_dict() for name, stats in self.stats.items()}
+        }
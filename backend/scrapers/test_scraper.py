@@ -7,7 +7,7 @@ Demonstrates scraping functionality with sample data
 import json
 import time
 from agri_scraper import AgriScraper
-from data_integrator import AgiNetDataIntegrator
+from data_integrator import AgrokartDataIntegrator
 
 def test_basic_scraping():
     """Test basic scraping functionality"""
@@ -42,7 +42,7 @@ def test_data_integration(json_file):
     """Test database integration"""
     print("\n🔄 Testing Data Integration...")
     
-    integrator = AgiNetDataIntegrator("test_database.db")
+    integrator = AgrokartDataIntegrator("test_database.db")
     
     # Show initial stats
     initial_stats = integrator.get_database_stats()
@@ -96,14 +96,16 @@ def test_json_structure(json_file):
         print(f"❌ JSON structure test failed: {e}")
         return False
 
-def performance_test():
+def performance_test(large=False):
     """Test scraping performance"""
     print("\n⚡ Performance Test...")
     
     scraper = AgriScraper()
     
-    # Test different data sizes
+    # Test different data sizes; large ones go past the built-in names to the catalog generator
     sizes = [10, 50, 100]
+    if large:
+        sizes += [10000, 100000]
     
     for size in sizes:
         start_time = time.time()
@@ -119,6 +121,343 @@ def performance_test():
         print(f"   Save: {save_time:.3f}s")
         print(f"   Rate: {size/generation_time:.1f} products/sec")
 
+def test_replay_crawl():
+    """Test the real scrape paths against responses recorded from the stand-in"""
+    import os
+    import tempfile
+    from http_replay import benchmark, record_crawl
+    from standin_server import start_standin
+    
+    print("\n📼 Replay Crawl Test...")
+    
+    with tempfile.TemporaryDirectory(prefix="aginet_replay_") as tmp_dir:
+        cassette_path = os.path.join(tmp_dir, "crawl.jsonl.gz")
+        server = start_standin(products=1000)
+        try:
+            recorded = record_crawl(cassette_path, max_pages=2, base_urls=server.base_urls(), polite=False)
+        finally:
+            server.shutdown()
+        print(f"📼 Recorded {recorded} responses from the stand-in")
+        
+        # The server is gone, so every response below comes from the cassette
+        results = benchmark(cassette_path, repeat=1)
+    crawl, parse = results["crawl"], results["parse"]
+    print(f"📊 Crawl: {crawl['requests']} requests, {crawl['products']} products, "
+          f"{crawl['pages_per_second']} pages/sec")
+    print(f"📊 Parse: {parse['pages']} pages, {parse['products']} products, "
+          f"{parse['pages_per_second']} pages/sec")
+    
+    if crawl["unrecorded"]:
+        print(f"❌ {crawl['unrecorded']} requests had no recorded response")
+        return False
+    return crawl["products"] > 0 and parse["products"] > 0
+
+def test_api_capture():
+    """Test product API discovery and replay against the stand-in's JSON-fetching shop"""
+    import requests
+    from api_capture import ApiEndpoint, find_product_list, format_price, normalize_item, replay_endpoint
+    from extraction_quality import price_value
+    from standin_server import SITE_PREFIXES, start_standin
+    
+    print("\n🛰️ API Capture Test...")
+    
+    # Large and fractional prices must keep every digit
+    for value, expected in [(1250000, "₹1250000"), (1250000.0, "₹1250000"), (1299.5, "₹1299.50")]:
+        if format_price(value) != expected:
+            print(f"❌ format_price({value!r}) gave {format_price(value)!r}, expected {expected!r}")
+            return False
+    
+    server = start_standin(products=2000)
+    try:
+        site = "Krishi Jagran Shop"
+        category = server.catalog.categories[site][0]
+        host, port = server.server_address[:2]
+        # The request the shop page's script makes for its first products
+        url = (f"http://{host}:{port}{SITE_PREFIXES[site]}/api/products"
+               f"?category={category}&offset=0&limit={server.catalog.page_size}")
+        session = requests.Session()
+        payload = session.get(url, timeout=10).json()
+        
+        found = find_product_list(payload)
+        if found is None:
+            print("❌ No product list found in the stand-in's API response")
+            return False
+        path, items = found
+        endpoint = ApiEndpoint.from_url(url, path)
+        records = [normalize_item(item, url) for item in items]
+        records += replay_endpoint(session, endpoint, len(records))
+        
+        expected = server.catalog.products(site, category, 0, server.catalog.per_category)
+        print(f"📊 {len(records)} of {len(expected)} products via {endpoint.offset_param}-paged API "
+              f"at {'/'.join(map(str, path))}")
+        if len(records) != len(expected):
+            print("❌ Replay missed products")
+            return False
+        mismatched = [record["name"] for record, product in zip(records, expected)
+                      if record["name"] != product["name"] or price_value(record["price"]) != product["price"]]
+        if mismatched:
+            print(f"❌ {len(mismatched)} products differ from the catalog, e.g. {mismatched[0]}")
+            return False
+        return True
+    finally:
+        server.shutdown()
+
+def test_catalog_server():
+    """Test the catalog service's ETag/304 revalidation, gzip and cache invalidation on writes"""
+    import asyncio
+    import os
+    import tempfile
+    import requests
+    from catalog_server import CatalogServer
+    
+    print("\n📡 Catalog Server Test...")
+    
+    with tempfile.TemporaryDirectory(prefix="aginet_catalog_") as tmp_dir:
+        db_path = os.path.join(tmp_dir, "catalog.db")
+        integrator = AgrokartDataIntegrator(db_path)
+        integrator.integrate_products(AgriScraper().generate_sample_data(30), source="catalog_test")
+        
+        def check(port: int) -> bool:
+            url = f"http://127.0.0.1:{port}/products?page_size=20"
+            session = requests.Session()
+            
+            first = session.get(url, headers={"Accept-Encoding": "gzip"}, timeout=10)
+            etag = first.headers.get("ETag")
+            if first.status_code != 200 or not etag or first.headers.get("Content-Encoding") != "gzip":
+                print(f"❌ Expected a gzipped 200 with an ETag, got {first.status_code} {dict(first.headers)}")
+                return False
+            
+            plain = session.get(url, headers={"Accept-Encoding": "identity"}, timeout=10)
+            if "Content-Encoding" in plain.headers or plain.json() != first.json():
+                print("❌ Uncompressed response differs from the gzipped one")
+                return False
+            
+            revalidated = session.get(url, headers={"If-None-Match": etag}, timeout=10)
+            if revalidated.status_code != 304 or revalidated.content:
+                print(f"❌ Matching If-None-Match gave {revalidated.status_code} with {len(revalidated.content)} bytes")
+                return False
+            print(f"✅ 304 on revalidation, gzip {len(first.content)} bytes decoded, ETag {etag}")
+            
+            # A write from another connection must invalidate the cached page and its ETag
+            # (sample data is deterministic, so rename it to get genuinely new products)
+            added = AgriScraper().generate_sample_data(5)
+            for product in added:
+                product.name += " (New Stock)"
+                product.source_url += "?stock=new"
+            integrator.integrate_products(added, source="catalog_test_update")
+            changed = session.get(url, headers={"If-None-Match": etag}, timeout=10)
+            if changed.status_code != 200 or changed.headers.get("ETag") == etag:
+                print(f"❌ Stale response after a write: {changed.status_code}, ETag {changed.headers.get('ETag')}")
+                return False
+            if changed.json()["total"] != first.json()["total"] + 5:
+                print(f"❌ Total went from {first.json()['total']} to {changed.json()['total']}, expected +5")
+                return False
+            print(f"✅ Write invalidated the cache: total {first.json()['total']} -> {changed.json()['total']}")
+            return True
+        
+        async def exercise() -> bool:
+            server = CatalogServer(db_path, port=0)
+            await server.start()
+            try:
+                return await asyncio.get_running_loop().run_in_executor(None, check, server.port)
+            finally:
+                await server.stop()
+        
+        return asyncio.run(exercise())
+
+def test_sync_trigger():
+    """Test that sync events are debounced into batches and a steady stream is cut off at max_delay"""
+    import threading
+    from sync_events import SyncTrigger
+    
+    print("\n⏳ Sync Trigger Test...")
+    
+    trigger = SyncTrigger()
+    if trigger.wait_batch(debounce=0.1, timeout=0.2):
+        print("❌ Got a batch with no events")
+        return False
+    
+    # A burst that goes quiet is handed out as one batch once the debounce passes
+    for name in ("a.json", "b.json", "c.json"):
+        trigger.signal("file", name)
+    started = time.monotonic()
+    batch = trigger.wait_batch(debounce=0.2, max_delay=5.0)
+    waited = time.monotonic() - started
+    if [event.path for event in batch] != ["a.json", "b.json", "c.json"] or waited > 1.0:
+        print(f"❌ Burst gave {[event.path for event in batch]} after {waited:.2f}s")
+        return False
+    print(f"✅ Burst of 3 events batched after {waited:.2f}s")
+    
+    # Events that never stop coming must not hold the sync back past max_delay
+    stop = threading.Event()
+    
+    def keep_signalling():
+        while not stop.wait(0.05):
+            trigger.signal("db", detail="tick")
+    
+    signaller = threading.Thread(target=keep_signalling, daemon=True)
+    signaller.start()
+    try:
+        started = time.monotonic()
+        batch = trigger.wait_batch(debounce=0.2, max_delay=0.5, timeout=2.0)
+        waited = time.monotonic() - started
+    finally:
+        stop.set()
+        signaller.join()
+    if not batch or waited > 1.0:
+        print(f"❌ Steady stream gave {len(batch)} events after {waited:.2f}s, expected a cut-off near 0.5s")
+        return False
+    print(f"✅ Steady stream cut off at {waited:.2f}s with {len(batch)} events")
+    return True
+
+def test_staged_pipeline():
+    """Test that pipeline stages drop, fail and complete cycles independently"""
+    from sync_pipeline import StagedPipeline
+    
+    print("\n🚰 Staged Pipeline Test...")
+    
+    def scrape(n):
+        return None if n % 5 == 0 else n * 10  # An empty scrape drops the cycle
+    
+    def integrate(value):
+        if value == 70:
+            raise ValueError("simulated integration error")
+        return value + 1
+    
+    completed, dropped = [], []
+    pipeline = StagedPipeline([("scrape", scrape), ("integrate", integrate)], queue_size=1)
+    pipeline.on_complete = lambda item: completed.append((item.cycle, item.payload))
+    pipeline.on_drop = lambda item, stage: dropped.append((item.cycle, stage))
+    pipeline.run(range(1, 11))
+    
+    expected_completed = [(n, n * 10 + 1) for n in range(1, 11) if n % 5 != 0 and n != 7]
+    expected_dropped = [(5, "scrape"), (7, "integrate"), (10, "scrape")]
+    stats = pipeline.get_stats()["stages"]
+    if completed != expected_completed or sorted(dropped) != expected_dropped:
+        print(f"❌ Completed {completed}, dropped {sorted(dropped)}")
+        return False
+    if stats["scrape"]["dropped"] != 2 or stats["integrate"]["failed"] != 1 or stats["integrate"]["processed"] != 7:
+        print(f"❌ Unexpected stage stats: {stats}")
+        return False
+    print(f"✅ {len(completed)} cycles completed in order, drops {sorted(dropped)}")
+    return True
+
+def test_job_executor():
+    """Test single-flight coalescing, priority dispatch and group exclusion in the job executor"""
+    import threading
+    from job_executor import JobExecutor, JobSpec
+    
+    print("\n🗓️ Job Executor Test...")
+    
+    release = threading.Event()
+    started, order, active, overlaps = [], [], set(), []
+    lock = threading.Lock()
+    
+    def blocker():
+        started.append("blocker")
+        release.wait(5)
+    
+    def recorder(name):
+        def run():
+            with lock:
+                if active & {"sweep", "recrawl"} and name in ("sweep", "recrawl"):
+                    overlaps.append(name)
+                active.add(name)
+            order.append(name)
+            time.sleep(0.1)
+            with lock:
+                active.discard(name)
+        return run
+    
+    executor = JobExecutor(max_workers=1)
+    executor.register(JobSpec("blocker", blocker))
+    executor.register(JobSpec("low", recorder("low"), priority=20))
+    executor.register(JobSpec("high", recorder("high"), priority=1))
+    executor.start()
+    try:
+        # Hold the only worker so both requests are queued before either can start
+        executor.submit("blocker", delay=0)
+        for _ in range(50):
+            if started:
+                break
+            time.sleep(0.02)
+        first = executor.submit("low", delay=0)
+        second = executor.submit("high", delay=0)
+        repeat = executor.submit("low", delay=0)
+        release.set()
+        for _ in range(100):
+            if len(order) == 2:
+                break
+            time.sleep(0.05)
+    finally:
+        executor.shutdown()
+    
+    stats = executor.get_status()["jobs"]
+    if not (first and second) or repeat or order != ["high", "low"]:
+        print(f"❌ Submitted {first}/{second}/{repeat}, ran {order}, expected high before a single low")
+        return False
+    if stats["low"]["runs"] != 1 or stats["low"]["skipped"] != 1:
+        print(f"❌ Single-flight job ran {stats['low']['runs']} times, skipped {stats['low']['skipped']}")
+        return False
+    print(f"✅ Priority order {order}, duplicate request coalesced")
+    
+    # Jobs sharing a group must run one after the other even with free workers
+    order.clear()
+    executor = JobExecutor(max_workers=4)
+    executor.register(JobSpec("sweep", recorder("sweep"), group="static_scraper"))
+    executor.register(JobSpec("recrawl", recorder("recrawl"), group="static_scraper"))
+    executor.start()
+    try:
+        executor.submit("sweep", delay=0)
+        executor.submit("recrawl", delay=0)
+        for _ in range(100):
+            if len(order) == 2 and not active:
+                break
+            time.sleep(0.05)
+    finally:
+        executor.shutdown()
+    if sorted(order) != ["recrawl", "sweep"] or overlaps:
+        print(f"❌ Group jobs ran {order} with overlaps {overlaps}")
+        return False
+    print(f"✅ Group jobs ran one at a time: {order}")
+    return True
+
+def test_work_queue_leases():
+    """Test that an expired lease is re-claimed by another worker and the old holder is locked out"""
+    import os
+    import tempfile
+    from work_queue import CrawlQueue
+    
+    print("\n📋 Work Queue Lease Test...")
+    
+    with tempfile.TemporaryDirectory(prefix="aginet_queue_") as tmp_dir:
+        queue = CrawlQueue(os.path.join(tmp_dir, "queue.db"), lease_seconds=0.3, max_attempts=2)
+        queue.enqueue("test", [{"site": "Test Site", "category": "/seeds", "page": 1}])
+        
+        task = queue.claim("worker-a")
+        if task is None or queue.claim("worker-b") is not None:
+            print("❌ A leased task was handed to a second worker")
+            return False
+        
+        # worker-a stalls past its lease, so worker-b takes the task over
+        time.sleep(0.4)
+        retry = queue.claim("worker-b")
+        if retry is None or retry["id"] != task["id"] or retry["attempts"] != 2:
+            print(f"❌ Expired lease was not re-claimed: {retry}")
+            return False
+        if queue.heartbeat(task["id"], "worker-a") or queue.complete(task["id"], "worker-a", 10):
+            print("❌ The worker whose lease expired could still extend or complete the task")
+            return False
+        print(f"✅ Task {task['id']} re-claimed by worker-b on attempt {retry['attempts']}, worker-a locked out")
+        
+        # Once attempts run out an expired lease fails the task instead of handing it out again
+        time.sleep(0.4)
+        if queue.claim("worker-c") is not None or queue.get_stats() != {"failed": 1}:
+            print(f"❌ Exhausted task was not failed: {queue.get_stats()}")
+            return False
+        print("✅ Task failed after its last lease expired")
+        return True
+
 def cleanup_test_files():
     """Clean up test files"""
     import os
@@ -140,6 +479,14 @@ def cleanup_test_files():
 
 def main():
     """Run all tests"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="AgiNet scraping system test suite")
+    parser.add_argument("--keep-files", action="store_true", help="Keep generated test files")
+    parser.add_argument("--large", action="store_true",
+                        help="Also time 10,000 and 100,000 products in the performance test")
+    args = parser.parse_args()
+    
     print("🧪 AgiNet Scraping System Test Suite")
     print("=" * 50)
     
@@ -167,7 +514,42 @@ def main():
             return
         
         # Test 5: Performance
-        performance_test()
+        performance_test(large=args.large)
+        
+        # Test 6: Real scrape paths against recorded responses
+        if not test_replay_crawl():
+            print("❌ Replay crawl test failed")
+            return
+        
+        # Test 7: Product API capture against the stand-in
+        if not test_api_capture():
+            print("❌ API capture test failed")
+            return
+        
+        # Test 8: Catalog service revalidation and compression
+        if not test_catalog_server():
+            print("❌ Catalog server test failed")
+            return
+        
+        # Test 9: Auto-sync event debouncing
+        if not test_sync_trigger():
+            print("❌ Sync trigger test failed")
+            return
+        
+        # Test 10: Overlapped auto-sync pipeline
+        if not test_staged_pipeline():
+            print("❌ Staged pipeline test failed")
+            return
+        
+        # Test 11: Scheduled job dispatch
+        if not test_job_executor():
+            print("❌ Job executor test failed")
+            return
+        
+        # Test 12: Crawl work queue leases
+        if not test_work_queue_leases():
+            print("❌ Work queue lease test failed")
+            return
         
         print("\n🎉 All tests completed successfully!")
         print("\n📋 Test Summary:")
@@ -176,6 +558,13 @@ def main():
         print("   ✅ Database integration")
         print("   ✅ Data export")
         print("   ✅ Performance testing")
+        print("   ✅ Replay crawl")
+        print("   ✅ API capture")
+        print("   ✅ Catalog server")
+        print("   ✅ Sync trigger")
+        print("   ✅ Staged pipeline")
+        print("   ✅ Job executor")
+        print("   ✅ Work queue leases")
         
         # Show final file sizes
         import os
@@ -189,9 +578,8 @@ def main():
         print(f"❌ Test suite failed: {e}")
         
     finally:
-        # Cleanup
-        cleanup_choice = input("\n🗑️ Clean up test files? (y/n): ").lower()
-        if cleanup_choice == 'y':
+        # Cleanup (non-interactive so the suite can run unattended)
+        if not args.keep_files:
             cleanup_test_files()
             print("✅ Cleanup completed")
 
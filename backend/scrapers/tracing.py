@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Run Tracing for AgiNet
+A run ID and timed spans carried through scrape, ingest and export, with JSON log output
+"""
+
+import json
+import time
+import uuid
+import logging
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Context variables follow the code into nested calls; threads need copy_context() to inherit them
+RUN_ID = contextvars.ContextVar("aginet_run_id", default=None)
+CURRENT_SPAN = contextvars.ContextVar("aginet_span", default=None)
+
+
+@dataclass
+class Span:
+    """One timed stage of a run"""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    attributes: Dict = field(default_factory=dict)
+    started: float = field(default_factory=time.perf_counter)
+
+
+def new_run_id() -> str:
+    """Sortable, unique run ID, e.g. 20261019T183700-3f9c2a1b"""
+    return f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def current_run_id() -> Optional[str]:
+    return RUN_ID.get()
+
+
+def current_span() -> Optional[Span]:
+    return CURRENT_SPAN.get()
+
+
+@contextmanager
+def run_context(run_id: Optional[str] = None):
+    """Make `run_id` (or the enclosing run's ID, or a new one) current for the block"""
+    run_id = run_id or RUN_ID.get() or new_run_id()
+    token = RUN_ID.set(run_id)
+    try:
+        yield run_id
+    finally:
+        RUN_ID.reset(token)
+
+
+@contextmanager
+def span(name: str, level: int = logging.INFO, **attributes):
+    """Time a stage of the current run and log its duration and outcome when it ends"""
+    parent = CURRENT_SPAN.get()
+    current = Span(name, uuid.uuid4().hex[:8], parent.span_id if parent else None, attributes)
+    token = CURRENT_SPAN.set(current)
+    status = "ok"
+    try:
+        yield current
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - current.started) * 1000
+        CURRENT_SPAN.reset(token)
+        if logger.isEnabledFor(level):
+            # Logged after the reset, so the record carries the parent as its span
+            logger.log(level, f"⏱️ {name} {status} in {duration_ms:.1f}ms", extra={"span_event": {
+                "span": name,
+                "span_id": current.span_id,
+                "parent_span_id": current.parent_id,
+                "status": status,
+                "duration_ms": round(duration_ms, 3),
+                **current.attributes
+            }})
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line with the run ID and current span on every record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+            "run_id": RUN_ID.get()
+        }
+        active = CURRENT_SPAN.get()
+        if active:
+            entry["span"] = active.name
+            entry["span_id"] = active.span_id
+        event = getattr(record, "span_event", None)
+        if event:
+            entry.update(event)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(log_format: str = "text", level: int = logging.INFO):
+    """Text logs as before, or JSON lines for log shippers"""
+    logging.basicConfig(level=level, format='%(asctime)s - %(levelname)s - %(message)s')
+    if log_format == "json":
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(JsonLogFormatter())
+
+
+def add_logging_arguments(parser):
+    parser.add_argument("--log-format", choices=["text", "json"], default="text",
+                        help="Log as text, or as JSON lines carrying run IDs and span timings")
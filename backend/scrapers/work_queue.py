@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Distributed Crawl Work Queue for AgiNet
+A coordinator enqueues (site, category, page) tasks into SQLite and worker processes lease them
+"""
+
+import os
+import time
+import socket
+import sqlite3
+import logging
+import threading
+import multiprocessing
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long tasks of a site with a suspected layout change wait before it is judged again
+LAYOUT_RETRY_SECONDS = 600.0
+
+
+class CrawlQueue:
+    """SQLite-backed task table with time-limited leases"""
+
+    def __init__(self, queue_path: str = "crawl_queue.db", lease_seconds: float = 60.0, max_attempts: int = 3,
+                 max_deferrals: int = 20):
+        self.queue_path = queue_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.max_deferrals = max_deferrals
+        self.setup_queue()
+
+    def connect(self):
+        conn = sqlite3.connect(self.queue_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def setup_queue(self):
+        """Create the task table"""
+        conn = self.connect()
+        # WAL lets workers read while another worker commits a claim
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                batch TEXT NOT NULL,
+                site TEXT NOT NULL,
+                category TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                products_found INTEGER,
+                error TEXT,
+                not_before REAL,
+                deferrals INTEGER NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (batch, site, category, page)
+            )
+        ''')
+        # Older queues predate deferred tasks
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(crawl_tasks)").fetchall()]
+        if "not_before" not in columns:
+            conn.execute("ALTER TABLE crawl_tasks ADD COLUMN not_before REAL")
+        if "deferrals" not in columns:
+            conn.execute("ALTER TABLE crawl_tasks ADD COLUMN deferrals INTEGER NOT NULL DEFAULT 0")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_crawl_tasks_status ON crawl_tasks(status, lease_expires)")
+        conn.close()
+
+    def enqueue(self, batch: str, tasks: List[Dict]) -> int:
+        """Add tasks for a batch; re-enqueueing the same batch is a no-op"""
+        conn = self.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        before = conn.total_changes
+        conn.executemany('''
+            INSERT OR IGNORE INTO crawl_tasks (batch, site, category, page)
+            VALUES (:batch, :site, :category, :page)
+        ''', [dict(task, batch=batch) for task in tasks])
+        added = conn.total_changes - before
+        conn.execute("COMMIT")
+        conn.close()
+        logger.info(f"📥 Enqueued {added} crawl tasks for batch {batch}")
+        return added
+
+    def claim(self, worker_id: str) -> Optional[Dict]:
+        """Lease the oldest pending (or lease-expired) task that is not deferred"""
+        now = time.time()
+        conn = self.connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # Expired leases that used up their attempts are given up on
+            conn.execute('''
+                UPDATE crawl_tasks SET status = 'failed', error = 'lease expired', updated_at = CURRENT_TIMESTAMP
+                WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?
+            ''', (now, self.max_attempts))
+
+            row = conn.execute('''
+                SELECT * FROM crawl_tasks
+                WHERE (status = 'pending' AND (not_before IS NULL OR not_before <= ?))
+                   OR (status = 'leased' AND lease_expires < ?)
+                ORDER BY id LIMIT 1
+            ''', (now, now)).fetchone()
+
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            if row["status"] == "leased":
+                logger.warning(f"♻️ Lease of task {row['id']} held by {row['lease_owner']} expired, retrying")
+
+            conn.execute('''
+                UPDATE crawl_tasks SET status = 'leased', lease_owner = ?, lease_expires = ?,
+                    attempts = attempts + 1, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (worker_id, now + self.lease_seconds, row["id"]))
+            conn.execute("COMMIT")
+
+            task = dict(row)
+            task["attempts"] += 1
+            return task
+
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend a lease; False means the lease was lost to another worker"""
+        conn = self.connect()
+        cursor = conn.execute('''
+            UPDATE crawl_tasks SET lease_expires = ?
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+        ''', (time.time() + self.lease_seconds, task_id, worker_id))
+        conn.close()
+        return cursor.rowcount > 0
+
+    def complete(self, task_id: int, worker_id: str, products_found: int) -> bool:
+        conn = self.connect()
+        cursor = conn.execute('''
+            UPDATE crawl_tasks SET status = 'done', products_found = ?, lease_expires = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+        ''', (products_found, task_id, worker_id))
+        conn.close()
+        return cursor.rowcount > 0
+
+    def fail(self, task_id: int, worker_id: str, error: str):
+        """Release a task for retry, or mark it failed once attempts run out"""
+        conn = self.connect()
+        conn.execute('''
+            UPDATE crawl_tasks SET
+                status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END,
+                error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+        ''', (self.max_attempts, error, task_id, worker_id))
+        conn.close()
+
+    def defer(self, task_id: int, worker_id: str, delay: float, reason: str):
+        """Hand a task back for later without using up an attempt, e.g. while its host's circuit is open
+
+        Deferrals have their own budget, so a task that keeps being deferred
+        still ends up failed.
+        """
+        conn = self.connect()
+        conn.execute('''
+            UPDATE crawl_tasks SET
+                status = CASE WHEN deferrals >= ? THEN 'failed' ELSE 'pending' END,
+                attempts = MAX(attempts - 1, 0), deferrals = deferrals + 1, not_before = ?,
+                error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ? AND lease_owner = ? AND status = 'leased'
+        ''', (self.max_deferrals, time.time() + delay, reason, task_id, worker_id))
+        conn.close()
+
+    def skip_later_pages(self, batch: str, site: str, category: str, page: int) -> int:
+        """A category ran out of products, so its later pages need not be fetched"""
+        conn = self.connect()
+        cursor = conn.execute('''
+            UPDATE crawl_tasks SET status = 'skipped', updated_at = CURRENT_TIMESTAMP
+            WHERE batch = ? AND site = ? AND category = ? AND page > ? AND status = 'pending'
+        ''', (batch, site, category, page))
+        conn.close()
+        return cursor.rowcount
+
+    def has_open_tasks(self) -> bool:
+        conn = self.connect()
+        row = conn.execute("SELECT COUNT(*) FROM crawl_tasks WHERE status IN ('pending', 'leased')").fetchone()
+        conn.close()
+        return row[0] > 0
+
+    def get_stats(self) -> Dict[str, int]:
+        conn = self.connect()
+        rows = conn.execute("SELECT status, COUNT(*) FROM crawl_tasks GROUP BY status").fetchall()
+        conn.close()
+        return {row[0]: row[1] for row in rows}
+
+
+def build_crawl_tasks(sites: List[str] = None, max_pages: int = 3) -> List[Dict]:
+    """One task per (site, category, page)"""
+    from agri_scraper import SITES
+
+    tasks = []
+    for site in sites or list(SITES):
+        for category in SITES[site]["categories"]:
+            for page in range(1, max_pages + 1):
+                tasks.append({"site": site, "category": category, "page": page})
+    return tasks
+
+
+class Heartbeat(threading.Thread):
+    """Keeps a task's lease alive while the worker is busy with it"""
+
+    def __init__(self, queue: CrawlQueue, task_id: int, worker_id: str):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self.stop_event = threading.Event()
+        self.lost = False
+
+    def run(self):
+        while not self.stop_event.wait(self.queue.lease_seconds / 3):
+            if not self.queue.heartbeat(self.task_id, self.worker_id):
+                self.lost = True
+                return
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+def run_worker(queue_path: str, db_path: str, lease_seconds: float = 60.0,
+               base_urls: Dict[str, str] = None, delay: bool = True,
+               page_archive_dir: Optional[str] = None) -> Dict[str, int]:
+    """Claim and crawl tasks until the queue has no open work"""
+    from agri_scraper import AgriScraper
+    from data_integrator import AgrokartDataIntegrator
+    from page_archive import PageArchive
+    from extraction_quality import SiteLayoutChanged
+    from resilience import CircuitOpen
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    queue = CrawlQueue(queue_path, lease_seconds)
+    scraper = AgriScraper(base_urls, page_archive=PageArchive(page_archive_dir) if page_archive_dir else None)
+    # Workers outlive batches, so a broken verdict must not last the whole process
+    scraper.quality.verdict_ttl = LAYOUT_RETRY_SECONDS
+    current_batch = None
+    integrator = AgrokartDataIntegrator(db_path)
+    counts = {"tasks": 0, "failed": 0, "deferred": 0, "products": 0}
+
+    logger.info(f"👷 Worker {worker_id} started")
+    while True:
+        task = queue.claim(worker_id)
+        if task is None:
+            if not queue.has_open_tasks():
+                break
+            # Other workers hold the remaining leases; one of them may expire
+            time.sleep(min(1.0, lease_seconds / 4))
+            continue
+
+        if task["batch"] != current_batch:
+            current_batch = task["batch"]
+            scraper.quality.start_run()
+
+        heartbeat = Heartbeat(queue, task["id"], worker_id)
+        heartbeat.start()
+        try:
+            products = scraper.scrape_page(task["site"], task["category"], task["page"])
+            if products:
+                source = f"{task['site']}{task['category']}?page={task['page']}"
+                integrator.integrate_products(products, source=source)
+            else:
+                queue.skip_later_pages(task["batch"], task["site"], task["category"], task["page"])
+
+            heartbeat.stop()
+            if heartbeat.lost or not queue.complete(task["id"], worker_id, len(products)):
+                logger.warning(f"⚠️ Lost lease on task {task['id']}, another worker will redo it")
+            counts["tasks"] += 1
+            counts["products"] += len(products)
+
+        except CircuitOpen as e:
+            # The host is known to be down; try again once its circuit half-opens
+            heartbeat.stop()
+            logger.info(f"⏸️ Task {task['id']} deferred {e.retry_in:.0f}s: {e}")
+            queue.defer(task["id"], worker_id, e.retry_in, str(e))
+            counts["deferred"] += 1
+            continue
+
+        except SiteLayoutChanged as e:
+            # Retrying at once would only hit the same verdict; wait for a fix or a new batch
+            heartbeat.stop()
+            logger.warning(f"⏸️ Task {task['id']} deferred {LAYOUT_RETRY_SECONDS:.0f}s: {e}")
+            queue.defer(task["id"], worker_id, LAYOUT_RETRY_SECONDS, str(e))
+            counts["deferred"] += 1
+            continue
+
+        except Exception as e:
+            heartbeat.stop()
+            logger.error(f"❌ Task {task['id']} ({task['site']} {task['category']} p{task['page']}) failed: {e}")
+            queue.fail(task["id"], worker_id, str(e))
+            counts["failed"] += 1
+
+        if delay:
+            scraper.random_delay()
+
+    logger.info(f"👷 Worker {worker_id} finished: {counts}")
+    return counts
+
+
+def worker_process(queue_path: str, db_path: str, lease_seconds: float, base_urls: Dict[str, str], delay: bool,
+                   page_archive_dir: Optional[str]):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(process)d - %(levelname)s - %(message)s')
+    run_worker(queue_path, db_path, lease_seconds, base_urls, delay, page_archive_dir)
+
+
+def run_workers(queue_path: str, db_path: str, workers: int = 4, lease_seconds: float = 60.0,
+                base_urls: Dict[str, str] = None, delay: bool = True, page_archive_dir: Optional[str] = None):
+    """Start worker processes on this machine and wait for them to drain the queue"""
+    processes = [
+        multiprocessing.Process(target=worker_process,
+                                args=(queue_path, db_path, lease_seconds, base_urls, delay, page_archive_dir),
+                                name=f"crawl-worker-{i}")
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+def main():
+    """Main function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AgiNet distributed crawl work queue")
+    parser.add_argument("command", choices=["enqueue", "work", "run", "status"],
+                        help="'enqueue' tasks, 'work' the queue, 'run' both, or show 'status'")
+    parser.add_argument("--queue", default="crawl_queue.db", help="Work queue database path")
+    parser.add_argument("--db-path", default="../database.db", help="Products database path")
+    parser.add_argument("--batch", default=None, help="Batch label (default: current timestamp)")
+    parser.add_argument("--sites", nargs="*", default=None, help="Sites to crawl (default: all)")
+    parser.add_argument("--pages", type=int, default=3, help="Pages per category")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes to start")
+    parser.add_argument("--lease", type=float, default=60.0, help="Lease length in seconds")
+    parser.add_argument("--base-url", action="append", default=[], metavar="SITE=URL",
+                        help="Override a site's base URL (e.g. to crawl a local stand-in)")
+    parser.add_argument("--no-delay", action="store_true", help="Skip the politeness delay between pages")
+    parser.add_argument("--page-archive", default=None, help="Archive raw page bodies in this directory")
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(process)d - %(levelname)s - %(message)s')
+    base_urls = dict(item.split("=", 1) for item in args.base_url)
+    queue = CrawlQueue(args.queue, args.lease)
+
+    if args.command in ("enqueue", "run"):
+        batch = args.batch or datetime.now().strftime("%Y%m%d_%H%M%S")
+        queue.enqueue(batch, build_crawl_tasks(args.sites, args.pages))
+
+    if args.command in ("work", "run"):
+        started = time.time()
+        run_workers(args.queue, args.db_path, args.workers, args.lease, base_urls, not args.no_delay,
+                    args.page_archive)
+        print(f"⏱️ Queue drained in {time.time() - started:.1f}s with {args.workers} workers")
+
+    print("📊 Queue Status:")
+    for status, count in sorted(queue.get_stats().items()):
+        print(f"   {status.title()}: {count}")
+
+
+if __name__ == "__main__":
+    main()